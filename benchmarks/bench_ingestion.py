@@ -0,0 +1,54 @@
+# Benchmark of end-to-end ingestion through index_documents on a synthetic text corpus (in-memory Qdrant, hashing embedder), emitted as JSON,
+# once per CHUNKING_STRATEGY (chunk count is the number of vectors the collection ends up with).
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_ingestion
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.common import HashingEmbedder, memory_qdrant, offline_rag, patched, synthetic_corpus, write_corpus
+from src.app.core.config import settings
+from src.rag.ingestion.indexing import index_documents
+
+STRATEGIES = ("recursive", "sentence", "semantic")
+
+
+def run(n_docs: int = 200, sentences_per_doc: int = 40, repeat: int = 3) -> Dict[str, object]:
+    """
+    For each chunking strategy, index the same synthetic corpus `repeat` times into a fresh in-memory collection and report throughput.
+    Inputs: n_docs, sentences_per_doc, repeat ; Outputs: JSON-serialisable results dict keyed by strategy.
+    """
+    corpus = synthetic_corpus(n_docs, sentences_per_doc)
+    results: Dict[str, object] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_corpus(Path(tmp), corpus)
+        for strategy in STRATEGIES:
+            runs = []
+            for _ in range(repeat):
+                with offline_rag(memory_qdrant(), HashingEmbedder()), patched((settings, "CHUNKING_STRATEGY", strategy)):
+                    start = time.perf_counter()
+                    result = index_documents(paths)
+                    elapsed = time.perf_counter() - start
+                runs.append(
+                    {
+                        "seconds": round(elapsed, 3),
+                        "docs_per_s": round(result.documents_loaded / elapsed, 2),
+                        "chunks_per_s": round(result.chunks_indexed / elapsed, 2),
+                        "chunks": result.chunks_indexed,
+                    }
+                )
+            results[strategy] = {"best": min(runs, key=lambda r: r["seconds"]), "runs": runs}
+
+    return {
+        "benchmark": "ingestion",
+        "params": {"n_docs": n_docs, "sentences_per_doc": sentences_per_doc, "repeat": repeat},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
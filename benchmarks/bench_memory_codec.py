@@ -0,0 +1,76 @@
+# Benchmark of the conversation memory codecs: stored bytes per session and encode/decode time, emitted as JSON.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_memory_codec
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from src.rag.memory.codec import decode_messages, encode_messages
+
+_WORDS = (
+    "revenue quarter growth customer subscription attention transformer eclipse policy employee "
+    "contract renewal forecast margin region europe cloud product release incident report"
+).split()
+
+
+def _synthetic_session(n_messages: int, words_per_message: int, seed: int = 0) -> List[BaseMessage]:
+    """
+    Build a deterministic session alternating user questions and assistant answers.
+    Inputs: n_messages, words_per_message, seed ; Outputs: list[BaseMessage].
+    """
+    rng = random.Random(seed)
+    messages: List[BaseMessage] = []
+    for i in range(n_messages):
+        text = " ".join(rng.choice(_WORDS) for _ in range(words_per_message))
+        messages.append(HumanMessage(content=text) if i % 2 == 0 else AIMessage(content=text))
+    return messages
+
+
+def _time_us(fn: Callable[[], object], repeat: int) -> float:
+    """
+    Average wall time of fn in microseconds.
+    Inputs: fn, repeat ; Outputs: mean microseconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(repeat: int = 2000) -> Dict[str, object]:
+    """
+    Measure every codec variant on small and full-window sessions.
+    Inputs: repeat ; Outputs: JSON-serialisable results dict.
+    """
+    variants = {
+        "json": {"codec": "json"},
+        "msgpack": {"codec": "msgpack", "compress_min_bytes": 0},
+        "msgpack+zstd": {"codec": "msgpack", "compress_min_bytes": 1},
+    }
+    sessions = {
+        "short_session_4x20w": _synthetic_session(4, 20),
+        "full_window_12x120w": _synthetic_session(12, 120),
+    }
+
+    results: Dict[str, object] = {}
+    for session_name, messages in sessions.items():
+        rows = {}
+        for variant, kwargs in variants.items():
+            encoded = encode_messages(messages, **kwargs)
+            size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+            rows[variant] = {
+                "bytes_per_session": size,
+                "encode_us": round(_time_us(lambda: encode_messages(messages, **kwargs), repeat), 2),
+                "decode_us": round(_time_us(lambda: decode_messages(encoded), repeat), 2),
+            }
+        results[session_name] = rows
+    return {"benchmark": "memory_codec", "repeat": repeat, "results": results}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
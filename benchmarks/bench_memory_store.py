@@ -0,0 +1,76 @@
+# Benchmark of conversation memory round-trips (load + save/append) for the sync and asyncio Redis stores on fakeredis, emitted as JSON.
+# fakeredis runs in-process, so this measures client-side cost (pipelining, codec, Lua dispatch), not network latency.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_memory_store
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import fakeredis
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from benchmarks.common import latency_stats, patched, time_calls
+from src.rag.memory import redis_memory
+from src.rag.memory.async_redis_memory import AsyncRedisMemoryStore
+from src.rag.memory.redis_memory import RedisListMemoryStore, RedisMemoryStore
+
+
+def _turn(i: int) -> List[BaseMessage]:
+    return [
+        HumanMessage(content=f"Question {i} about the quarterly revenue forecast and renewal policy?"),
+        AIMessage(content=f"Answer {i}: revenue grew in the quarter according to the finance report [0]."),
+    ]
+
+
+def _sync_turns(store: RedisMemoryStore, session_id: str, turns: int) -> None:
+    for i in range(turns):
+        bundle = store.load(session_id)
+        new = _turn(i)
+        if store.append_only:
+            store.append(session_id, messages=new, summary_lines=["" for _ in new])
+        else:
+            store.save(session_id, summary=bundle.summary, messages=bundle.messages + new)
+
+
+async def _async_turns(store: AsyncRedisMemoryStore, session_id: str, turns: int) -> None:
+    for i in range(turns):
+        bundle = await store.load(session_id)
+        new = _turn(i)
+        if store.append_only:
+            await store.append(session_id, messages=new, summary_lines=["" for _ in new])
+        else:
+            await store.save(session_id, summary=bundle.summary, messages=bundle.messages + new)
+
+
+async def _time_async(store: AsyncRedisMemoryStore, turns: int, repeat: int) -> Dict[str, float]:
+    samples = []
+    for r in range(repeat):
+        start = time.perf_counter()
+        await _async_turns(store, f"bench-async-{store.layout}-{r}", turns)
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+def run(turns: int = 20, repeat: int = 20) -> Dict[str, object]:
+    """
+    Time a conversation of `turns` load+write round-trips per session, for each store and layout.
+    Inputs: turns, repeat ; Outputs: JSON-serialisable results dict (latency per conversation).
+    """
+    results: Dict[str, object] = {}
+    for name, store in (("sync_blob", RedisMemoryStore()), ("sync_list", RedisListMemoryStore())):
+        with patched((redis_memory, "_redis_client", fakeredis.FakeRedis())):
+            counter = iter(range(repeat + 10))
+            results[name] = time_calls(lambda: _sync_turns(store, f"bench-{name}-{next(counter)}", turns), repeat, warmup=1)
+
+    for layout in ("blob", "list"):
+        store = AsyncRedisMemoryStore(fakeredis.FakeAsyncRedis(), layout=layout)
+        results[f"async_{layout}"] = asyncio.run(_time_async(store, turns, repeat))
+
+    return {"benchmark": "memory_store", "params": {"turns": turns, "repeat": repeat}, "results": results}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
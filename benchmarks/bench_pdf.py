@@ -0,0 +1,86 @@
+# Benchmark of PDF text extraction per PDF_BACKEND, in process and with the page worker pool, on docs/document.pdf and on larger
+# synthetic PDFs (its pages repeated), emitted as JSON. first_page_ms is the latency until the chunker receives the first page.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_pdf
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from pypdf import PdfReader, PdfWriter
+
+from src.rag.ingestion.pdf_backends import PDF_BACKENDS, iter_page_texts
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "docs" / "document.pdf"
+
+
+def write_repeated_pdf(source: Path, target: Path, pages: int) -> str:
+    """
+    Write a PDF of `pages` pages by cycling through the pages of source (real text content, arbitrary length).
+    Inputs: source PDF, target path, page count ; Outputs: target path as str.
+    """
+    reader = PdfReader(str(source))
+    writer = PdfWriter()
+    for i in range(pages):
+        writer.add_page(reader.pages[i % len(reader.pages)])
+    with open(target, "wb") as f:
+        writer.write(f)
+    return str(target)
+
+
+def _extract(path: str, backend: str, workers: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    first = None
+    pages = chars = 0
+    for _, text in iter_page_texts(path, backend, workers=workers, min_parallel_pages=2):
+        if first is None:
+            first = time.perf_counter() - start
+        pages += 1
+        chars += len(text)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "pages_per_s": round(pages / elapsed, 1),
+        "first_page_ms": round((first or 0.0) * 1000, 1),
+        "chars": chars,
+    }
+
+
+def run(synthetic_pages: Tuple[int, ...] = (110, 330), workers: int = 4, repeat: int = 2) -> Dict[str, object]:
+    """
+    For each PDF and backend, extract every page `repeat` times in process and with `workers` worker processes; keep the best run.
+    The worker pool is warmed up once per backend so process start-up is not charged to the first document.
+    Inputs: synthetic page counts, workers, repeat ; Outputs: JSON-serialisable results dict keyed by PDF, then backend and mode.
+    """
+    results: Dict[str, object] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs: List[Tuple[str, str]] = [("document.pdf", str(SAMPLE_PDF))]
+        for n in synthetic_pages:
+            pdfs.append((f"synthetic_{n}p.pdf", write_repeated_pdf(SAMPLE_PDF, Path(tmp) / f"synthetic_{n}p.pdf", n)))
+
+        for backend in PDF_BACKENDS:
+            list(iter_page_texts(str(SAMPLE_PDF), backend, workers=workers, min_parallel_pages=2))
+
+        for label, path in pdfs:
+            per_backend: Dict[str, object] = {}
+            for backend in PDF_BACKENDS:
+                modes = {}
+                for mode, n_workers in (("in_process", 0), (f"workers_{workers}", workers)):
+                    runs = [_extract(path, backend, n_workers) for _ in range(repeat)]
+                    modes[mode] = min(runs, key=lambda r: r["seconds"])
+                per_backend[backend] = modes
+            results[label] = per_backend
+
+    return {
+        "benchmark": "pdf_extraction",
+        "params": {"synthetic_pages": list(synthetic_pages), "workers": workers, "repeat": repeat, "cpus": os.cpu_count()},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
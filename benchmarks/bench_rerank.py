@@ -0,0 +1,39 @@
+# Microbenchmarks of simple_rerank and reciprocal_rank_fusion on synthetic candidate lists, emitted as JSON.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_rerank
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Dict
+
+from benchmarks.common import BENCH_QUERIES, synthetic_documents, time_calls
+from src.rag.retrieval.hybrid_retriever import _doc_key
+from src.rag.retrieval.reranker import reciprocal_rank_fusion, simple_rerank
+
+
+def run(repeat: int = 500) -> Dict[str, object]:
+    """
+    Time reranking of 25/50/100 candidates and RRF over 2/4/8 ranked lists of 25.
+    Inputs: repeat ; Outputs: JSON-serialisable results dict.
+    """
+    rng = random.Random(0)
+    pool = synthetic_documents(200)
+    query = BENCH_QUERIES[0]
+
+    results: Dict[str, object] = {}
+    for n in (25, 50, 100):
+        candidates = pool[:n]
+        results[f"simple_rerank_{n}"] = time_calls(lambda: simple_rerank(candidates, query=query, top_k=8), repeat)
+
+    for n_lists in (2, 4, 8):
+        lists = [rng.sample(pool[:100], 25) for _ in range(n_lists)]
+        results[f"rrf_{n_lists}x25"] = time_calls(
+            lambda: reciprocal_rank_fusion(lists, key=_doc_key, k=60, top_k=8), repeat
+        )
+
+    return {"benchmark": "rerank", "params": {"repeat": repeat}, "results": results}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,59 @@
+# Benchmark of HybridRetriever.retrieve / retrieve_many latency and QPS against an in-memory Qdrant collection, emitted as JSON.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_retrieval
+
+from __future__ import annotations
+
+import json
+import tempfile
+from itertools import cycle
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.common import (
+    BENCH_QUERIES,
+    HashingEmbedder,
+    memory_qdrant,
+    offline_rag,
+    synthetic_corpus,
+    time_calls,
+    write_corpus,
+)
+from src.rag.ingestion.indexing import index_documents
+from src.rag.retrieval.hybrid_retriever import HybridRetriever
+
+
+def run(n_docs: int = 200, repeat: int = 100) -> Dict[str, object]:
+    """
+    Index a synthetic corpus once, then time single-query and multi-query retrieval over a fixed query rotation.
+    Inputs: n_docs, repeat ; Outputs: JSON-serialisable results dict.
+    """
+    client = memory_qdrant()
+    with offline_rag(client, HashingEmbedder()):
+        with tempfile.TemporaryDirectory() as tmp:
+            ingest = index_documents(write_corpus(Path(tmp), synthetic_corpus(n_docs)))
+
+        retriever = HybridRetriever.from_env()
+        queries = cycle(BENCH_QUERIES)
+        single = time_calls(lambda: retriever.retrieve(next(queries)), repeat)
+        fan_out = time_calls(lambda: retriever.retrieve_many(BENCH_QUERIES[:4]), max(repeat // 4, 5))
+        dense_only = time_calls(
+            lambda: retriever._dense_search(next(queries), None), repeat
+        )
+        lexical_only = time_calls(
+            lambda: retriever._lexical_search(next(queries), None), repeat
+        )
+
+    return {
+        "benchmark": "retrieval",
+        "params": {"n_docs": n_docs, "chunks": ingest.chunks_indexed, "repeat": repeat, "top_k": retriever.top_k},
+        "results": {
+            "retrieve": single,
+            "retrieve_many_4_queries": fan_out,
+            "dense_leg": dense_only,
+            "lexical_leg": lexical_only,
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
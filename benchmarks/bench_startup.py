@@ -0,0 +1,54 @@
+# Benchmark of API start-up: wall time of `import src.app.main` in a fresh interpreter, compared with the import-time budget, emitted as JSON.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_startup
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Measured at ~3.7 s on a laptop-class CPU (was ~9.9 s with sentence-transformers, openai and the graph imported eagerly).
+IMPORT_TIME_BUDGET_S = 6.0
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import src.app.main
+print(json.dumps({"elapsed": time.perf_counter() - start}))
+"""
+
+
+def _import_seconds() -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True, text=True, timeout=120, check=True,
+    )
+    return float(json.loads(out.stdout.strip().splitlines()[-1])["elapsed"])
+
+
+def run(repeat: int = 5) -> Dict[str, object]:
+    """
+    Import the API `repeat` times, each in a new interpreter (cold module state, warm OS file cache after the first run).
+    Inputs: repeat ; Outputs: JSON-serialisable results dict with min/median import seconds and whether the median is within budget.
+    """
+    runs = [_import_seconds() for _ in range(max(repeat, 1))]
+    median = statistics.median(runs)
+    return {
+        "benchmark": "startup",
+        "params": {"repeat": repeat, "budget_s": IMPORT_TIME_BUDGET_S},
+        "results": {
+            "import_s_min": round(min(runs), 3),
+            "import_s_median": round(median, 3),
+            "within_budget": median < IMPORT_TIME_BUDGET_S,
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
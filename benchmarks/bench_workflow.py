@@ -0,0 +1,98 @@
+# Benchmark of full LangGraph workflow latency (graph_app.ainvoke, as called by /chat) with a fake LLM, the hashing embedder,
+# an in-memory Qdrant collection and fakeredis memory, emitted as JSON. LLM latency is simulated with a fixed delay per call.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.bench_workflow
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import (
+    BENCH_QUERIES,
+    FakeLLM,
+    HashingEmbedder,
+    latency_stats,
+    memory_qdrant,
+    offline_app,
+    synthetic_corpus,
+    write_corpus,
+)
+from src.graph.workflow import get_graph_app
+from src.rag.ingestion.indexing import index_documents
+
+
+def _initial_state(question: str, session_id: str) -> Dict[str, object]:
+    return {
+        "messages": [HumanMessage(content=question)],
+        "trace": [],
+        "question": question,
+        "plan": None,
+        "retrieval_query": None,
+        "prefetched_documents": None,
+        "speculation_id": None,
+        "documents": [],
+        "answer": None,
+        "citations": [],
+        "fused_citations": None,
+        "session_id": session_id,
+        "memory_summary": None,
+        "memory_messages": None,
+        "retry_count": 0,
+    }
+
+
+async def _time_graph(repeat: int, concurrency: int) -> Dict[str, float]:
+    graph_app = get_graph_app()
+    samples = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(i: int) -> None:
+        question = BENCH_QUERIES[i % len(BENCH_QUERIES)]
+        session_id = f"bench-{concurrency}-{i}"
+        async with sem:
+            start = time.perf_counter()
+            await graph_app.ainvoke(_initial_state(question, session_id), config={"configurable": {"thread_id": session_id}})
+            samples.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(repeat)))
+    stats = latency_stats(samples)
+    stats["throughput_rps"] = round(repeat / (time.perf_counter() - wall_start), 2)
+    return stats
+
+
+def run(n_docs: int = 100, repeat: int = 30, llm_latency_s: float = 0.02) -> Dict[str, object]:
+    """
+    Index a synthetic corpus, then run the compiled graph sequentially and with 8 concurrent requests.
+    Inputs: n_docs, repeat, llm_latency_s (simulated per-call LLM delay) ; Outputs: JSON-serialisable results dict.
+    """
+    llm = FakeLLM(latency_s=llm_latency_s)
+    with offline_app(memory_qdrant(), HashingEmbedder(), llm):
+        with tempfile.TemporaryDirectory() as tmp:
+            index_documents(write_corpus(Path(tmp), synthetic_corpus(n_docs)))
+
+        asyncio.run(_time_graph(3, 1))
+        calls_before = llm.calls
+        sequential = asyncio.run(_time_graph(repeat, 1))
+        llm_calls_per_request = round((llm.calls - calls_before) / repeat, 2)
+        concurrent = asyncio.run(_time_graph(repeat, 8))
+
+    return {
+        "benchmark": "workflow",
+        "params": {"n_docs": n_docs, "repeat": repeat, "llm_latency_s": llm_latency_s},
+        "results": {
+            "llm_calls_per_request": llm_calls_per_request,
+            "sequential": sequential,
+            "concurrency_8": concurrent,
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,238 @@
+# Shared stand-ins and timing helpers for the benchmark suite: a hashing embedder, a deterministic fake LLM,
+# an in-memory Qdrant collection and a synthetic corpus, so every benchmark runs offline and reproducibly.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient
+
+BENCH_VECTOR_DIM = 64
+
+_TOPICS = {
+    "finance": "revenue quarter growth margin forecast invoice budget expense audit subscription renewal",
+    "hr": "employee onboarding benefits leave policy payroll hiring review promotion training handbook",
+    "security": "incident breach password access token firewall vulnerability patch audit encryption",
+    "product": "release roadmap feature customer feedback launch pricing tier integration dashboard",
+    "legal": "contract clause liability termination agreement compliance regulation privacy consent",
+}
+_FILLER = "the a of and to in for with on by from this that is are was were be has have".split()
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    Tiny deterministic embedding model (hashing trick over lowercase tokens, L2 normalised) standing in for BGE.
+    Same interface as BGEEmbeddingModel.embed_documents.
+    """
+
+    def __init__(self, dim: int = BENCH_VECTOR_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for token in _TOKEN_RE.findall(text.lower()):
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+
+class FakeLLM:
+    """
+    Deterministic LLM stand-in with the adapters' invoke() contract: answers from the prompt text after an optional fixed delay.
+    """
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def invoke(self, messages: Sequence[Any], **kwargs: Any) -> Any:
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        last = str(messages[-1].content) if messages else ""
+        if kwargs.get("json_mode") or "Return JSON" in last:
+            content = json.dumps({"answer_with_citations": "Revenue grew this quarter [0].", "citations": [{"index": 0}]})
+        elif "Context:" in last:
+            context = last.split("Context:", 1)[1]
+            sentence = next((s.strip() for s in context.split("\n") if s.strip() and not s.startswith("[")), "")
+            content = sentence or "I don't know based on the available documents."
+        else:
+            content = "Keywords: " + " ".join(_TOKEN_RE.findall(last.lower())[-6:])
+        return type("Resp", (), {"content": content})
+
+
+def synthetic_corpus(n_docs: int, sentences_per_doc: int = 40, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Build a deterministic corpus of topic-flavoured documents.
+    Inputs: n_docs, sentences_per_doc, seed ; Outputs: list of (file name, text).
+    """
+    rng = random.Random(seed)
+    topics = list(_TOPICS)
+    corpus = []
+    for i in range(n_docs):
+        topic = topics[i % len(topics)]
+        vocab = _TOPICS[topic].split()
+        sentences = []
+        for _ in range(sentences_per_doc):
+            words = [rng.choice(vocab if rng.random() < 0.6 else _FILLER) for _ in range(rng.randint(8, 18))]
+            sentences.append(" ".join(words).capitalize() + ".")
+        corpus.append((f"{topic}_{i:04d}.txt", " ".join(sentences)))
+    return corpus
+
+
+def write_corpus(directory: Path, corpus: List[Tuple[str, str]]) -> List[str]:
+    paths = []
+    for name, text in corpus:
+        path = directory / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def synthetic_documents(n: int, seed: int = 0) -> List[Document]:
+    """
+    Build retrieved-chunk-like Documents with unique chunk_uid metadata for rerank/fusion benchmarks.
+    Inputs: n, seed ; Outputs: list[Document].
+    """
+    chunks = synthetic_corpus(n, sentences_per_doc=4, seed=seed)
+    return [
+        Document(page_content=text, metadata={"chunk_uid": f"u{i}", "source": name, "page": 1, "chunk_id": 0})
+        for i, (name, text) in enumerate(chunks)
+    ]
+
+
+BENCH_QUERIES = [
+    "What was the revenue growth this quarter?",
+    "How does the employee leave policy work?",
+    "Which incident involved a password breach?",
+    "When is the next product release on the roadmap?",
+    "What does the contract say about termination liability?",
+    "How are subscription renewals forecast?",
+]
+
+
+def memory_qdrant() -> QdrantClient:
+    return QdrantClient(":memory:")
+
+
+@contextmanager
+def patched(*targets: Tuple[Any, str, Any]) -> Iterator[None]:
+    """
+    Temporarily replace module attributes (like pytest's monkeypatch) and restore them on exit.
+    Inputs: (object, attribute name, replacement) tuples ; Outputs: context manager.
+    """
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in targets]
+    try:
+        for obj, name, value in targets:
+            setattr(obj, name, value)
+        yield
+    finally:
+        for obj, name, value in reversed(saved):
+            setattr(obj, name, value)
+
+
+def latency_stats(samples_s: List[float]) -> Dict[str, float]:
+    """
+    Summarise per-call wall times.
+    Inputs: samples in seconds ; Outputs: {"calls", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "qps"}.
+    """
+    ordered = sorted(samples_s)
+    if not ordered:
+        return {"calls": 0}
+    total = sum(ordered)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 3)
+
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "qps": round(len(ordered) / total, 2) if total else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[], Any], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Call fn repeatedly after a warmup and summarise the latencies.
+    Inputs: fn, repeat, warmup ; Outputs: latency_stats dict.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+@contextmanager
+def offline_rag(client: QdrantClient, embedder: HashingEmbedder) -> Iterator[None]:
+    """
+    Point ingestion and retrieval at an in-memory Qdrant client and the hashing embedder.
+    Inputs: client, embedder ; Outputs: context manager.
+    """
+    from src.app.core.config import settings
+    from src.graph import intent
+    from src.rag.ingestion import chunking, indexing
+    from src.rag.llm import models
+    from src.rag.retrieval import hybrid_retriever
+    from src.rag.vectorstore import qdrant_client as qdrant_module
+
+    with patched(
+        (models, "get_embedding_model", lambda: embedder),
+        (qdrant_module, "get_qdrant_client", lambda: client),
+        (indexing, "get_qdrant_client", lambda: client),
+        (hybrid_retriever, "get_qdrant_client", lambda: client),
+        (indexing, "get_embedding_model", lambda: embedder),
+        (hybrid_retriever, "get_embedding_model", lambda: embedder),
+        (chunking, "get_embedding_model", lambda: embedder),
+        (intent, "get_embedding_model", lambda: embedder),
+        (settings, "QDRANT_VECTOR_DIM", embedder.dim),
+    ):
+        yield
+
+
+@contextmanager
+def offline_app(client: QdrantClient, embedder: HashingEmbedder, llm: FakeLLM) -> Iterator[None]:
+    """
+    Replace every external backend of the workflow: offline_rag plus the fake LLM for all nodes and fakeredis for both memory stores.
+    Inputs: client, embedder, llm ; Outputs: context manager.
+    """
+    import fakeredis
+
+    from src.graph.nodes import citation_agent, direct_answer, query_planner, reasoning_agent
+    from src.rag.llm import models
+    from src.rag.memory import async_redis_memory, redis_memory
+    from src.rag.retrieval import hybrid_retriever
+
+    with offline_rag(client, embedder), patched(
+        (models, "get_reasoning_llm", lambda: llm),
+        (query_planner, "get_planner_llm", lambda: llm),
+        (reasoning_agent, "get_reasoning_llm", lambda: llm),
+        (citation_agent, "get_citation_llm", lambda: llm),
+        (direct_answer, "get_reasoning_llm", lambda: llm),
+        (redis_memory, "_redis_client", fakeredis.FakeRedis()),
+        (async_redis_memory, "_async_memory_store", async_redis_memory.AsyncRedisMemoryStore(fakeredis.FakeAsyncRedis())),
+        (hybrid_retriever, "_retriever", None),
+    ):
+        yield
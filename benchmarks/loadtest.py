@@ -0,0 +1,302 @@
+# Load generator for /chat and /ingest: drives the FastAPI app at a fixed concurrency (closed loop) or arrival rate (open loop) and reports
+# latency percentiles, throughput, error rate, requests per worker process and event-loop lag as JSON.
+# Backends are stubbed (fake LLM, in-memory Qdrant, fakeredis) so the numbers isolate the service itself.
+#
+# In-process, through httpx.ASGITransport (one event loop, lag measured directly):
+#   PYTHONPATH=. python -m benchmarks.loadtest run --requests 200 --concurrency 16 --ingest-ratio 0.05
+# Over HTTP against uvicorn workers running the same stubbed app (lag reported by each worker):
+#   PYTHONPATH=. python -m benchmarks.loadtest serve --workers 4 --port 8001
+#   PYTHONPATH=. python -m benchmarks.loadtest run --url http://127.0.0.1:8001 --rate 50 --requests 1000
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import (
+    BENCH_QUERIES,
+    FakeLLM,
+    HashingEmbedder,
+    latency_stats,
+    memory_qdrant,
+    offline_app,
+    synthetic_corpus,
+    write_corpus,
+)
+
+_INGEST_BATCH = 5
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: a task sleeps `interval_s` in a loop and records how late it wakes up.
+    Any blocking call on the loop (sync I/O, CPU work in a coroutine) shows up directly as lag.
+    """
+
+    def __init__(self, interval_s: float = 0.01):
+        self.interval_s = interval_s
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.samples.append(max(loop.time() - expected, 0.0))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def reset(self) -> None:
+        self.samples = []
+
+    def stats(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"samples": 0}
+        return {
+            "samples": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+
+_stubs = ExitStack()
+
+
+def create_stub_app(n_docs: Optional[int] = None, llm_latency_s: Optional[float] = None) -> Any:
+    """
+    Build the production FastAPI app on stubbed backends, with a seeded corpus and a /loadtest/info route (pid, corpus paths, loop lag).
+    Used as a uvicorn factory, so every worker process seeds its own in-memory collection.
+    Inputs: n_docs, llm_latency_s (defaults from LOADTEST_DOCS / LOADTEST_LLM_LATENCY_S) ; Outputs: the FastAPI app.
+    """
+    from src.app.main import app
+    from src.rag.ingestion.indexing import index_documents
+
+    # Per-request info logs go to stdout and would interleave with the JSON report.
+    logging.getLogger().setLevel(os.environ.get("LOADTEST_LOG_LEVEL", "WARNING"))
+
+    n_docs = n_docs if n_docs is not None else int(os.environ.get("LOADTEST_DOCS", "100"))
+    llm_latency_s = llm_latency_s if llm_latency_s is not None else float(os.environ.get("LOADTEST_LLM_LATENCY_S", "0.05"))
+
+    _stubs.close()
+    _stubs.enter_context(offline_app(memory_qdrant(), HashingEmbedder(), FakeLLM(latency_s=llm_latency_s)))
+    corpus_dir = Path(_stubs.enter_context(tempfile.TemporaryDirectory(prefix="loadtest-")))
+    paths = write_corpus(corpus_dir, synthetic_corpus(n_docs))
+    index_documents(paths)
+
+    if getattr(app.state, "loadtest_monitor", None) is None:
+        monitor = LoopLagMonitor()
+        app.state.loadtest_monitor = monitor
+
+        @app.middleware("http")
+        async def _worker_header(request, call_next):
+            monitor.start()
+            response = await call_next(request)
+            response.headers["X-Worker-Pid"] = str(os.getpid())
+            return response
+
+        @app.get("/loadtest/info", include_in_schema=False)
+        async def _info(reset: bool = False):
+            monitor.start()
+            info = {"pid": os.getpid(), "corpus_paths": app.state.loadtest_paths, "event_loop_lag": monitor.stats()}
+            if reset:
+                monitor.reset()
+            return info
+
+    app.state.loadtest_paths = paths
+    return app
+
+
+def _is_ingest(i: int, ratio: float) -> bool:
+    return ratio > 0 and int((i + 1) * ratio) > int(i * ratio)
+
+
+async def _collect_worker_info(client: httpx.AsyncClient, probes: int, reset: bool) -> Dict[int, Dict[str, Any]]:
+    """
+    Query /loadtest/info repeatedly on fresh connections so that, behind several uvicorn workers, most workers answer at least once.
+    Inputs: client, probes, reset (clear the lag samples) ; Outputs: {pid: info}.
+    """
+    infos: Dict[int, Dict[str, Any]] = {}
+    for _ in range(probes):
+        resp = await client.get("/loadtest/info", params={"reset": reset}, headers={"Connection": "close"})
+        if resp.status_code != 200:
+            break
+        info = resp.json()
+        infos.setdefault(info["pid"], info)
+    return infos
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    *,
+    requests: int,
+    concurrency: int,
+    rate: float = 0.0,
+    ingest_ratio: float = 0.0,
+    sessions: int = 50,
+    ingest_paths: Optional[List[str]] = None,
+    worker_probes: int = 1,
+) -> Dict[str, Any]:
+    """
+    Send `requests` requests, at most `concurrency` in flight. With rate > 0 requests arrive on a fixed schedule (open loop) and latency
+    is measured from the scheduled arrival, so queueing behind a slow server is not hidden; otherwise each slot sends back to back.
+    Inputs: client, load shape, ingest_ratio (share of /ingest requests), sessions (distinct chat session ids), ingest_paths ;
+    Outputs: JSON-serialisable report.
+    """
+    infos = await _collect_worker_info(client, worker_probes, reset=True)
+    if ingest_paths is None:
+        ingest_paths = next(iter(infos.values()), {}).get("corpus_paths", [])
+    if ingest_ratio > 0 and not ingest_paths:
+        raise ValueError("ingest_ratio > 0 needs --ingest-path when the target has no /loadtest/info route")
+
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    per_worker: Counter = Counter()
+
+    async def _one(i: int, scheduled: float) -> None:
+        kind = "ingest" if _is_ingest(i, ingest_ratio) else "chat"
+        async with sem:
+            start = scheduled if rate > 0 else loop.time()
+            try:
+                if kind == "ingest":
+                    offset = (i * _INGEST_BATCH) % len(ingest_paths)
+                    body = {"paths": ingest_paths[offset : offset + _INGEST_BATCH]}
+                    resp = await client.post("/ingest/", json=body)
+                else:
+                    question = BENCH_QUERIES[i % len(BENCH_QUERIES)]
+                    body = {"session_id": f"load-{i % sessions}", "messages": [{"role": "user", "content": question}]}
+                    resp = await client.post("/chat/", json=body)
+                statuses[kind][str(resp.status_code)] += 1
+                per_worker[resp.headers.get("X-Worker-Pid", "unknown")] += 1
+            except httpx.HTTPError as exc:
+                statuses[kind][type(exc).__name__] += 1
+            latencies[kind].append(loop.time() - start)
+
+    wall_start = loop.time()
+    tasks = []
+    for i in range(requests):
+        scheduled = wall_start + i / rate if rate > 0 else wall_start
+        if rate > 0:
+            await asyncio.sleep(max(scheduled - loop.time(), 0.0))
+        tasks.append(asyncio.create_task(_one(i, scheduled)))
+    await asyncio.gather(*tasks)
+    wall_s = loop.time() - wall_start
+
+    infos = await _collect_worker_info(client, worker_probes, reset=False)
+
+    results: Dict[str, Any] = {}
+    total_errors = 0
+    for kind, samples in latencies.items():
+        errors = sum(n for code, n in statuses[kind].items() if not code.startswith("2"))
+        total_errors += errors
+        results[kind] = {
+            **latency_stats(samples),
+            "error_rate": round(errors / len(samples), 4),
+            "status": dict(statuses[kind]),
+        }
+    results["overall"] = {
+        "requests": requests,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(requests / wall_s, 2) if wall_s else 0.0,
+        "error_rate": round(total_errors / requests, 4) if requests else 0.0,
+    }
+    results["requests_per_worker"] = dict(per_worker)
+    results["event_loop_lag"] = {str(pid): info["event_loop_lag"] for pid, info in infos.items()}
+    return results
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    params = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "ingest_ratio": args.ingest_ratio,
+        "sessions": args.sessions,
+    }
+    load = dict(params, ingest_paths=args.ingest_path or None)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            results = await run_load(client, **load, worker_probes=args.worker_probes)
+        return {"benchmark": "loadtest", "mode": "http", "url": args.url, "params": params, "results": results}
+
+    app = create_stub_app(args.docs, args.llm_latency)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            results = await run_load(client, **load)
+    finally:
+        app.state.loadtest_monitor.stop()
+    return {"benchmark": "loadtest", "mode": "asgi", "params": params, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the multi agent RAG API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="generate load and print a JSON report")
+    run_p.add_argument("--url", default="", help="target base URL; default runs the stubbed app in-process")
+    run_p.add_argument("--requests", type=int, default=200)
+    run_p.add_argument("--concurrency", type=int, default=16, help="maximum requests in flight")
+    run_p.add_argument("--rate", type=float, default=0.0, help="arrival rate in requests/s (open loop); 0 = closed loop")
+    run_p.add_argument("--ingest-ratio", type=float, default=0.0, help="share of requests sent to /ingest")
+    run_p.add_argument("--ingest-path", action="append", default=[], help="server-side file to ingest (repeatable)")
+    run_p.add_argument("--sessions", type=int, default=50, help="distinct chat session ids")
+    run_p.add_argument("--timeout", type=float, default=60.0)
+    run_p.add_argument("--worker-probes", type=int, default=16, help="/loadtest/info calls used to reach every worker")
+    run_p.add_argument("--docs", type=int, default=100, help="in-process mode: corpus size")
+    run_p.add_argument("--llm-latency", type=float, default=0.05, help="in-process mode: simulated seconds per LLM call")
+    run_p.add_argument("--output", default="")
+
+    serve_p = sub.add_parser("serve", help="run the stubbed app under uvicorn workers")
+    serve_p.add_argument("--host", default="127.0.0.1")
+    serve_p.add_argument("--port", type=int, default=8001)
+    serve_p.add_argument("--workers", type=int, default=1)
+    serve_p.add_argument("--docs", type=int, default=100)
+    serve_p.add_argument("--llm-latency", type=float, default=0.05)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        import uvicorn
+
+        os.environ["LOADTEST_DOCS"] = str(args.docs)
+        os.environ["LOADTEST_LLM_LATENCY_S"] = str(args.llm_latency)
+        uvicorn.run(
+            "benchmarks.loadtest:create_stub_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level="warning",
+        )
+        return
+
+    body = json.dumps(asyncio.run(_run(args)), indent=2)
+    if args.output:
+        Path(args.output).write_text(body + "\n", encoding="utf-8")
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
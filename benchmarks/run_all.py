@@ -0,0 +1,89 @@
+# Run every benchmark with its default parameters and write one JSON report with run metadata, for comparing commits.
+# Run from the repo root: PYTHONPATH=. python -m benchmarks.run_all [--only retrieval,workflow] [--output results.json]
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from benchmarks import (
+    bench_ingestion,
+    bench_memory_codec,
+    bench_memory_store,
+    bench_pdf,
+    bench_rerank,
+    bench_retrieval,
+    bench_startup,
+    bench_workflow,
+)
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "startup": bench_startup.run,
+    "memory_codec": bench_memory_codec.run,
+    "memory_store": bench_memory_store.run,
+    "rerank": bench_rerank.run,
+    "pdf": bench_pdf.run,
+    "ingestion": bench_ingestion.run,
+    "retrieval": bench_retrieval.run,
+    "workflow": bench_workflow.run,
+}
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run(names: list[str]) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks in a fixed order and collect their results with environment metadata.
+    Inputs: benchmark names ; Outputs: JSON-serialisable report dict.
+    """
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "benchmarks": {},
+    }
+    for name in names:
+        start = time.perf_counter()
+        result = BENCHMARKS[name]()
+        result["wall_s"] = round(time.perf_counter() - start, 2)
+        report["benchmarks"][name] = result
+        print(f"{name}: done in {result['wall_s']}s", file=sys.stderr)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", default="", help="comma separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--output", default="", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    body = json.dumps(run(names), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
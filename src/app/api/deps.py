@@ -20,9 +20,6 @@ def get_graph_app_dep():
     return get_graph_app()
 
 
-GraphApp = type(get_graph_app()) 
-
-
 def common_dependencies(
     logger=Depends(get_logger_dep),
     graph_app=Depends(get_graph_app_dep),
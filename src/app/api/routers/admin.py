@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hmac
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from src.app.core import profiling
+from src.app.core.config import settings
+from src.app.schemas.admin import ProfilerStartRequest
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Guard admin endpoints with the shared ADMIN_API_TOKEN; they are disabled when the setting is empty.
+    Inputs: X-Admin-Token header ; Outputs: None, raises HTTPException 403/401.
+    """
+    expected = settings.ADMIN_API_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin API is disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid admin token")
+
+
+router = APIRouter(prefix="/admin/profiler", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.post("/start")
+async def start_profiler(payload: ProfilerStartRequest) -> dict:
+    """
+    Arm a profiling session (sampling for N seconds, or the next K /chat requests / ingestion jobs).
+    Inputs: payload ; Outputs: session status.
+    """
+    try:
+        return profiling.start_session(
+            payload.mode,
+            payload.trigger,
+            duration_s=payload.duration_s,
+            runs=payload.runs,
+            interval_ms=payload.interval_ms,
+            include_idle=payload.include_idle,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.post("/stop")
+async def stop_profiler() -> dict:
+    """
+    Stop the active session early, keeping the samples collected so far as the latest result.
+    Inputs: none ; Outputs: session status.
+    """
+    profiling.stop_session()
+    return profiling.session_status()
+
+
+@router.get("/status")
+async def profiler_status() -> dict:
+    return profiling.session_status()
+
+
+@router.get("/result")
+async def profiler_result(
+    format: Literal["collapsed", "speedscope", "pstats", "text"] = "speedscope",
+) -> Response:
+    """
+    Download the latest finished profile: collapsed stacks or speedscope JSON for sampling sessions, pstats dump or text report for cProfile.
+    Inputs: format ; Outputs: file response.
+    """
+    result = profiling.last_result()
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="no finished profile")
+    try:
+        body, media_type, filename = result.render(format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -6,12 +6,20 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
-from src.app.schemas.chat import ChatRequest, ChatResponse
+from src.app.core.admission import Overloaded, admit
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.app.core.metrics import REQUEST_LATENCY, RequestTimings, start_request_timings
+from src.app.core.profiling import profiled
+from src.app.schemas.chat import ChatProfile, ChatRequest, ChatResponse
+from src.graph.speculation import speculation_scope
 from src.graph.workflow import get_graph_app
 from src.graph.state import GraphState
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+logger = get_logger("api")
+
 def _convert_client_messages(client_messages):
     """
     Convert the client provided chat messages into LangChain BaseMessage objects for execution inside the LangGraph workflow.
@@ -31,16 +39,37 @@ def _convert_client_messages(client_messages):
     return converted
 
 
+def _build_profile(timings: RequestTimings, result_state: GraphState) -> ChatProfile:
+    """
+    Turn the request timing spans and the turn's trace events into the optional profile returned by /chat.
+    Inputs: timings collected during the turn, final graph state ; Outputs: ChatProfile.
+    """
+    summary = timings.summary()
+    return ChatProfile(
+        total_ms=summary["total_ms"],
+        retries=int(result_state.get("retry_count", 0) or 0),
+        timeline=timings.timeline(),
+        counters=summary["counters"],
+        trace=list(result_state.get("trace") or []),
+    )
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
     """
     Execute one chat turn by building an initial GraphState, invoking the compiled LangGraph workflow for the given session, and returning the final answer with citations.
-    Inputs: payload containing session_id and messages ; Outputs: ChatResponse containing session_id, answer text, and structured citations.
+    The per-stage timing breakdown of the turn (nodes, LLM, Qdrant, Redis, tokens, cache hits) is logged as 'chat_timings' with its outcome (ok, rejected or error), also for turns that fail or are rejected.
+    With payload.profile (and CHAT_PROFILE_ENABLED) the response also carries that timeline: nodes, LLM/Qdrant/Redis calls, candidate counts, retries and trace events.
+    Turns run in the interactive priority class; when the LLM queue is already full the request is rejected up front (429 + Retry-After).
+    Inputs: payload containing session_id, messages and the optional profile flag ; Outputs: ChatResponse containing session_id, answer text, structured citations and the optional profile.
     """
+    timings = start_request_timings()
+    session_id = (payload.session_id or "").strip()
+    outcome = "error"
     try:
+        admit("llm")
         graph_app = get_graph_app()
 
-        session_id = (payload.session_id or "").strip()
         if not session_id:
             session_id = f"session-{uuid.uuid4()}"
 
@@ -65,21 +94,29 @@ async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
 
         initial_state: GraphState = {
             "messages": langchain_messages,
+            "trace": [],
             "question": question,
             "plan": None,
+            "retrieval_query": None,
+            "prefetched_documents": None,
+            "speculation_id": None,
             "documents": [],
             "answer": None,
             "citations": [],
+            "fused_citations": None,
             "session_id": session_id,
+            "memory_summary": None,
+            "memory_messages": None,
             "retry_count": 0,
         }
 
         config = {"configurable": {"thread_id": session_id}}
 
-        result_state: GraphState = await graph_app.ainvoke(
-            initial_state,
-            config=config,
-        )
+        with profiled("chat"), speculation_scope():
+            result_state: GraphState = await graph_app.ainvoke(
+                initial_state,
+                config=config,
+            )
 
         answer = result_state.get("answer") or ""
         citations = result_state.get("citations", [])
@@ -90,12 +127,21 @@ async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
                 detail="Graph returned empty answer",
             )
 
+        profile = None
+        if payload.profile and settings.CHAT_PROFILE_ENABLED:
+            profile = _build_profile(timings, result_state)
+
+        outcome = "ok"
         return ChatResponse(
             session_id=session_id,
             answer=answer,
             citations=citations,
+            profile=profile,
         )
 
+    except Overloaded:
+        outcome = "rejected"
+        raise
     except HTTPException:
         raise
     except Exception as exc:
@@ -103,3 +149,7 @@ async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal error in chat workflow: {exc}",
         )
+    finally:
+        breakdown = timings.summary()
+        REQUEST_LATENCY.labels(endpoint="chat").observe(breakdown["total_ms"] / 1000)
+        logger.info("chat_timings", session_id=session_id, outcome=outcome, **breakdown)
@@ -3,8 +3,10 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
 from src.app.api.deps import common_dependencies
+from src.app.core.admission import Overloaded, set_priority
 from src.app.schemas.ingest import IngestRequest, IngestResponse
 from src.rag.ingestion.indexing import index_documents
 
@@ -18,6 +20,8 @@ async def ingest_endpoint(
 ) -> IngestResponse:
     """
     Ingest documents into the vector store by indexing a list of container local file paths and returning ingestion statistics for debugging/demo purposes.
+    Indexing is blocking (file parsing, embedding, upserts), so it runs once on the threadpool instead of on the event loop,
+    in the batch priority class: its embedding/Qdrant calls queue behind interactive chat turns, with a longer wait budget.
     Inputs: payload with 'paths' and deps ; Outputs: IngestResponse containing indexed_files and ingestion counts.
     """
     logger = deps["logger"]
@@ -30,16 +34,19 @@ async def ingest_endpoint(
 
     try:
         logger.info("ingest_start", paths=payload.paths)
-        index_documents(payload.paths)
-        logger.info("ingest_success", paths=payload.paths)
-        result = index_documents(payload.paths)
+        set_priority("batch")
+        result = await run_in_threadpool(index_documents, payload.paths)
+        logger.info("ingest_success", paths=payload.paths, chunks_indexed=result.chunks_indexed)
 
         return IngestResponse(
             indexed_files=result.indexed_files,
             documents_loaded=result.documents_loaded,
             chunks_indexed=result.chunks_indexed,
             points_upserted=result.points_upserted,
+            duplicates_folded=result.duplicates_folded,
         )
+    except Overloaded:
+        raise
     except Exception as exc:
         logger.error("ingest_failed", error=str(exc))
         raise HTTPException(
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.app.core.metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT, observe
+
+logger = get_logger("admission")
+
+# Lower value is served first.
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("admission_priority", default="interactive")
+
+
+class Overloaded(Exception):
+    """
+    Raised when a resource cannot take more work: its wait queue is full ("queue_full", surfaced as 429)
+    or the caller's wait budget ran out ("wait_budget", surfaced as 503). Both carry a Retry-After hint.
+    """
+
+    def __init__(self, resource: str, reason: str, retry_after_s: int):
+        super().__init__(f"{resource} overloaded ({reason}), retry after {retry_after_s}s")
+        self.resource = resource
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+    @property
+    def status_code(self) -> int:
+        return 429 if self.reason == "queue_full" else 503
+
+
+class ResourceLimiter:
+    """
+    Thread-safe priority semaphore: at most `capacity` holders, at most `max_queue` waiters, served by priority class then arrival order.
+    Callers are the worker threads that run the blocking LLM / embedding / Qdrant calls, hence threading rather than asyncio primitives.
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue: int):
+        self.name = name
+        self.capacity = max(capacity, 1)
+        self.max_queue = max(max_queue, 0)
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._avg_hold_s = 1.0
+
+    def _retry_after_locked(self) -> int:
+        """
+        Estimate when a slot frees up: queued work ahead of a new caller divided by capacity, times the average hold time.
+        Inputs: none ; Outputs: whole seconds (at least 1).
+        """
+        backlog = (len(self._waiters) + self._in_use) / self.capacity
+        return max(1, math.ceil(backlog * self._avg_hold_s))
+
+    def _reject_locked(self, reason: str, priority: str) -> Overloaded:
+        ADMISSION_REJECTIONS.labels(resource=self.name, reason=reason, priority=priority).inc()
+        logger.warning("admission_rejected", resource=self.name, reason=reason, priority=priority, queued=len(self._waiters))
+        return Overloaded(self.name, reason, self._retry_after_locked())
+
+    def check(self, priority: str = "interactive") -> None:
+        """
+        Fail fast when a new caller would be rejected anyway (queue full), without taking a slot.
+        Inputs: priority ; Outputs: None. Raises Overloaded.
+        """
+        with self._cond:
+            if self._in_use >= self.capacity and len(self._waiters) >= self.max_queue:
+                raise self._reject_locked("queue_full", priority)
+
+    def acquire(self, priority: str, wait_budget_s: float) -> None:
+        """
+        Take a slot, waiting at most wait_budget_s behind higher-priority and earlier callers.
+        Inputs: priority class, wait budget ; Outputs: None. Raises Overloaded when the queue is full or the budget runs out.
+        """
+        rank = PRIORITIES.get(priority, PRIORITIES["interactive"])
+        start = time.perf_counter()
+        with self._cond:
+            if self._in_use < self.capacity and not self._waiters:
+                self._in_use += 1
+                ADMISSION_WAIT.labels(resource=self.name, priority=priority).observe(0.0)
+                return
+            if len(self._waiters) >= self.max_queue:
+                raise self._reject_locked("queue_full", priority)
+
+            entry = (rank, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            deadline = start + wait_budget_s
+            try:
+                while not (self._in_use < self.capacity and self._waiters[0] == entry):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise self._reject_locked("wait_budget", priority)
+                    self._cond.wait(remaining)
+                heapq.heappop(self._waiters)
+                self._in_use += 1
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+        observe(ADMISSION_WAIT, f"admission.{self.name}", time.perf_counter() - start, resource=self.name, priority=priority)
+
+    def release(self, held_s: float) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._avg_hold_s = 0.9 * self._avg_hold_s + 0.1 * held_s
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "in_use": self._in_use,
+                "queued": len(self._waiters),
+                "avg_hold_s": round(self._avg_hold_s, 3),
+            }
+
+
+_limiters: Dict[str, ResourceLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _capacity(resource: str) -> int:
+    return {
+        "llm": settings.LLM_MAX_CONCURRENCY,
+        "embedding": settings.EMBEDDING_MAX_CONCURRENCY,
+        "qdrant": settings.QDRANT_MAX_CONCURRENCY,
+    }[resource]
+
+
+def get_limiter(resource: str) -> ResourceLimiter:
+    """
+    Create and cache the limiter of a resource ("llm", "embedding" or "qdrant"), sized from settings.
+    Inputs: resource ; Outputs: ResourceLimiter.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(resource)
+        if limiter is None:
+            limiter = ResourceLimiter(resource, _capacity(resource), settings.ADMISSION_MAX_QUEUE)
+            _limiters[resource] = limiter
+        return limiter
+
+
+def set_priority(priority: str) -> contextvars.Token:
+    """
+    Set the priority class of the current request (inherited by worker threads started with concurrency.submit or run_in_threadpool).
+    Inputs: "interactive" or "batch" ; Outputs: the contextvar token.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {tuple(PRIORITIES)}")
+    return _priority.set(priority)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def _wait_budget(priority: str) -> float:
+    return settings.ADMISSION_BATCH_WAIT_BUDGET_SECONDS if priority == "batch" else settings.ADMISSION_WAIT_BUDGET_SECONDS
+
+
+@contextmanager
+def limit(resource: str, priority: Optional[str] = None) -> Iterator[None]:
+    """
+    Hold one slot of a resource around a blocking call; a no-op when ADMISSION_ENABLED is off.
+    Inputs: resource, priority (defaults to the request's class) ; Outputs: context manager. Raises Overloaded.
+    """
+    if not settings.ADMISSION_ENABLED:
+        yield
+        return
+    priority = priority or _priority.get()
+    limiter = get_limiter(resource)
+    limiter.acquire(priority, _wait_budget(priority))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        limiter.release(time.perf_counter() - start)
+
+
+def admit(resource: str) -> None:
+    """
+    Entry check for an API request: reject immediately if the resource's queue is already full, before doing any work.
+    Inputs: resource ; Outputs: None. Raises Overloaded.
+    """
+    if settings.ADMISSION_ENABLED:
+        get_limiter(resource).check(_priority.get())
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
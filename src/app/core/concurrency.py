@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.app.core.config import settings
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Create and cache the shared worker thread pool used to overlap blocking I/O (LLM, Qdrant, Redis) inside a single chat turn.
+    Inputs: none; Outputs: a ThreadPoolExecutor sized by settings.WORKER_POOL_SIZE.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.WORKER_POOL_SIZE,
+            thread_name_prefix="rag-worker",
+        )
+    return _executor
+
+
+def submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run a callable on the shared worker pool, propagating the caller's contextvars (request scoped logging/metrics context).
+    Inputs: fn and its arguments; Outputs: a concurrent.futures.Future for the call.
+    """
+    ctx = contextvars.copy_context()
+    return get_executor().submit(ctx.run, fn, *args, **kwargs)
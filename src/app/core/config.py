@@ -21,27 +21,134 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://redis:6379/0"
+    # "async" uses redis.asyncio with a bounded pool, per-call timeouts and a circuit breaker, "sync" the blocking client
+    MEMORY_BACKEND: str = "async"
+    REDIS_POOL_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 0.2
+    REDIS_OP_TIMEOUT_SECONDS: float = 0.25
+    REDIS_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    REDIS_CIRCUIT_RESET_SECONDS: float = 30.0
     # Memory / context control
     REDIS_TTL_SECONDS: int = 60 * 60 * 24 * 7  
     MEMORY_MAX_MESSAGES: int = 12  
     MEMORY_SUMMARY_MAX_CHARS: int = 2000  
+    # "blob" rewrites the whole window as one JSON value per turn, "list" appends one list entry per message (RPUSH + LTRIM via Lua)
+    MEMORY_STORAGE_LAYOUT: str = "blob"
+    # "json" keeps the LangChain JSON envelopes, "msgpack" uses the compact versioned codec (zstd above MEMORY_COMPRESSION_MIN_BYTES, 0 disables)
+    MEMORY_CODEC: str = "json"
+    MEMORY_COMPRESSION_MIN_BYTES: int = 1024
 
     # LLM / embeddings
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL_NAME: str = "gpt-4.1-mini"
     EMBEDDING_MODEL_NAME: str = "BAAI/bge-large-en-v1.5"
     
+    # Shared worker pool used to overlap blocking calls within a turn
+    WORKER_POOL_SIZE: int = 16
+
     # Logging
     LOG_LEVEL: str = "INFO"
+    # Internal agent events kept in GraphState["trace"] per turn (oldest dropped first)
+    GRAPH_TRACE_MAX_EVENTS: int = 50
+    # Allow clients to request a per-turn timing timeline with ChatRequest.profile
+    CHAT_PROFILE_ENABLED: bool = False
+
+    # Admin endpoints (profiler) require this value in the X-Admin-Token header; unset disables them
+    ADMIN_API_TOKEN: str | None = None
+    PROFILER_MAX_SECONDS: int = 300
+
+    # Admission control: concurrent slots per resource, shared wait queue length per resource, and how long a caller may wait
+    # for a slot (interactive /chat vs batch /ingest) before the request is rejected with 503 + Retry-After (429 when the queue is full)
+    ADMISSION_ENABLED: bool = True
+    LLM_MAX_CONCURRENCY: int = 16
+    EMBEDDING_MAX_CONCURRENCY: int = 2
+    QDRANT_MAX_CONCURRENCY: int = 32
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_WAIT_BUDGET_SECONDS: float = 10.0
+    ADMISSION_BATCH_WAIT_BUDGET_SECONDS: float = 120.0
+    EMBEDDING_BATCH_SIZE: int = 64
+
+    # Share one workflow run between concurrent identical questions from sessions without history
+    COALESCE_ENABLED: bool = True
+
+    # Startup warmup (models, pools, collection) run in the background; /ready reports 503 until it has succeeded
+    WARMUP_ENABLED: bool = True
+    WARMUP_RETRY_SECONDS: float = 10.0
     
-    # Chunking
+    # PDF text extraction: PDF_BACKEND is "pypdf" (same text as the former PyPDFLoader), "pypdfium2" (fastest) or "pdfminer" (no box
+    # ordering). PDFs of PDF_PARALLEL_MIN_PAGES pages or more are split into PDF_PAGES_PER_TASK page ranges over PDF_WORKERS processes (0 or 1: in process)
+    PDF_BACKEND: str = "pypdf"
+    PDF_WORKERS: int = 4
+    PDF_PARALLEL_MIN_PAGES: int = 32
+    PDF_PAGES_PER_TASK: int = 8
+
+    # Chunking: "recursive" (overlapping CHUNK_SIZE/CHUNK_OVERLAP character windows), "sentence" (sentences packed into
+    # CHUNK_MAX_TOKENS, no overlap) or "semantic" (as "sentence", also cutting where adjacent sentence embeddings diverge:
+    # similarities at or below CHUNK_SEMANTIC_BREAK_PERCENTILE, once a chunk holds CHUNK_MIN_TOKENS)
+    CHUNKING_STRATEGY: str = "recursive"
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 150
+    CHUNK_MAX_TOKENS: int = 300
+    CHUNK_MIN_TOKENS: int = 150
+    CHUNK_SEMANTIC_BREAK_PERCENTILE: float = 5.0
+    # Duplicate chunks are stored as references on the first copy instead of as points. Only identical normalised text folds unless
+    # DEDUP_NEAR_DUPLICATES is set: then chunks whose MinHash Jaccard estimate (DEDUP_SHINGLE_SIZE-word shingles) reaches
+    # DEDUP_MIN_JACCARD also fold, provided their numbers, names, ordinals and months are identical (chunks under DEDUP_MIN_TOKENS
+    # words must still match exactly)
+    DEDUP_ENABLED: bool = True
+    DEDUP_NEAR_DUPLICATES: bool = False
+    DEDUP_SHINGLE_SIZE: int = 3
+    DEDUP_MIN_JACCARD: float = 0.8
+    DEDUP_MIN_TOKENS: int = 12
 
     # Retrieval
     RETRIEVAL_TOP_K: int = 8
     RETRIEVAL_DENSE_K: int = 25 
     RETRIEVAL_LEXICAL_K: int = 25 
+    # Multi-query fan-out: sub-questions from the LLM plan are searched concurrently and fused with RRF
+    RETRIEVAL_MAX_SUBQUERIES: int = 4
+    RETRIEVAL_RRF_K: int = 60
+    # Drop retrieved chunks that are duplicates of a better ranked one before taking the top k (same rules as ingest dedup)
+    RETRIEVAL_COLLAPSE_DUPLICATES: bool = True
+    # Recent query embeddings kept in process, shared by speculative retrieval, retrieval and the intent classifier
+    QUERY_EMBEDDING_CACHE_SIZE: int = 256
+
+    # Query planning: "auto" uses the rule-based planner for simple questions and the LLM otherwise,
+    # "rule" never calls the LLM, "concurrent" retrieves on the raw question while the LLM planner runs, "llm" always plans first
+    QUERY_PLANNER_STRATEGY: str = "auto"
+    QUERY_PLANNER_SIMPLE_MAX_TOKENS: int = 12
+    # Start retrieval on the raw question while memory is loaded and the supervisor routes
+    SPECULATIVE_RETRIEVAL: bool = True
+
+    # Supervisor intent classifier: precompiled patterns route smalltalk, meta, history and out-of-scope questions away from retrieval;
+    # optionally, questions no pattern matches are compared with per-intent embedding centroids (reusing the query embedding)
+    INTENT_EMBEDDING_ENABLED: bool = False
+    INTENT_EMBEDDING_MIN_SCORE: float = 0.75
+    INTENT_EMBEDDING_MARGIN: float = 0.05
+
+    # Retrieval quality gate, on dense similarity scores: no candidate above NOT_FOUND_SCORE (and no lexical match) answers "not found"
+    # without reasoning; MIN_RELEVANT candidates above RELEVANT_SCORE, or one above STRONG_SCORE, continue; weaker results retry once
+    # with a local keyword/acronym rewrite of the query
+    QUALITY_GATE_NOT_FOUND_SCORE: float = 0.35
+    QUALITY_GATE_RELEVANT_SCORE: float = 0.55
+    QUALITY_GATE_STRONG_SCORE: float = 0.75
+    QUALITY_GATE_MIN_RELEVANT: int = 2
+
+    # Prompt context budgets, in tokens of TOKENIZER_ENCODING (an approximate local counter is used if it cannot be loaded)
+    TOKENIZER_ENCODING: str = "cl100k_base"
+    CONTEXT_MAX_TOKENS: int = 6000
+    CONTEXT_HISTORY_MAX_TOKENS: int = 800
+    CONTEXT_SUMMARY_MAX_TOKENS: int = 300
+    CONTEXT_MAX_PASSAGES: int = 10
+    CONTEXT_MIN_PASSAGE_TOKENS: int = 64
+    CITATION_CONTEXT_MAX_TOKENS: int = 4000
+
+    # Citations: "local" tries the deterministic sentence matcher first and only calls the LLM when confidence is low, "llm" always calls the LLM
+    CITATION_MODE: str = "local"
+    CITATION_LOCAL_MIN_SENTENCE_SCORE: float = 0.5
+    CITATION_LOCAL_MIN_CONFIDENCE: float = 0.6
+    # Single pass mode: the reasoning LLM returns the answer and its citations as one JSON object
+    REASONING_FUSED_CITATIONS: bool = False
 
     # Which LLM backend to use: "openai" or "ollama"
     LLM_PROVIDER: str = "ollama"
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+_COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 25, 50, 100)
+
+NODE_LATENCY = Histogram(
+    "rag_node_duration_seconds", "Wall time of each LangGraph node", ["node"], buckets=_LATENCY_BUCKETS
+)
+LLM_LATENCY = Histogram(
+    "rag_llm_duration_seconds", "Wall time of LLM completion calls", ["provider"], buckets=_LATENCY_BUCKETS
+)
+LLM_TOKENS = Histogram(
+    "rag_llm_tokens", "Prompt/completion tokens per LLM call", ["provider", "kind"], buckets=_TOKEN_BUCKETS
+)
+QDRANT_LATENCY = Histogram(
+    "rag_qdrant_duration_seconds", "Wall time of Qdrant calls", ["op"], buckets=_LATENCY_BUCKETS
+)
+REDIS_LATENCY = Histogram(
+    "rag_redis_duration_seconds", "Wall time of Redis memory calls", ["backend", "op"], buckets=_LATENCY_BUCKETS
+)
+EMBEDDING_LATENCY = Histogram(
+    "rag_embedding_duration_seconds", "Wall time of embedding batches", buckets=_LATENCY_BUCKETS
+)
+RETRIEVAL_CANDIDATES = Histogram(
+    "rag_retrieval_candidates", "Candidates returned per retrieval stage", ["stage"], buckets=_COUNT_BUCKETS
+)
+CACHE_EVENTS = Counter(
+    "rag_cache_events_total", "Cache/reuse lookups by outcome", ["cache", "result"]
+)
+ADMISSION_WAIT = Histogram(
+    "rag_admission_wait_seconds", "Time spent queued for an LLM/embedding/Qdrant slot", ["resource", "priority"], buckets=_LATENCY_BUCKETS
+)
+ADMISSION_REJECTIONS = Counter(
+    "rag_admission_rejections_total", "Calls rejected by admission control", ["resource", "reason", "priority"]
+)
+TOKENIZER_FALLBACKS = Counter(
+    "rag_tokenizer_fallback_total", "Failed tokenizer loads that fell back to the approximate token counter", ["encoding"]
+)
+REQUEST_LATENCY = Histogram(
+    "rag_request_duration_seconds", "End-to-end API request wall time", ["endpoint"], buckets=_LATENCY_BUCKETS
+)
+
+
+@dataclass
+class RequestTimings:
+    """
+    Per-request breakdown collected while a request runs: one span per timed stage plus token and cache counters.
+    Shared (by reference) with worker threads through the contextvar, so writes are locked.
+    """
+    started_at: float = field(default_factory=time.perf_counter)
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_span(self, stage: str, start: float, end: float) -> None:
+        with self._lock:
+            self.spans.append((stage, start - self.started_at, end - self.started_at))
+
+    def add_count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """
+        List every span in start order, with offsets relative to the start of the request.
+        Inputs: none ; Outputs: [{"stage", "start_ms", "duration_ms"}].
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s[1])
+        return [
+            {"stage": stage, "start_ms": round(start * 1000, 2), "duration_ms": round((end - start) * 1000, 2)}
+            for stage, start, end in spans
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the spans per stage for logging.
+        Inputs: none ; Outputs: {"total_ms", "stages": {stage: {"ms", "count"}}, "counters"}.
+        """
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        stages: Dict[str, Dict[str, float]] = {}
+        for stage, start, end in spans:
+            entry = stages.setdefault(stage, {"ms": 0.0, "count": 0})
+            entry["ms"] = round(entry["ms"] + (end - start) * 1000, 2)
+            entry["count"] += 1
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            "stages": stages,
+            "counters": counters,
+        }
+
+
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Start collecting a timing breakdown for the current request (visible to worker threads started with concurrency.submit).
+    Inputs: none ; Outputs: the RequestTimings being filled.
+    """
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    return _request_timings.get()
+
+
+def _count(key: str, value: int = 1) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add_count(key, value)
+
+
+@contextmanager
+def timed(histogram: Histogram, stage: str, **labels: str) -> Iterator[None]:
+    """
+    Time a block: observe the histogram (with labels) and add a span to the current request breakdown, also when the block raises.
+    Inputs: histogram, stage name used in the breakdown, label values ; Outputs: context manager.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        (histogram.labels(**labels) if labels else histogram).observe(end - start)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add_span(stage, start, end)
+
+
+def observe(histogram: Histogram, stage: str, elapsed_s: float, **labels: str) -> None:
+    """
+    Record an already measured duration (for callers that time themselves, e.g. under asyncio.wait_for).
+    Inputs: histogram, stage, elapsed seconds, label values ; Outputs: None.
+    """
+    (histogram.labels(**labels) if labels else histogram).observe(elapsed_s)
+    timings = _request_timings.get()
+    if timings is not None:
+        end = time.perf_counter()
+        timings.add_span(stage, end - elapsed_s, end)
+
+
+def record_llm_tokens(provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """
+    Record token usage reported by the provider for one completion (missing values are skipped).
+    Inputs: provider, prompt_tokens, completion_tokens ; Outputs: None.
+    """
+    for kind, value in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+        if isinstance(value, int):
+            LLM_TOKENS.labels(provider=provider, kind=kind).observe(value)
+            _count(f"llm_{kind}_tokens", value)
+
+
+def record_candidates(stage: str, count: int) -> None:
+    RETRIEVAL_CANDIDATES.labels(stage=stage).observe(count)
+    _count(f"candidates_{stage}", count)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    result = "hit" if hit else "miss"
+    CACHE_EVENTS.labels(cache=cache, result=result).inc()
+    _count(f"cache_{cache}_{result}")
+
+
+def instrument_node(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a LangGraph node (sync or async) so each run is timed under rag_node_duration_seconds{node=name}.
+    Inputs: node name, node function ; Outputs: wrapped function with the same signature and sync/async kind.
+    """
+    stage = f"node.{name}"
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _async_node(*args: Any, **kwargs: Any) -> Any:
+            with timed(NODE_LATENCY, stage, node=name):
+                return await fn(*args, **kwargs)
+
+        return _async_node
+
+    @functools.wraps(fn)
+    def _node(*args: Any, **kwargs: Any) -> Any:
+        with timed(NODE_LATENCY, stage, node=name):
+            return fn(*args, **kwargs)
+
+    return _node
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """
+    Render every registered metric in the Prometheus text exposition format.
+    Inputs: none ; Outputs: (body, content type).
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
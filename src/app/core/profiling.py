@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+
+logger = get_logger("profiling")
+
+MODES = ("sampling", "cprofile")
+TRIGGERS = ("duration", "chat", "ingest")
+
+# Leaf frames of threads parked waiting for work (executor workers, event loop selector, condition waits); skipped unless include_idle.
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler in pure Python: a daemon thread snapshots every other thread's stack (sys._current_frames) each interval
+    and aggregates them as collapsed stacks, the format used by py-spy/flamegraph.pl, convertible to speedscope.
+    """
+
+    def __init__(self, interval_s: float = 0.005, include_idle: bool = False):
+        self.interval_s = interval_s
+        self.include_idle = include_idle
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self.duration_s = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="rag-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.duration_s = time.perf_counter() - self._started_at
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                code = frame.f_code
+                if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(tid, str(tid)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Render the samples as collapsed stacks ("thread;outer;...;inner count" per line).
+        Inputs: none ; Outputs: text.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """
+        Render the samples as a speedscope "sampled" profile, each distinct stack weighted by its sample count times the interval.
+        Inputs: profile name ; Outputs: speedscope JSON document (dict).
+        """
+        frame_index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.stacks.items():
+            samples.append([frame_index.setdefault(f, len(frame_index)) for f in stack.split(";")])
+            weights.append(count * self.interval_s)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "multiagent-rag-profiler",
+            "shared": {"frames": [{"name": f} for f in frame_index]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+@dataclass
+class ProfileResult:
+    mode: str
+    trigger: str
+    duration_s: float
+    runs: int
+    sampler: Optional[SamplingProfiler] = None
+    stats: Optional[pstats.Stats] = None
+
+    def render(self, fmt: str) -> Tuple[bytes, str, str]:
+        """
+        Export the result in a downloadable format: collapsed/speedscope for sampling, pstats (marshalled, loadable with pstats.Stats) or text for cProfile.
+        Inputs: fmt ; Outputs: (body, media type, filename). Raises ValueError for a format the mode does not produce.
+        """
+        name = f"profile-{self.trigger}-{self.mode}"
+        if self.sampler is not None and fmt == "collapsed":
+            return self.sampler.collapsed().encode("utf-8"), "text/plain", f"{name}.collapsed.txt"
+        if self.sampler is not None and fmt == "speedscope":
+            body = json.dumps(self.sampler.speedscope(name)).encode("utf-8")
+            return body, "application/json", f"{name}.speedscope.json"
+        if self.stats is not None and fmt == "pstats":
+            return marshal.dumps(self.stats.stats), "application/octet-stream", f"{name}.pstats"
+        if self.stats is not None and fmt == "text":
+            out = io.StringIO()
+            self.stats.stream = out
+            self.stats.sort_stats("cumulative").print_stats(60)
+            return out.getvalue().encode("utf-8"), "text/plain", f"{name}.txt"
+        raise ValueError(f"format '{fmt}' is not available for a {self.mode} profile")
+
+
+@dataclass
+class _Session:
+    mode: str
+    trigger: str
+    remaining: int
+    interval_s: float
+    include_idle: bool
+    duration_s: Optional[float]
+    created_at: float = field(default_factory=time.time)
+    active: int = 0
+    runs: int = 0
+    sampler: Optional[SamplingProfiler] = None
+    stats: Optional[pstats.Stats] = None
+    timer: Optional[threading.Timer] = None
+
+
+_lock = threading.Lock()
+_session: Optional[_Session] = None
+_last_result: Optional[ProfileResult] = None
+
+
+def _finish_locked(session: _Session) -> ProfileResult:
+    """
+    Stop the session's profiler and publish its result. Caller must hold _lock.
+    Inputs: session ; Outputs: ProfileResult.
+    """
+    global _session, _last_result
+    if session.timer is not None:
+        session.timer.cancel()
+    duration = 0.0
+    if session.sampler is not None and session.sampler.started:
+        session.sampler.stop()
+        duration = session.sampler.duration_s
+    _last_result = ProfileResult(
+        mode=session.mode,
+        trigger=session.trigger,
+        duration_s=duration or time.time() - session.created_at,
+        runs=session.runs,
+        sampler=session.sampler,
+        stats=session.stats,
+    )
+    if _session is session:
+        _session = None
+    logger.info("profiler_finished", mode=session.mode, trigger=session.trigger, runs=session.runs)
+    return _last_result
+
+
+def _expire(session: _Session) -> None:
+    with _lock:
+        if _session is session:
+            _finish_locked(session)
+
+
+def start_session(
+    mode: str,
+    trigger: str,
+    *,
+    duration_s: Optional[float] = None,
+    runs: int = 1,
+    interval_ms: float = 5.0,
+    include_idle: bool = False,
+) -> Dict[str, Any]:
+    """
+    Arm a profiling session: sample all threads for duration_s ("duration"), or profile the next `runs` /chat requests ("chat") or ingestion jobs ("ingest").
+    cProfile is per-thread, so it is only available for ingestion jobs, which run on a single thread.
+    Inputs: mode, trigger, duration_s, runs, interval_ms, include_idle ; Outputs: session status dict.
+    Raises ValueError on invalid options and RuntimeError if a session is already active.
+    """
+    global _session
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    if trigger not in TRIGGERS:
+        raise ValueError(f"trigger must be one of {TRIGGERS}")
+    if mode == "cprofile" and trigger != "ingest":
+        raise ValueError("cprofile only profiles the calling thread; use it with trigger='ingest'")
+    if trigger == "duration" and not duration_s:
+        raise ValueError("duration_s is required for trigger='duration'")
+    if duration_s is not None and not 0 < duration_s <= settings.PROFILER_MAX_SECONDS:
+        raise ValueError(f"duration_s must be in (0, {settings.PROFILER_MAX_SECONDS}]")
+    if runs < 1:
+        raise ValueError("runs must be >= 1")
+
+    with _lock:
+        if _session is not None:
+            raise RuntimeError("a profiling session is already active")
+        session = _Session(
+            mode=mode,
+            trigger=trigger,
+            remaining=runs if trigger != "duration" else 0,
+            interval_s=max(interval_ms, 1.0) / 1000,
+            include_idle=include_idle,
+            duration_s=duration_s,
+        )
+        if mode == "sampling":
+            session.sampler = SamplingProfiler(session.interval_s, include_idle)
+        if trigger == "duration":
+            session.sampler.start()
+        timeout = duration_s or settings.PROFILER_MAX_SECONDS
+        session.timer = threading.Timer(timeout, _expire, args=(session,))
+        session.timer.daemon = True
+        session.timer.start()
+        _session = session
+
+    logger.info("profiler_started", mode=mode, trigger=trigger, duration_s=duration_s, runs=runs)
+    return session_status()
+
+
+def stop_session() -> Optional[ProfileResult]:
+    """
+    Stop the active session early and keep what was collected so far.
+    Inputs: none ; Outputs: the ProfileResult, or None when no session was active.
+    """
+    with _lock:
+        if _session is None:
+            return None
+        return _finish_locked(_session)
+
+
+def session_status() -> Dict[str, Any]:
+    with _lock:
+        session, result = _session, _last_result
+    status: Dict[str, Any] = {"active": session is not None}
+    if session is not None:
+        status.update(
+            mode=session.mode,
+            trigger=session.trigger,
+            remaining_runs=session.remaining,
+            running=session.active,
+            completed_runs=session.runs,
+            samples=session.sampler.samples if session.sampler else 0,
+        )
+    if result is not None:
+        status["last_result"] = {
+            "mode": result.mode,
+            "trigger": result.trigger,
+            "duration_s": round(result.duration_s, 3),
+            "runs": result.runs,
+            "samples": result.sampler.samples if result.sampler else 0,
+        }
+    return status
+
+
+def last_result() -> Optional[ProfileResult]:
+    return _last_result
+
+
+@contextmanager
+def profiled(kind: str) -> Iterator[None]:
+    """
+    Hook around a unit of work ("chat" request or "ingest" job): profiles it when an armed session targets that kind, otherwise costs one attribute read.
+    Inputs: kind ; Outputs: context manager.
+    """
+    session = _session
+    if session is None or session.trigger != kind:
+        yield
+        return
+
+    with _lock:
+        if _session is not session or session.remaining <= 0:
+            session = None
+        else:
+            session.remaining -= 1
+            session.active += 1
+            if session.sampler is not None and not session.sampler.started:
+                session.sampler.start()
+
+    if session is None:
+        yield
+        return
+
+    prof = cProfile.Profile() if session.mode == "cprofile" else None
+    try:
+        if prof is not None:
+            prof.enable()
+        yield
+    finally:
+        if prof is not None:
+            prof.disable()
+        with _lock:
+            if prof is not None:
+                if session.stats is None:
+                    session.stats = pstats.Stats(prof)
+                else:
+                    session.stats.add(prof)
+            session.active -= 1
+            session.runs += 1
+            if session.remaining <= 0 and session.active == 0 and _session is session:
+                _finish_locked(session)
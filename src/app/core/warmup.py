@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+
+logger = get_logger("warmup")
+
+
+def _warm_graph() -> None:
+    from src.graph.workflow import get_answer_app, get_graph_app
+
+    get_graph_app()
+    get_answer_app()
+
+
+def _warm_workers() -> None:
+    from src.app.core.concurrency import get_executor
+
+    get_executor()
+
+
+def _warm_tokenizer() -> None:
+    from src.rag.llm.context_builder import count_tokens
+
+    count_tokens("warmup")
+
+
+def _warm_llm_client() -> None:
+    from src.rag.llm.models import get_reasoning_llm
+
+    get_reasoning_llm()
+
+
+def _warm_embedding_model() -> None:
+    from src.rag.llm.models import get_embedding_model
+
+    get_embedding_model().embed_documents(["warmup"])
+
+
+def _warm_qdrant() -> None:
+    from src.rag.vectorstore.qdrant_client import ensure_collection
+
+    ensure_collection()
+
+
+async def _warm_memory_store() -> None:
+    if (settings.MEMORY_BACKEND or "sync").lower() == "async":
+        from src.rag.memory.async_redis_memory import get_async_memory_store
+
+        ok = await get_async_memory_store().ping()
+    else:
+        from src.rag.memory.redis_memory import get_memory_store
+
+        ok = await run_in_threadpool(get_memory_store().ping)
+    if not ok:
+        raise ConnectionError("redis did not answer PING")
+
+
+# (name, step, required). Sync steps run on the threadpool. Memory is optional: the stores degrade to stateless turns without Redis.
+_STEPS: List[Tuple[str, Callable[[], Any], bool]] = [
+    ("graph", _warm_graph, True),
+    ("workers", _warm_workers, True),
+    ("tokenizer", _warm_tokenizer, True),
+    ("llm_client", _warm_llm_client, True),
+    ("embedding_model", _warm_embedding_model, True),
+    ("qdrant", _warm_qdrant, True),
+    ("memory_store", _warm_memory_store, False),
+]
+
+
+@dataclass
+class WarmupState:
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    steps: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        if not settings.WARMUP_ENABLED:
+            return True
+        required = [name for name, _, req in _STEPS if req]
+        return all(self.steps.get(name, {}).get("ok") for name in required)
+
+
+_state = WarmupState()
+
+
+async def _run_step(name: str, step: Callable[[], Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(step):
+            await step()
+        else:
+            await run_in_threadpool(step)
+        outcome: Dict[str, Any] = {"ok": True}
+    except Exception as exc:
+        outcome = {"ok": False, "error": str(exc)}
+    outcome["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    log = logger.info if outcome["ok"] else logger.warning
+    log("warmup_step", step=name, **outcome)
+    return outcome
+
+
+async def run_warmup() -> None:
+    """
+    Warm everything the first request would otherwise pay for: compile the graph, load the embedding model and run one embedding,
+    build the LLM client, ensure the Qdrant collection and open the Redis pool. Failed steps are retried every WARMUP_RETRY_SECONDS.
+    Inputs: none ; Outputs: None (progress is visible through readiness()).
+    """
+    _state.started_at = time.time()
+    while True:
+        for name, step, _ in _STEPS:
+            if not _state.steps.get(name, {}).get("ok"):
+                _state.steps[name] = await _run_step(name, step)
+        if _state.ready and _state.finished_at is None:
+            _state.finished_at = time.time()
+            logger.info("warmup_ready", total_s=round(_state.finished_at - _state.started_at, 3))
+        if all(s["ok"] for s in _state.steps.values()):
+            return
+        await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+
+
+def readiness() -> Tuple[bool, Dict[str, Any]]:
+    """
+    Report whether the warmup has completed every required step, for the /ready probe.
+    Inputs: none ; Outputs: (ready, body with status and per-step results).
+    """
+    ready = _state.ready
+    return ready, {"status": "ready" if ready else "warming_up", "steps": dict(_state.steps)}
@@ -1,13 +1,35 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pathlib import Path
 
-from src.app.api.routers import chat, ingest 
+from src.app.api.routers import admin, chat, ingest 
+from src.app.core.admission import Overloaded
+from src.app.core.config import settings
+from src.app.core.logging import setup_logging
+from src.app.core.metrics import metrics_payload
+from src.app.core.warmup import readiness, run_warmup
+
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the warmup in the background so the server accepts connections (and /health answers) while models load; /ready gates traffic.
+    """
+    task = asyncio.create_task(run_warmup()) if settings.WARMUP_ENABLED else None
+    yield
+    if task is not None:
+        task.cancel()
 
-app = FastAPI(title="Multi Agent RAG API")
+
+app = FastAPI(title="Multi Agent RAG API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,13 +39,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    """
+    Map admission rejections to 429 (queue full) or 503 (wait budget exceeded) with a Retry-After header.
+    """
+    return JSONResponse(
+        {"detail": str(exc), "resource": exc.resource, "reason": exc.reason},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
 app.include_router(chat.router)
 app.include_router(ingest.router)
+app.include_router(admin.router)
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+async def ready():
+    is_ready, body = readiness()
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     ui_path = Path("/app/ui.html")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilerStartRequest(BaseModel):
+    """
+    Request body to arm a profiling session.
+
+    Examples:
+      {"mode": "sampling", "trigger": "duration", "duration_s": 30}
+      {"mode": "sampling", "trigger": "chat", "runs": 20}
+      {"mode": "cprofile", "trigger": "ingest"}
+    """
+    mode: Literal["sampling", "cprofile"] = Field(default="sampling", description="Wall-clock stack sampling or cProfile.")
+    trigger: Literal["duration", "chat", "ingest"] = Field(
+        default="duration",
+        description="Profile for duration_s seconds, the next `runs` /chat requests, or the next `runs` ingestion jobs.",
+    )
+    duration_s: Optional[float] = Field(default=None, description="Sampling window for trigger='duration'.")
+    runs: int = Field(default=1, ge=1, description="Number of /chat requests or ingestion jobs to profile.")
+    interval_ms: float = Field(default=5.0, ge=1.0, description="Sampling interval.")
+    include_idle: bool = Field(default=False, description="Keep samples of threads parked waiting for work.")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class ChatMessage(BaseModel):
@@ -17,9 +17,31 @@ class ChatRequest(BaseModel):
     messages: List[ChatMessage] = Field(
         ..., description="Full chat history for this request (client-side view)."
     )
+    profile: bool = Field(
+        default=False,
+        description="Return a timing timeline of this turn (only honoured when CHAT_PROFILE_ENABLED is set).",
+    )
+
+
+class TimelineSpan(BaseModel):
+    stage: str = Field(..., description="node.<name>, llm.<provider>, embedding, qdrant.<op> or redis.<op>")
+    start_ms: float
+    duration_ms: float
+
+
+class ChatProfile(BaseModel):
+    total_ms: float
+    retries: int
+    timeline: List[TimelineSpan]
+    counters: Dict[str, int] = Field(
+        default_factory=dict,
+        description="LLM tokens, candidate counts per retrieval stage, cache hits/misses.",
+    )
+    trace: List[Dict[str, Any]] = Field(default_factory=list, description="Internal agent events of the turn.")
 
 
 class ChatResponse(BaseModel):
     session_id: str
     answer: str
     citations: list[dict]
+    profile: Optional[ChatProfile] = None
@@ -20,3 +20,4 @@ class IngestResponse(BaseModel):
     documents_loaded: int
     chunks_indexed: int
     points_upserted: int
+    duplicates_folded: int = 0
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from langchain_core.messages import HumanMessage
+
+from src.graph.state import GraphState
+from src.graph.trace import conversation_history
+from src.rag.vectorstore.qdrant_client import collection_generation
+
+T = TypeVar("T")
+
+_SPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.。！？]+$")
+
+_flights: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+
+def normalize_question(question: str) -> str:
+    """
+    Canonical form used to detect identical questions: case folded, whitespace collapsed, trailing punctuation dropped.
+    Inputs: question ; Outputs: normalized text.
+    """
+    text = _SPACE_RE.sub(" ", (question or "").casefold()).strip()
+    return _TRAILING_PUNCT_RE.sub("", text)
+
+
+def coalesce_key(question: str, collection_name: str) -> Tuple[str, str, int]:
+    """
+    Single-flight key of a turn: the normalized question, the collection it searches (the only retrieval scope a request has)
+    and that collection's generation, so a question asked after an ingestion never shares the answer computed before it.
+    Inputs: question, collection_name ; Outputs: hashable key.
+    """
+    return normalize_question(question), collection_name, collection_generation(collection_name)
+
+
+def is_coalescable(state: GraphState) -> bool:
+    """
+    A turn can share its answer only when nothing session specific feeds the prompt: no stored summary or messages and a single user message.
+    Inputs: state after load_memory ; Outputs: True when the turn is eligible for coalescing.
+    """
+    if (state.get("memory_summary") or "").strip() or state.get("memory_messages"):
+        return False
+    visible = conversation_history(state.get("messages") or [])
+    return len(visible) == 1 and isinstance(visible[0], HumanMessage) and bool(normalize_question(state.get("question") or ""))
+
+
+async def single_flight(key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+    """
+    Run fn once per key among concurrent callers: the first caller starts it as its own task, later callers with the same key await that task.
+    The task is shielded, so a caller that disconnects does not cancel the work the others are waiting on. Errors propagate to every caller.
+    Inputs: key, fn (coroutine function) ; Outputs: (result, shared) where shared is True for callers that reused another caller's run.
+    """
+    task = _flights.get(key)
+    shared = task is not None and not task.done()
+    if not shared:
+        task = asyncio.ensure_future(fn())
+        _flights[key] = task
+
+        def _forget(done: "asyncio.Task[Any]") -> None:
+            if _flights.get(key) is done:
+                del _flights[key]
+
+        task.add_done_callback(_forget)
+    return await asyncio.shield(task), shared
+
+
+def inflight_count() -> int:
+    return len(_flights)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.rag.llm.models import get_embedding_model
+from src.rag.retrieval.hybrid_retriever import embed_query
+
+logger = get_logger("intent")
+
+Intent = Literal["empty", "smalltalk", "meta", "history", "out_of_scope", "document"]
+
+# Leading pleasantries ("hi, ...", "thanks! ...") are stripped before classifying the rest of the message,
+# so "hi, what was Q3 revenue?" is a document question and a bare "thanks!" is smalltalk.
+_GREETING_PREFIX_RE = re.compile(
+    r"^(?:(?:hi|hello|hey|hiya|howdy|yo|greetings|good (?:morning|afternoon|evening|day)|thanks|thank you|thx|ty|cheers"
+    r"|ok(?:ay)?|cool|great|nice|awesome|perfect|got it)(?: (?:there|again|so much|a lot|very much|all|everyone))?[\s!.,:;-]*)+",
+)
+
+_PATTERNS: Tuple[Tuple[Intent, re.Pattern], ...] = tuple(
+    (intent, re.compile(pattern))
+    for intent, pattern in (
+        ("history", r"\bwhat (?:did|have) (?:i|we|you) (?:just )?(?:ask|asked|say|said|talk(?:ed)? about|discuss(?:ed)?|mention(?:ed)?)\b"),
+        ("history", r"\bwhat (?:was|were) (?:my|your|our) (?:last |previous |first |earlier )?(?:question|answer|message|reply|questions|answers)\b"),
+        ("history", r"\b(?:summari[sz]e|recap) (?:our|this|the) (?:conversation|chat|discussion)\b"),
+        ("history", r"^(?:can you |could you |please )?(?:repeat|rephrase|say) (?:that|it|your (?:last )?(?:answer|response))(?: again)?\b"),
+        ("history", r"\b(?:earlier|before|previously) (?:you|i) (?:said|asked|mentioned)\b"),
+        ("meta", r"\bwhat (?:can|do|could) you (?:do|help (?:me )?with)\b"),
+        ("meta", r"\bhow (?:does|do) (?:this|you|it) (?:work|system work|app work)\b"),
+        ("meta", r"\bhow (?:do|can|should) i (?:use|talk to|query) (?:you|this)\b"),
+        ("meta", r"^(?:who|what) (?:are|made|built|created) you\b"),
+        ("meta", r"\bare you (?:an? )?(?:ai|bot|robot|human|person|chatbot|llm)\b"),
+        ("meta", r"\bwhat (?:is|'s) this (?:app|system|tool|bot|service)\b"),
+        ("meta", r"^(?:help|menu|commands)$"),
+        ("out_of_scope", r"\btell (?:me )?(?:a |another )?joke\b"),
+        ("out_of_scope", r"\b(?:write|compose|make up) (?:me )?(?:a |an |some )?(?:poem|song|haiku|limerick|story|rap|lyrics)\b"),
+        ("out_of_scope", r"\b(?:weather|forecast) (?:in|for|today|tomorrow|this week)\b|\bwhat(?: is|'s) the weather\b"),
+        ("out_of_scope", r"\b(?:write|generate|give me) (?:me )?(?:a |an |some )?(?:python|javascript|java|sql|bash|c\+\+|rust|go)? ?(?:code|script|function|program|regex)\b"),
+        ("out_of_scope", r"\b(?:recipe for|how (?:do i|to) (?:cook|bake))\b"),
+        ("out_of_scope", r"\b(?:nba|nfl|premier league|super bowl|world cup|champions league)\b"),
+        ("smalltalk", r"^(?:how are you|how(?: is|'s) it going|what(?: is|'s) up|how(?: is|'s) your day|nice to meet you|good job|well done|bye|goodbye|see you(?: later)?|lol|haha)\b"),
+    )
+)
+
+# Mentioning the documents overrides meta and out-of-scope patterns ("write a poem" vs "what does the report say about poems").
+_DOCUMENT_CUE_RE = re.compile(
+    r"\b(?:document|documents|documentation|doc|docs|report|reports|pdf|file|files|page|section|paragraph|table|according to|policy|policies|contract|manual|paper)\b"
+)
+
+# Exemplars of each intent for the optional embedding classifier; one centroid per intent.
+_EXEMPLARS: Dict[Intent, Tuple[str, ...]] = {
+    "smalltalk": ("hello there", "thanks a lot", "how are you doing today", "good morning", "have a nice day", "you're great"),
+    "meta": ("what can you do", "how does this assistant work", "who built you", "what kind of questions can I ask", "are you a bot"),
+    "history": ("what did I ask you before", "what was your last answer", "summarize our conversation so far", "repeat what you said earlier"),
+    "out_of_scope": ("tell me a joke", "write a poem about the sea", "what is the weather tomorrow", "who won the football game last night", "give me a recipe for pancakes"),
+    "document": (
+        "what does the report say about revenue",
+        "summarize the section on security incidents",
+        "what is the leave policy for employees",
+        "which risks are listed in the annual filing",
+        "explain the architecture described in the paper",
+        "what were the main findings",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class IntentResult:
+    """
+    Intent of a question and how it was decided: "pattern", "embedding" or "default" (no signal, treated as a document question).
+    """
+    intent: Intent
+    source: str
+    score: Optional[float] = None
+
+
+_centroids: Dict[int, Tuple[List[Intent], np.ndarray]] = {}
+_centroids_lock = threading.Lock()
+
+
+def normalize(question: str) -> str:
+    return re.sub(r"\s+", " ", (question or "").lower()).strip()
+
+
+def match_patterns(question: str) -> Optional[Intent]:
+    """
+    Classify a question with the precompiled pattern tables only (no model, no allocation beyond the normalized string).
+    Inputs: question ; Outputs: "empty", "smalltalk", "meta", "history", "out_of_scope", "document" (document cue present) or None when nothing matched.
+    """
+    text = normalize(question)
+    if not text:
+        return "empty"
+    rest = _GREETING_PREFIX_RE.sub("", text).strip(" ?!.,")
+    if not rest:
+        return "smalltalk"
+    document_cue = _DOCUMENT_CUE_RE.search(rest) is not None
+    for intent, pattern in _PATTERNS:
+        if pattern.search(rest) and not (document_cue and intent in ("meta", "out_of_scope")):
+            return intent
+    return "document" if document_cue else None
+
+
+def _intent_centroids() -> Tuple[List[Intent], np.ndarray]:
+    """
+    Embed the exemplars once per embedding model and average them into one unit-length centroid per intent.
+    Inputs: none ; Outputs: (intent labels, centroid matrix aligned with the labels).
+    """
+    embedder = get_embedding_model()
+    key = id(embedder)
+    with _centroids_lock:
+        cached = _centroids.get(key)
+        if cached is not None:
+            return cached
+        labels: List[Intent] = list(_EXEMPLARS)
+        rows = []
+        for intent in labels:
+            vectors = np.asarray(embedder.embed_documents(list(_EXEMPLARS[intent])), dtype=np.float32)
+            centroid = vectors.mean(axis=0)
+            rows.append(centroid / (np.linalg.norm(centroid) or 1.0))
+        _centroids[key] = (labels, np.vstack(rows))
+        return _centroids[key]
+
+
+def classify_by_embedding(question: str) -> Optional[IntentResult]:
+    """
+    Nearest-centroid classification on the question embedding (shared with retrieval through the query embedding cache).
+    A non-document intent is only returned when it scores INTENT_EMBEDDING_MIN_SCORE and beats the document centroid by INTENT_EMBEDDING_MARGIN.
+    Inputs: question ; Outputs: IntentResult, or None when no intent is confident enough or the embedding fails.
+    """
+    try:
+        labels, centroids = _intent_centroids()
+        vector = np.asarray(embed_query(question), dtype=np.float32)
+    except Exception as exc:
+        logger.warning("intent_embedding_failed", error=str(exc))
+        return None
+    vector = vector / (np.linalg.norm(vector) or 1.0)
+    scores = centroids @ vector
+    best = int(np.argmax(scores))
+    intent, score = labels[best], float(scores[best])
+    document_score = float(scores[labels.index("document")])
+    if intent == "document" or score < settings.INTENT_EMBEDDING_MIN_SCORE or score - document_score < settings.INTENT_EMBEDDING_MARGIN:
+        return None
+    return IntentResult(intent, "embedding", round(score, 4))
+
+
+def classify_intent(question: str) -> IntentResult:
+    """
+    Classify a question for the supervisor: precompiled patterns first, then (with INTENT_EMBEDDING_ENABLED) the embedding centroids,
+    otherwise a document question.
+    Inputs: question ; Outputs: IntentResult.
+    """
+    matched = match_patterns(question)
+    if matched is not None:
+        return IntentResult(matched, "pattern")
+    if settings.INTENT_EMBEDDING_ENABLED:
+        result = classify_by_embedding(question)
+        if result is not None:
+            return result
+    return IntentResult("document", "default")
@@ -1,61 +1,46 @@
 from __future__ import annotations
 
-import json
-import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from langchain_core.documents import Document
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
+from src.app.core.config import settings
 from src.graph.state import GraphState
+from src.graph.trace import trace_event
+from src.rag.citation.local_citer import cite_answer_locally
+from src.rag.llm.context_builder import pack_context
 from src.rag.llm.models import get_citation_llm
 from src.rag.llm.prompts import CITATION_SYSTEM_PROMPT
+from src.rag.llm.structured_output import try_parse_json
 
 _MAX_DOCS_IN_CONTEXT = 10
 _SNIPPET_CHARS = 240
 
-def _build_citation_context(documents: List[Document]) -> str:
-    """
-    Build a compact numbered context block from retrieved documents so the citation LLM can reference evidence by passage index.
-    Inputs: documents retrieved chunks with metadata; Outputs: a formatted string containing up to _MAX_DOCS_IN_CONTEXT numbered passages and key metadata.
-    """
-    lines: List[str] = []
-    for i, d in enumerate(documents[:_MAX_DOCS_IN_CONTEXT]):
-        meta = d.metadata or {}
-        src = meta.get("source", "unknown")
-        src_name = meta.get("source_name", Path(src).name if src != "unknown" else "unknown")
-        page = meta.get("page", meta.get("section", ""))
-
-        lines.append(
-            f"[{i}] doc_id={meta.get('doc_id', meta.get('id', ''))} "
-            f"source={src} source_name={src_name} page={page}\n"
-            f"{(d.page_content or '')[:800]}"
-        )
-    return "\n\n".join(lines)
-
-
-def _extract_json(text: str) -> str:
-    """
-    Normalize an LLM response into raw JSON by stripping optional triple backtick code fences etc...
-    Inputs: model output that may include ``` fences; Outputs: a string expected to be valid JSON.
-    """
-    s = (text or "").strip()
-    if s.startswith("```"):
-        s = re.sub(r"^```[a-zA-Z]*\n", "", s)
-        s = re.sub(r"\n```$", "", s).strip()
-    return s
+def _citation_passage_header(i: int, d: Document) -> str:
+    meta = d.metadata or {}
+    src = meta.get("source", "unknown")
+    src_name = meta.get("source_name", Path(src).name if src != "unknown" else "unknown")
+    page = meta.get("page", meta.get("section", ""))
+    return f"[{i}] doc_id={meta.get('doc_id', meta.get('id', ''))} source={src} source_name={src_name} page={page}"
 
 
-def _try_parse_json(resp_text: str) -> Optional[Dict[str, Any]]:
+def _build_citation_context(answer: str, documents: List[Document]) -> str:
     """
-    Try to parse a model response as JSON, returning None if parsing fails to enable retry/refusal behavior upstream.
-    Inputs: raw model output; Outputs: a parsed dict on success, otherwise None.
+    Build a compact numbered context block from retrieved documents so the citation LLM can reference evidence by passage index.
+    Passages are packed in rank order into CITATION_CONTEXT_MAX_TOKENS alongside the system prompt and the draft answer.
+    Inputs: draft answer and retrieved chunks with metadata; Outputs: a formatted string containing up to _MAX_DOCS_IN_CONTEXT numbered passages and key metadata.
     """
-    try:
-        return json.loads(_extract_json(resp_text))
-    except Exception:
-        return None
+    packed = pack_context(
+        fixed_text=[CITATION_SYSTEM_PROMPT, answer],
+        documents=documents,
+        max_tokens=settings.CITATION_CONTEXT_MAX_TOKENS,
+        max_passages=_MAX_DOCS_IN_CONTEXT,
+        min_passage_tokens=settings.CONTEXT_MIN_PASSAGE_TOKENS,
+        passage_header=_citation_passage_header,
+    )
+    return packed.context_block
 
 
 def _coerce_int(value: Any) -> Optional[int]:
@@ -78,6 +63,7 @@ def _normalize_and_enrich_citations(
 ) -> List[Dict[str, Any]]:
     """
     Validate citations returned by the model and enrich them with canonical metadata and a text snippet for the UI.
+    A passage that stands for near-duplicate copies (folded at ingest or collapsed at retrieval) also lists them under 'duplicates'.
     Inputs: model-provided citation list and documents used as evidence; Outputs: a list of normalised citation dicts.
     """
     if not isinstance(citations, list):
@@ -107,27 +93,62 @@ def _normalize_and_enrich_citations(
         page = meta.get("page", meta.get("section", ""))
         doc_id = meta.get("doc_id", meta.get("id", ""))
 
-        out.append(
-            {
-                "index": idx,
-                "doc_id": doc_id,
-                "source": source,
-                "source_name": source_name,
-                "page": page,
-                "snippet": (d.page_content or "")[:_SNIPPET_CHARS],
-            }
-        )
+        citation = {
+            "index": idx,
+            "doc_id": doc_id,
+            "source": source,
+            "source_name": source_name,
+            "page": page,
+            "snippet": (d.page_content or "")[:_SNIPPET_CHARS],
+        }
+        duplicates = [
+            {"source": r.get("source"), "source_name": r.get("source_name"), "page": r.get("page")}
+            for r in meta.get("duplicates") or []
+            if isinstance(r, dict)
+        ]
+        if duplicates:
+            citation["duplicates"] = duplicates
+        out.append(citation)
 
     return out
 
 
+def _try_local_citations(answer: str, documents: List[Document]) -> Optional[dict]:
+    """
+    Run the deterministic sentence matcher and accept its output only when enough of the answer's claims are supported, so the citation LLM call can be skipped.
+    Inputs: draft answer and retrieved documents; Outputs: a partial state update dict on success, otherwise None to fall back to the LLM.
+    """
+    result = cite_answer_locally(
+        answer,
+        documents,
+        max_docs=_MAX_DOCS_IN_CONTEXT,
+        min_sentence_score=settings.CITATION_LOCAL_MIN_SENTENCE_SCORE,
+    )
+    if result.confidence < settings.CITATION_LOCAL_MIN_CONFIDENCE:
+        return None
+
+    citations_struct = _normalize_and_enrich_citations(result.citations, documents)
+    if not citations_struct:
+        return None
+
+    event = trace_event(
+        "citation_agent",
+        f"CitationAgent attached local citations (confidence={result.confidence:.2f}).",
+        confidence=result.confidence,
+    )
+    return {
+        "answer": result.answer_with_citations,
+        "citations": citations_struct,
+        "trace": [event],
+    }
+
+
 def citation_node(state: GraphState) -> dict:
     """
     Post process the draft answer by adding inline numeric citation markers and emitting structured citations, refusing when evidence is missing or citations are invalid.
-    Inputs: state ; Outputs: a partial state update dict with 'answer', 'citations', and an internal trace message.
+    Citations produced by the fused reasoning mode are validated first, then the local sentence matcher runs when CITATION_MODE is "local"; the citation LLM is only called when neither is usable.
+    Inputs: state ; Outputs: a partial state update dict with 'answer', 'citations', and an internal trace event.
     """
-    llm = get_citation_llm()
-
     answer = (state.get("answer") or "").strip()
     documents: List[Document] = state.get("documents", [])
 
@@ -136,13 +157,27 @@ def citation_node(state: GraphState) -> dict:
 
     if not documents:
         refused = "I don't know based on the available documents."
-        msg = AIMessage(
-            content="CitationAgent: no documents available; refusing.",
-            name="citation_agent",
-        )
-        return {"answer": refused, "citations": [], "messages": [msg]}
+        event = trace_event("citation_agent", "CitationAgent: no documents available; refusing.")
+        return {"answer": refused, "citations": [], "trace": [event]}
+
+    fused = state.get("fused_citations")
+    if fused:
+        citations_struct = _normalize_and_enrich_citations(fused.get("citations"), documents)
+        if citations_struct:
+            event = trace_event("citation_agent", "CitationAgent validated fused citations.")
+            return {
+                "answer": fused.get("answer_with_citations") or answer,
+                "citations": citations_struct,
+                "trace": [event],
+            }
 
-    context_block = _build_citation_context(documents)
+    if (settings.CITATION_MODE or "local").lower() == "local":
+        local_update = _try_local_citations(answer, documents)
+        if local_update is not None:
+            return local_update
+
+    llm = get_citation_llm()
+    context_block = _build_citation_context(answer, documents)
 
     prompt_messages = [
         SystemMessage(content=CITATION_SYSTEM_PROMPT),
@@ -160,7 +195,7 @@ def citation_node(state: GraphState) -> dict:
     parsed: Optional[Dict[str, Any]] = None
     for _ in range(2):
         resp = llm.invoke(prompt_messages)
-        parsed = _try_parse_json(resp.content)
+        parsed = try_parse_json(resp.content)
         if parsed is not None:
             break
         prompt_messages.append(
@@ -174,26 +209,20 @@ def citation_node(state: GraphState) -> dict:
 
     if parsed is None:
         refused = "I can't provide a properly cited answer with the current evidence."
-        msg = AIMessage(
-            content="CitationAgent: invalid JSON after retry; refusing.",
-            name="citation_agent",
-        )
-        return {"answer": refused, "citations": [], "messages": [msg]}
+        event = trace_event("citation_agent", "CitationAgent: invalid JSON after retry; refusing.")
+        return {"answer": refused, "citations": [], "trace": [event]}
 
     answer_with_citations = (parsed.get("answer_with_citations") or "").strip() or answer
     citations_struct = _normalize_and_enrich_citations(parsed.get("citations"), documents)
 
     if not citations_struct:
         refused = "I can't provide a properly cited answer with the current evidence."
-        msg = AIMessage(
-            content="CitationAgent: empty/invalid citations; refusing.",
-            name="citation_agent",
-        )
-        return {"answer": refused, "citations": [], "messages": [msg]}
+        event = trace_event("citation_agent", "CitationAgent: empty/invalid citations; refusing.")
+        return {"answer": refused, "citations": [], "trace": [event]}
 
-    msg = AIMessage(content="CitationAgent attached validated citations.", name="citation_agent")
+    event = trace_event("citation_agent", "CitationAgent attached validated citations.")
     return {
         "answer": answer_with_citations,
         "citations": citations_struct,
-        "messages": [msg],
+        "trace": [event],
     }
@@ -2,22 +2,41 @@ from __future__ import annotations
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from src.app.core.config import settings
 from src.graph.state import GraphState
+from src.graph.trace import conversation_history
+from src.rag.llm.context_builder import pack_context
 from src.rag.llm.models import get_reasoning_llm
 from src.rag.llm.prompts import DIRECT_SYSTEM_PROMPT
 
 def direct_answer_node(state: GraphState) -> dict:
     """
-    Answer "small talk" questions directly using the LLM without performing document retrieval, and explicitly return no citations.
+    Answer smalltalk, meta and conversation-history questions directly using the LLM without performing document retrieval, and explicitly return no citations.
+    The memory summary and recent user visible turns are packed into CONTEXT_HISTORY_MAX_TOKENS so questions about the conversation can be answered.
     Inputs: state ; Outputs: a partial state update dict with 'answer', an assistant message, and 'citations' set to an empty list.
     """
     llm = get_reasoning_llm()
     question = (state.get("question") or "").strip()
 
-    prompt_messages = [
-        SystemMessage(content=DIRECT_SYSTEM_PROMPT),
-        HumanMessage(content=question),
-    ]
+    history = conversation_history(state.get("messages") or [])
+    if history and isinstance(history[-1], HumanMessage) and (history[-1].content or "").strip() == question:
+        history = history[:-1]
+    packed = pack_context(
+        fixed_text=[DIRECT_SYSTEM_PROMPT, question],
+        documents=[],
+        history=history,
+        max_tokens=settings.CONTEXT_MAX_TOKENS,
+        history_max_tokens=settings.CONTEXT_HISTORY_MAX_TOKENS,
+        summary_max_tokens=settings.CONTEXT_SUMMARY_MAX_TOKENS,
+        max_passages=0,
+        min_passage_tokens=settings.CONTEXT_MIN_PASSAGE_TOKENS,
+    )
+
+    prompt_messages = [SystemMessage(content=DIRECT_SYSTEM_PROMPT)]
+    if packed.summary is not None:
+        prompt_messages.append(packed.summary)
+    prompt_messages.extend(packed.history)
+    prompt_messages.append(HumanMessage(content=question))
 
     resp = llm.invoke(prompt_messages)
     answer = (resp.content or "").strip()
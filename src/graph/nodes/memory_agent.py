@@ -1,52 +1,19 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Tuple
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
 
 from src.app.core.config import settings
+from src.app.core.logging import get_logger
 from src.graph.state import GraphState
-from src.rag.memory.redis_memory import (
-    load_memory_bundle_from_redis,
-    save_memory_bundle_to_redis,
-)
+from src.graph.trace import is_user_visible_message
+from src.rag.memory.async_redis_memory import get_async_memory_store
+from src.rag.memory.redis_memory import MemoryBundle, _summary_line, _truncate, get_memory_store
 
-INTERNAL_AGENT_NAMES = {
-    "supervisor",
-    "query_planner",
-    "retrieval_agent",
-    "reasoning_agent",
-    "citation_agent",
-    "memory_agent",
-}
+logger = get_logger("memory")
 
-
-def _is_user_visible_message(m: BaseMessage) -> bool:
-    """
-    Decide whether a message should be persisted to Redis by filtering out internal agent trace AI messages.
-    Inputs: BaseMessage from the graph message history; Outputs: True if the message is user visible and should be stored, otherwise False.
-    """
-    if isinstance(m, SystemMessage):
-        return True
-
-    if isinstance(m, HumanMessage):
-        return True
-
-    if isinstance(m, AIMessage):
-        if getattr(m, "name", None) in INTERNAL_AGENT_NAMES:
-            return False
-        return True
-
-    return False
-
-
-def _truncate(s: str, max_chars: int) -> str:
-    """
-    Truncate a string to a maximum character length for safe storage in Redis summaries and debug friendly logs.
-    Inputs: s (str) raw text and max_chars (int); Outputs: a stripped string truncated to max_chars.
-    """
-    s = (s or "").strip()
-    return s if len(s) <= max_chars else s[: max_chars - 3] + "..."
+_MEMORY_ID_PREFIX = "memory:"
 
 
 def _update_summary(existing_summary: str, overflow: List[BaseMessage]) -> str:
@@ -57,75 +24,190 @@ def _update_summary(existing_summary: str, overflow: List[BaseMessage]) -> str:
     if not overflow:
         return existing_summary
 
-    lines: List[str] = []
-    for m in overflow:
-        if isinstance(m, HumanMessage):
-            lines.append(f"- User: {_truncate(m.content, 200)}")
-        elif isinstance(m, AIMessage):
-            lines.append(f"- Assistant: {_truncate(m.content, 200)}")
+    lines = [line for line in (_summary_line(m) for m in overflow) if line]
 
     delta = "\n".join(lines).strip()
     combined = (existing_summary.strip() + "\n" + delta).strip() if existing_summary else delta
     return _truncate(combined, settings.MEMORY_SUMMARY_MAX_CHARS)
 
 
-def load_memory_node(state: GraphState) -> GraphState:
+def _is_injected_memory(m: BaseMessage) -> bool:
     """
-    Load a session's summary and recent message window from Redis and prepend them to the current request messages.
-    Inputs: state ; Outputs: a partial state update dict that replaces/prepends 'messages' with injected memory context.
+    Tell whether a message was injected from Redis by load_memory_node, as opposed to sent in this turn.
+    Inputs: m ; Outputs: True for injected summary/recent messages.
     """
-    session_id = state.get("session_id")
-    existing = state.get("messages") or []
+    return (getattr(m, "id", None) or "").startswith(_MEMORY_ID_PREFIX)
 
-    if not session_id:
-        return {"messages": existing}
 
-    summary, recent = load_memory_bundle_from_redis(session_id)
+def _inject_memory(state: GraphState, bundle: MemoryBundle) -> dict:
+    """
+    Build the load_memory state update: summary + recent window prepended to this turn's messages, and the raw bundle kept for the save step.
+    A failed load leaves 'memory_summary'/'memory_messages' unset, so the save step reads Redis again instead of trusting an empty bundle.
+    Inputs: state, bundle ; Outputs: a partial state update dict.
+    """
+    existing = state.get("messages") or []
+    if not bundle.loaded:
+        return {"messages": existing}
+    summary, recent = bundle.summary, bundle.messages
 
     summary_msg: List[BaseMessage] = []
     if summary.strip():
         summary_msg = [
-            SystemMessage(content=f"Conversation summary (for context):\n{summary}")
+            SystemMessage(
+                content=f"Conversation summary (for context):\n{summary}",
+                id=f"{_MEMORY_ID_PREFIX}summary",
+            )
         ]
 
+    update = {"memory_summary": summary, "memory_messages": recent}
+
     if len(existing) > 1:
-        return {"messages": summary_msg + existing}
+        return {**update, "messages": summary_msg + existing}
 
-    return {"messages": summary_msg + recent + existing}
+    injected = [
+        m.model_copy(update={"id": f"{_MEMORY_ID_PREFIX}{i}"})
+        for i, m in enumerate(recent)
+    ]
+    return {**update, "messages": summary_msg + injected + existing}
 
 
-def save_memory_node(state: GraphState) -> dict:
+def _turn_messages_to_persist(state: GraphState) -> List[BaseMessage]:
     """
-    Persist a bounded window of user visible messages plus a rolling summary to Redis for multi turn continuity. 
-    Inputs: state ; Outputs: a partial state update dict. 
+    Select this turn's user visible messages (excluding memory injected at load time) and make the final answer the last assistant message.
+    Inputs: state ; Outputs: list of messages to add to the session memory.
     """
-    session_id = state.get("session_id")
     messages: List[BaseMessage] = state.get("messages", [])
     final_answer = (state.get("answer") or "").strip()
 
-    if not session_id:
-        return {"messages": messages}
-
-    visible = [m for m in messages if _is_user_visible_message(m)]
+    visible = [m for m in messages if is_user_visible_message(m) and not _is_injected_memory(m)]
 
     if final_answer:
         while visible and isinstance(visible[-1], AIMessage):
             visible.pop()
         visible.append(AIMessage(content=final_answer))
+    return visible
 
-    existing_summary, existing_recent = load_memory_bundle_from_redis(session_id)
 
+def _merge_window(existing_summary: str, existing_recent: List[BaseMessage], visible: List[BaseMessage]) -> Tuple[str, List[BaseMessage]]:
+    """
+    Append this turn's messages to the stored window and fold the overflow into the rolling summary.
+    Inputs: existing_summary, existing_recent, visible ; Outputs: (new_summary, bounded message window).
+    """
     merged = (existing_recent + visible) if existing_recent else visible
 
     max_n = settings.MEMORY_MAX_MESSAGES
     if len(merged) > max_n:
         overflow = merged[: len(merged) - max_n]
-        merged = merged[-max_n:]
-        new_summary = _update_summary(existing_summary, overflow)
-    else:
-        new_summary = existing_summary
+        return _update_summary(existing_summary, overflow), merged[-max_n:]
+    return existing_summary, merged
+
+
+def load_memory_node(state: GraphState) -> GraphState:
+    """
+    Load a session's summary and recent message window from Redis (one pipelined round-trip) and prepend them to the current request messages.
+    The loaded bundle is also kept in state so save_memory_node does not read Redis again.
+    Inputs: state ; Outputs: a partial state update dict that replaces/prepends 'messages' with injected memory context and carries 'memory_summary'/'memory_messages'.
+    """
+    session_id = state.get("session_id")
+    if not session_id:
+        return {"messages": state.get("messages") or []}
+
+    return _inject_memory(state, get_memory_store().load(session_id))
+
+
+async def aload_memory_node(state: GraphState) -> GraphState:
+    """
+    asyncio variant of load_memory_node backed by AsyncRedisMemoryStore (pool, per-call timeout, circuit breaker).
+    Inputs: state ; Outputs: same partial state update as load_memory_node.
+    """
+    session_id = state.get("session_id")
+    if not session_id:
+        return {"messages": state.get("messages") or []}
+
+    return _inject_memory(state, await get_async_memory_store().load(session_id))
+
+
+def save_memory_node(state: GraphState) -> dict:
+    """
+    Persist a bounded window of user visible messages plus a rolling summary to Redis for multi turn continuity, in one atomic write.
+    The existing bundle comes from state (loaded earlier in the turn); Redis is only read again if it is missing, and nothing is
+    written when that read fails too, so an unreadable session is never replaced by this turn alone.
+    With the append-only list layout only this turn's messages are sent and Redis trims and summarises the overflow itself.
+    Inputs: state ; Outputs: a partial state update dict. 
+    """
+    session_id = state.get("session_id")
+    messages: List[BaseMessage] = state.get("messages", [])
+
+    if not session_id:
+        return {"messages": messages}
+
+    store = get_memory_store()
+    visible = _turn_messages_to_persist(state)
+
+    if store.append_only:
+        store.append(
+            session_id,
+            messages=visible,
+            summary_lines=[_summary_line(m) for m in visible],
+            ttl_seconds=settings.REDIS_TTL_SECONDS,
+        )
+        return {"messages": messages}
+
+    existing_summary = state.get("memory_summary")
+    existing_recent = state.get("memory_messages")
+    if existing_summary is None or existing_recent is None:
+        bundle = store.load(session_id)
+        if not bundle.loaded:
+            logger.warning("memory_save_skipped", session_id=session_id, reason="load_failed")
+            return {"messages": messages}
+        existing_summary, existing_recent = bundle.summary, bundle.messages
+
+    new_summary, merged = _merge_window(existing_summary, existing_recent, visible)
+    store.save(
+        session_id,
+        summary=new_summary,
+        messages=merged,
+        ttl_seconds=settings.REDIS_TTL_SECONDS,
+    )
+
+    return {"messages": messages}
+
+
+async def asave_memory_node(state: GraphState) -> dict:
+    """
+    asyncio variant of save_memory_node backed by AsyncRedisMemoryStore; skipped quickly while the Redis circuit is open, and
+    skipped when the session could not be read (timeout, error, open circuit) rather than saving this turn over it.
+    Inputs: state ; Outputs: a partial state update dict.
+    """
+    session_id = state.get("session_id")
+    messages: List[BaseMessage] = state.get("messages", [])
+
+    if not session_id:
+        return {"messages": messages}
+
+    store = get_async_memory_store()
+    visible = _turn_messages_to_persist(state)
+
+    if store.append_only:
+        await store.append(
+            session_id,
+            messages=visible,
+            summary_lines=[_summary_line(m) for m in visible],
+            ttl_seconds=settings.REDIS_TTL_SECONDS,
+        )
+        return {"messages": messages}
 
-    save_memory_bundle_to_redis(
+    existing_summary = state.get("memory_summary")
+    existing_recent = state.get("memory_messages")
+    if existing_summary is None or existing_recent is None:
+        bundle = await store.load(session_id)
+        if not bundle.loaded:
+            logger.warning("memory_save_skipped", session_id=session_id, reason="load_failed")
+            return {"messages": messages}
+        existing_summary, existing_recent = bundle.summary, bundle.messages
+
+    new_summary, merged = _merge_window(existing_summary, existing_recent, visible)
+    await store.save(
         session_id,
         summary=new_summary,
         messages=merged,
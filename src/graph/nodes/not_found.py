@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage
+
+from src.graph.state import GraphState
+from src.graph.trace import trace_event
+
+NOT_FOUND_ANSWER = "I couldn't find anything relevant to your question in the ingested documents."
+
+
+def not_found_node(state: GraphState) -> dict:
+    """
+    Answer immediately when the retrieval quality gate found nothing relevant, skipping the reasoning and citation LLM calls.
+    Inputs: state ; Outputs: a partial state update dict with a fixed 'answer', an assistant message, empty 'citations' and a trace event.
+    """
+    return {
+        "answer": NOT_FOUND_ANSWER,
+        "messages": [AIMessage(content=NOT_FOUND_ANSWER, name="not_found")],
+        "citations": [],
+        "trace": [trace_event("not_found", "No relevant documents; answered without reasoning.", documents=len(state.get("documents") or []))],
+    }
@@ -2,27 +2,34 @@ from __future__ import annotations
 
 from typing import List
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 
+from src.app.core.concurrency import submit
+from src.app.core.config import settings
+from src.app.core.metrics import record_cache
+from src.graph.speculation import claim_speculative_retrieval
 from src.graph.state import GraphState
+from src.graph.trace import conversation_history, trace_event
 from src.rag.llm.models import get_planner_llm
 from src.rag.llm.prompts import QUERY_PLANNER_SYSTEM_PROMPT
+from src.rag.retrieval.hybrid_retriever import get_hybrid_retriever
+from src.rag.retrieval.query_planning import is_simple_query, parse_sub_queries, rule_based_plan, rule_based_query
 
 
-def query_planner_node(state: GraphState) -> dict:
+def _llm_plan(state: GraphState) -> str:
     """
-    Produce a short retrieval plan from the current question and recent chat context to improve downstream retrieval.
-    Inputs: state ; Outputs: a partial state update dict with 'plan' text and a planner message trace.
+    Ask the planner LLM for a short retrieval plan from the current question and the last user visible chat turns.
+    Inputs: state ; Outputs: plan text.
     """
     llm = get_planner_llm()
 
     original_question = state.get("question", "")
-    history: List = state.get("messages", [])
+    history: List = conversation_history(state.get("messages", []))
 
     prompt_messages = [
         HumanMessage(content=QUERY_PLANNER_SYSTEM_PROMPT, name="system"),
     ]
-    prompt_messages.extend(history[-4:]) 
+    prompt_messages.extend(history[-4:])
 
     retry_count = int(state.get("retry_count", 0) or 0)
     if retry_count > 0:
@@ -45,16 +52,70 @@ def query_planner_node(state: GraphState) -> dict:
     )
 
     planner_response = llm.invoke(prompt_messages)
+    return planner_response.content
 
-    plan_text = planner_response.content
 
-    planner_message = AIMessage(
-        content=plan_text,
-        name="query_planner",
-    )
+def _resolve_strategy(state: GraphState) -> str:
+    """
+    Map QUERY_PLANNER_STRATEGY to the strategy used for this attempt; retries always use the LLM planner to get a real rewrite.
+    Inputs: state ; Outputs: "rule", "concurrent" or "llm".
+    """
+    strategy = (settings.QUERY_PLANNER_STRATEGY or "llm").lower()
+    if int(state.get("retry_count", 0) or 0) > 0:
+        return "llm"
+    if strategy == "auto":
+        simple = is_simple_query(
+            state.get("question", ""),
+            max_content_tokens=settings.QUERY_PLANNER_SIMPLE_MAX_TOKENS,
+        )
+        return "rule" if simple else "llm"
+    if strategy in ("rule", "concurrent"):
+        return strategy
+    return "llm"
+
+
+def query_planner_node(state: GraphState) -> dict:
+    """
+    Produce a short retrieval plan from the current question and recent chat context to improve downstream retrieval.
+    Depending on QUERY_PLANNER_STRATEGY the plan comes from local rules (no LLM call), from the LLM while retrieval on the raw question runs concurrently, or from the LLM alone.
+    In the concurrent mode the sub-questions of the LLM plan are then searched and fused with the raw-question results, so the plan still shapes retrieval.
+    Inputs: state ; Outputs: a partial state update dict with 'plan' text, 'retrieval_query', optional 'prefetched_documents' and a planner trace event.
+    """
+    strategy = _resolve_strategy(state)
+    question = state.get("question", "")
+
+    if strategy == "rule":
+        plan_text = rule_based_plan(question)
+        return {
+            "plan": plan_text,
+            "retrieval_query": rule_based_query(question),
+            "trace": [trace_event("query_planner", plan_text, strategy=strategy)],
+        }
+
+    if strategy == "concurrent":
+        speculation_id = state.get("speculation_id")
+        prefetch = None if speculation_id else submit(get_hybrid_retriever().retrieve, question)
+        plan_text = _llm_plan(state)
+        docs = claim_speculative_retrieval(speculation_id) if speculation_id else prefetch.result()
+        if speculation_id:
+            record_cache("speculative_retrieval", hit=docs is not None)
+        if docs is None:
+            docs = get_hybrid_retriever().retrieve(question)
+        sub_queries = parse_sub_queries(plan_text or "", settings.RETRIEVAL_MAX_SUBQUERIES)
+        if sub_queries:
+            docs = get_hybrid_retriever().retrieve_many(sub_queries, prefetched=docs)
+        return {
+            "plan": plan_text,
+            "retrieval_query": question,
+            "prefetched_documents": docs,
+            "speculation_id": None,
+            "trace": [trace_event("query_planner", plan_text, strategy=strategy, sub_queries=len(sub_queries))],
+        }
+
+    plan_text = _llm_plan(state)
 
     return {
         "plan": plan_text,
-        "messages": [planner_message],
+        "retrieval_query": None,
+        "trace": [trace_event("query_planner", plan_text, strategy=strategy)],
     }
-
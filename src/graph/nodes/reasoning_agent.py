@@ -1,68 +1,148 @@
 from __future__ import annotations
 
-from typing import List
+import json
+import re
+from typing import List, Optional, Tuple
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 from langchain_core.documents import Document
 
+from src.app.core.config import settings
 from src.graph.state import GraphState
+from src.graph.trace import conversation_history, trace_event
+from src.rag.llm.context_builder import PackedContext, pack_context
 from src.rag.llm.models import get_reasoning_llm
-from src.rag.llm.prompts import REASONING_SYSTEM_PROMPT
+from src.rag.llm.prompts import FUSED_REASONING_SYSTEM_PROMPT, REASONING_SYSTEM_PROMPT
+from src.rag.llm.structured_output import try_parse_json
 
+_CITATION_MARKER_RE = re.compile(r"\s*\[\d+\]")
+# Value of "answer_with_citations" in JSON that may be cut off (no closing quote) or followed by malformed citations
+_PARTIAL_ANSWER_RE = re.compile(r'"answer_with_citations"\s*:\s*"((?:[^"\\]|\\.)*)')
 
-def _format_docs_for_prompt(documents: List[Document]) -> str:
+_USER_PROMPT_TEMPLATE = (
+    "Using ONLY the context below, answer the user question.\n\n"
+    "Context:\n{context}\n\n"
+    "Question: {question}"
+)
+
+
+def _pack_prompt_context(system_prompt: str, question: str, documents: List[Document], history: List) -> PackedContext:
     """
-    Convert a list of retrieved Document objects into a compact numbered context block for prompting the reasoning LLM.
-    Inputs: documents retrieved chunks with metadata; Outputs: a single formatted string capped to a small number of docs an=d characters per doc.
+    Fit the memory summary, recent history and retrieved passages into the reasoning prompt token budget (CONTEXT_* settings).
+    Inputs: system prompt, question, retrieved documents and message history; Outputs: PackedContext with the history to send and the numbered context block.
     """
-    lines: List[str] = []
-    for i, d in enumerate(documents[:10]): 
-        meta = d.metadata or {}
-        src = meta.get("source", "unknown")
-        page = meta.get("page", meta.get("section", ""))
-        lines.append(
-            f"[{i}] source={src} page={page}\n{d.page_content[:1000]}"
-        )
-    return "\n\n".join(lines)
+    return pack_context(
+        fixed_text=[system_prompt, _USER_PROMPT_TEMPLATE.format(context="", question=question)],
+        documents=documents,
+        history=history,
+        max_tokens=settings.CONTEXT_MAX_TOKENS,
+        history_max_tokens=settings.CONTEXT_HISTORY_MAX_TOKENS,
+        summary_max_tokens=settings.CONTEXT_SUMMARY_MAX_TOKENS,
+        max_passages=settings.CONTEXT_MAX_PASSAGES,
+        min_passage_tokens=settings.CONTEXT_MIN_PASSAGE_TOKENS,
+    )
 
 
-def reasoning_node(state: GraphState) -> dict:
+def _parse_fused_output(text: str) -> Optional[dict]:
     """
-    Generate a draft answer to the current question using only the retrieved document context and a short window of recent chat history.
-    Inputs: state ; Outputs: a partial state update dict with 'answer' and an assistant message trace.
+    Parse the fused reasoning output into the citation payload expected by the citation node.
+    Inputs: raw model output; Outputs: {"answer_with_citations", "citations"} dict, or None when the output is not usable JSON.
     """
-    llm = get_reasoning_llm()
+    parsed = try_parse_json(text)
+    if parsed is None:
+        return None
+    answer_with_citations = parsed.get("answer_with_citations")
+    if not isinstance(answer_with_citations, str) or not answer_with_citations.strip():
+        return None
+    return {
+        "answer_with_citations": answer_with_citations.strip(),
+        "citations": parsed.get("citations"),
+    }
 
-    question = state.get("question", "")
-    documents: List[Document] = state.get("documents", [])
-    history: List = state.get("messages", [])
 
-    context_block = _format_docs_for_prompt(documents)
+def _extract_partial_answer(text: str) -> Optional[str]:
+    """
+    Leniently recover the answer from fused output that is not valid JSON (truncated, or broken after the answer field).
+    Inputs: raw model output; Outputs: the answer_with_citations text, or None when the field cannot be found.
+    """
+    match = _PARTIAL_ANSWER_RE.search(text or "")
+    if match is None:
+        return None
+    raw = re.sub(r"\\u?[0-9a-fA-F]{0,3}$|\\$", "", match.group(1))
+    try:
+        answer = json.loads(f'"{raw}"')
+    except ValueError:
+        answer = raw
+    return re.sub(r"\s*\[\d*$", "", answer).strip() or None
+
 
-    prompt_messages = [
-        HumanMessage(content=REASONING_SYSTEM_PROMPT, name="system"),
-    ]
-    prompt_messages.extend(history[-4:])
+def _prompt_messages(system_prompt: str, question: str, documents: List[Document], history: List) -> Tuple[List, PackedContext]:
+    """
+    Build the reasoning prompt for a system prompt: packed summary and history, then the numbered context and the question.
+    Inputs: system prompt, question, documents, history; Outputs: (prompt messages, PackedContext).
+    """
+    packed = _pack_prompt_context(system_prompt, question, documents, history)
+    prompt_messages = [HumanMessage(content=system_prompt, name="system")]
+    if packed.summary is not None:
+        prompt_messages.append(packed.summary)
+    prompt_messages.extend(packed.history)
     prompt_messages.append(
         HumanMessage(
-            content=(
-                "Using ONLY the context below, answer the user question.\n\n"
-                f"Context:\n{context_block}\n\n"
-                f"Question: {question}"
-            ),
+            content=_USER_PROMPT_TEMPLATE.format(context=packed.context_block, question=question),
             name="user",
         )
     )
+    return prompt_messages, packed
+
+
+def reasoning_node(state: GraphState) -> dict:
+    """
+    Generate a draft answer to the current question using only the retrieved document context and recent chat history, packed into the CONTEXT_MAX_TOKENS prompt budget.
+    With REASONING_FUSED_CITATIONS the same call also returns citations as JSON, so the citation node only has to validate them. When that JSON
+    is unusable the answer field is recovered leniently (citations then come from the normal citation pass), and failing that the plain
+    reasoning prompt is run again, so raw JSON never becomes the answer.
+    Inputs: state ; Outputs: a partial state update dict with 'answer', 'fused_citations' and a trace event with the prompt budget usage.
+    """
+    llm = get_reasoning_llm()
+    fused = bool(settings.REASONING_FUSED_CITATIONS)
+
+    question = state.get("question", "")
+    documents: List[Document] = state.get("documents", [])
+    history: List = conversation_history(state.get("messages", []))
+
+    fused_citations = None
+    answer_text = None
+    fused_fallback = None
+    if fused:
+        prompt_messages, packed = _prompt_messages(FUSED_REASONING_SYSTEM_PROMPT, question, documents, history)
+        resp = llm.invoke(prompt_messages, json_mode=True)
+        fused_citations = _parse_fused_output(resp.content)
+        if fused_citations is not None:
+            answer_text = _CITATION_MARKER_RE.sub("", fused_citations["answer_with_citations"])
+        else:
+            partial = _extract_partial_answer(resp.content)
+            if partial is not None:
+                answer_text = _CITATION_MARKER_RE.sub("", partial)
+                fused_fallback = "partial_json"
+            else:
+                fused_fallback = "plain_rerun"
 
-    resp = llm.invoke(prompt_messages)
-    answer_text = resp.content
+    if answer_text is None:
+        prompt_messages, packed = _prompt_messages(REASONING_SYSTEM_PROMPT, question, documents, history)
+        resp = llm.invoke(prompt_messages)
+        answer_text = resp.content
 
-    assistant_msg = AIMessage(
-        content=answer_text,
-        name="reasoning_agent",
+    event = trace_event(
+        "reasoning_agent",
+        "Drafted answer.",
+        prompt_tokens=packed.tokens_used,
+        passages=len(packed.documents),
+        dropped_passages=packed.dropped_documents,
+        **({"fused_fallback": fused_fallback} if fused_fallback else {}),
     )
 
     return {
         "answer": answer_text,
-        "messages": [assistant_msg],
+        "fused_citations": fused_citations,
+        "trace": [event],
     }
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage
+
+from src.graph.state import GraphState
+from src.graph.trace import trace_event
+
+REFUSAL_ANSWER = (
+    "I can only help with questions about the documents you ingested or about this assistant. "
+    "Please ask a question about your documents."
+)
+
+
+def refuse_node(state: GraphState) -> dict:
+    """
+    Decline requests the supervisor classified as out of scope (jokes, poems, weather, code generation...) without any LLM call.
+    Inputs: state ; Outputs: a partial state update dict with the refusal 'answer', an assistant message, empty 'citations' and a trace event
+    naming the intent that was refused.
+    """
+    intent = state.get("intent") or {}
+    return {
+        "answer": REFUSAL_ANSWER,
+        "messages": [AIMessage(content=REFUSAL_ANSWER, name="refuse")],
+        "citations": [],
+        "trace": [
+            trace_event(
+                "refuse",
+                f"Refused out-of-scope request (intent={intent.get('intent', 'unknown')}); answered without retrieval.",
+                intent=intent.get("intent"),
+                source=intent.get("source"),
+            )
+        ],
+    }
@@ -3,45 +3,93 @@ from __future__ import annotations
 from typing import List
 
 from langchain_core.documents import Document
-from langchain_core.messages import AIMessage
 
+from src.app.core.config import settings
+from src.app.core.metrics import record_cache
+from src.graph.speculation import cancel_speculative_retrieval, claim_speculative_retrieval
 from src.graph.state import GraphState
-from src.rag.retrieval.hybrid_retriever import HybridRetriever
+from src.graph.trace import trace_event
+from src.rag.retrieval.hybrid_retriever import _doc_key, get_hybrid_retriever
+from src.rag.retrieval.query_planning import parse_sub_queries
 
-_retriever: HybridRetriever | None = None
 
-
-def _get_retriever() -> HybridRetriever:
+def _merge_attempts(previous: List[Document], current: List[Document]) -> List[Document]:
     """
-    Initialise and cache a HybridRetriever so retrieval configuration and underlying clients are reused across requests.
-    Inputs: none ; Outputs: a configured HybridRetriever instance.
+    Combine the documents of the first attempt with those of a quality gate retry, so a rewrite that scores worse never loses what the first search found.
+    Candidates are deduplicated by chunk key and ordered by dense score (unscored ones last), truncated to RETRIEVAL_TOP_K.
+    Inputs: previous attempt's documents, retry documents ; Outputs: merged list[Document].
     """
-    global _retriever
-    if _retriever is None:
-        _retriever = HybridRetriever.from_env()
-    return _retriever
+    merged = {}
+    for d in current + previous:
+        merged.setdefault(_doc_key(d), d)
+    ranked = sorted(merged.values(), key=lambda d: (d.metadata or {}).get("dense_score", float("-inf")), reverse=True)
+    return ranked[: settings.RETRIEVAL_TOP_K]
 
 
 def retrieval_node(state: GraphState) -> dict:
     """
-    Retrieve candidate document chunks for the current question and attach them to the graph state.
-    Inputs: state ; Outputs: a partial state update dict with 'documents' and a retrieval summary message.
+    Retrieve candidate document chunks for the current question and attach them to the graph state, reusing documents prefetched by the planner when available.
+    When the LLM plan lists sub-questions, the question and each sub-question are searched concurrently and fused with RRF.
+    A speculative retrieval started at the beginning of the turn is reused when the final query is the raw question, and cancelled otherwise.
+    On a quality gate retry the results are merged with the previous attempt's documents.
+    Inputs: state ; Outputs: a partial state update dict with 'documents' and a retrieval trace event.
     """
-    retriever = _get_retriever()
+    prefetched = state.get("prefetched_documents")
+    if prefetched is not None:
+        record_cache("prefetched_retrieval", hit=True)
+        event = trace_event(
+            "retrieval_agent",
+            f"Reused {len(prefetched)} documents prefetched on the raw question.",
+            documents=len(prefetched),
+        )
+        return {
+            "documents": prefetched,
+            "prefetched_documents": None,
+            "trace": [event],
+        }
+
+    retriever = get_hybrid_retriever()
 
     question = state.get("question", "")
     plan = state.get("plan", None)
 
-    query_text = question if not plan else f"{question}\n\nPlan:\n{plan}"
+    retrieval_query = state.get("retrieval_query")
+    sub_queries = [] if retrieval_query else parse_sub_queries(plan or "", settings.RETRIEVAL_MAX_SUBQUERIES)
+
+    query_text = retrieval_query or (question if not plan else f"{question}\n\nPlan:\n{plan}")
+
+    speculation_id = state.get("speculation_id")
+    docs: List[Document] | None = None
+    if speculation_id and not sub_queries and query_text == question:
+        docs = claim_speculative_retrieval(speculation_id)
+        record_cache("speculative_retrieval", hit=docs is not None)
+    elif speculation_id:
+        cancel_speculative_retrieval(speculation_id)
+        record_cache("speculative_retrieval", hit=False)
+
+    reused = docs is not None
+    if docs is None:
+        if sub_queries:
+            docs = retriever.retrieve_many([question, *sub_queries])
+        else:
+            docs = retriever.retrieve(query_text)
 
-    docs: List[Document] = retriever.retrieve(query_text)
+    if state.get("gate_decision") == "retry":
+        docs = _merge_attempts(state.get("documents") or [], docs)
 
-    retrieval_summary = AIMessage(
-        content=f"Retrieved {len(docs)} documents for the query.",
-        name="retrieval_agent",
+    event = trace_event(
+        "retrieval_agent",
+        (
+            f"Reused {len(docs)} speculatively retrieved documents."
+            if reused
+            else f"Retrieved {len(docs)} documents for the query."
+        ),
+        documents=len(docs),
+        sub_queries=len(sub_queries),
     )
 
     return {
         "documents": docs,
-        "messages": [retrieval_summary],
+        "speculation_id": None,
+        "trace": [event],
     }
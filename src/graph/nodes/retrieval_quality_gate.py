@@ -1,48 +1,102 @@
 from __future__ import annotations
 
-from typing import Literal
-
-from langchain_core.messages import AIMessage
+from dataclasses import dataclass
+from typing import Literal, Optional
 
+from src.app.core.config import settings
 from src.graph.state import GraphState
+from src.graph.trace import trace_event
+from src.rag.retrieval.query_planning import local_rewrite
+
+GateDecision = Literal["retry", "continue", "not_found"]
 
-GateDecision = Literal["retry", "continue"]
 
-def _gate_decision(state: GraphState) -> GateDecision:
+@dataclass
+class GateAssessment:
+    """
+    Outcome of the retrieval quality gate: the decision, the evidence it was based on and, on retry, the rewritten query.
     """
-    Decide whether retrieval results are strong enough to continue, or whether to trigger a single retry to improve recall.
-    Inputs: state containing 'documents' and 'retry_count'; Outputs: 'retry' if retrieval is weak and retry budget remains, otherwise 'continue'.
+    decision: GateDecision
+    reason: str
+    best_score: Optional[float] = None
+    relevant: int = 0
+    lexical: int = 0
+    rewrite: Optional[str] = None
+
+
+def _assess(state: GraphState) -> GateAssessment:
+    """
+    Decide from the dense similarity scores of the retrieved chunks whether to continue to reasoning, answer "not found" without reasoning,
+    or retry once with a local rewrite of the query (only when the evidence is weak but present and the rewrite differs from what was searched).
+    Documents without scores (retrievers that do not report them) fall back to the original count rule.
+    Inputs: state containing 'documents', 'retry_count', 'question' and 'retrieval_query'; Outputs: GateAssessment.
     """
     docs = state.get("documents") or []
     retry_count = int(state.get("retry_count", 0) or 0)
+    question = state.get("question") or ""
+    searched = state.get("retrieval_query") or question
+
+    if not docs:
+        return GateAssessment("not_found", "no documents")
+
+    scores = [float(d.metadata["dense_score"]) for d in docs if "dense_score" in (d.metadata or {})]
+    lexical = sum(1 for d in docs if (d.metadata or {}).get("lexical_match"))
+    if not scores:
+        rewrite = local_rewrite(question, searched) if retry_count == 0 and len(docs) < 2 else None
+        if rewrite:
+            return GateAssessment("retry", "few unscored documents", lexical=lexical, rewrite=rewrite)
+        return GateAssessment("continue", "unscored documents", lexical=lexical)
+
+    best = max(scores)
+    relevant = sum(1 for s in scores if s >= settings.QUALITY_GATE_RELEVANT_SCORE)
+    evidence = {"best_score": round(best, 4), "relevant": relevant, "lexical": lexical}
 
-    if retry_count >= 1:
-        return "continue"
+    if best >= settings.QUALITY_GATE_STRONG_SCORE or relevant >= settings.QUALITY_GATE_MIN_RELEVANT:
+        return GateAssessment("continue", "relevant documents", **evidence)
+    if best < settings.QUALITY_GATE_NOT_FOUND_SCORE and lexical == 0:
+        return GateAssessment("not_found", "nothing above the not-found score", **evidence)
 
-    if len(docs) == 0:
-        return "retry"
-    if len(docs) < 2:
-        return "retry"
+    rewrite = local_rewrite(question, searched) if retry_count == 0 else None
+    if rewrite:
+        return GateAssessment("retry", "weak evidence", rewrite=rewrite, **evidence)
+    if relevant or lexical:
+        return GateAssessment("continue", "weak but usable evidence", **evidence)
+    return GateAssessment("not_found", "no relevant documents after rewrite", **evidence)
 
-    return "continue"
 
 def quality_gate_node(state: GraphState) -> dict:
     """
-    Apply the retrieval quality decision by incrementing retry_count on retry and always appending a trace message used for debugging the retry loop.
-    Inputs: state ; Outputs: a partial state update dict that may include an updated 'retry_count' and always includes 'messages'.
+    Apply the retrieval quality decision: on retry, increment retry_count and set the locally rewritten 'retrieval_query' for the retrieval node
+    (the planner LLM is not called again);
+    always record the decision for the router and a trace event with the scores it was based on.
+    Inputs: state ; Outputs: a partial state update dict with 'gate_decision', 'trace' and, on retry, 'retry_count' and 'retrieval_query'.
     """
-    decision = _gate_decision(state)
+    assessment = _assess(state)
+    evidence = {
+        "decision": assessment.decision,
+        "reason": assessment.reason,
+        "best_score": assessment.best_score,
+        "relevant": assessment.relevant,
+        "lexical": assessment.lexical,
+    }
 
-    if decision == "retry":
+    if assessment.decision == "retry":
         new_retry = int(state.get("retry_count", 0) or 0) + 1
-        msg = AIMessage(
-            content=f"Retrieval quality gate: retrying retrieval (retry_count={new_retry}).",
-            name="quality_gate",
+        event = trace_event(
+            "quality_gate",
+            f"Retrieval quality gate: retrying retrieval with a rewritten query (retry_count={new_retry}).",
+            rewrite=assessment.rewrite,
+            **evidence,
         )
         return {
+            "gate_decision": "retry",
             "retry_count": new_retry,
-            "messages": [msg],
+            "retrieval_query": assessment.rewrite,
+            "trace": [event],
         }
 
-    msg = AIMessage(content="Retrieval quality gate: continue.", name="quality_gate")
-    return {"messages": [msg]}
+    message = {
+        "continue": "Retrieval quality gate: continue.",
+        "not_found": "Retrieval quality gate: nothing relevant found; skipping reasoning.",
+    }[assessment.decision]
+    return {"gate_decision": assessment.decision, "trace": [trace_event("quality_gate", message, **evidence)]}
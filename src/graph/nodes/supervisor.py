@@ -1,14 +1,25 @@
 from __future__ import annotations
 
-import re
 from typing import Literal
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 
+from src.graph.intent import IntentResult, classify_intent
 from src.graph.state import GraphState
+from src.graph.trace import trace_event
 
 SupervisorDecision = Literal["plan_and_retrieve", "answer_directly", "clarify", "refuse"]
 
+_REFERENTIAL_WORDS = frozenset(["it", "this", "that", "they", "them"])
+
+_INTENT_DECISIONS: dict[str, SupervisorDecision] = {
+    "empty": "clarify",
+    "smalltalk": "answer_directly",
+    "meta": "answer_directly",
+    "history": "answer_directly",
+    "out_of_scope": "refuse",
+}
+
 def _last_user_message(messages: list[BaseMessage]) -> str:
     """
     Extract the most recent user message from the LangChain message history to support supervisor routing heuristics.
@@ -19,42 +30,42 @@ def _last_user_message(messages: list[BaseMessage]) -> str:
             return (m.content or "").strip()
     return ""
 
-def decide_next_step(state: GraphState) -> SupervisorDecision:
+def _route(state: GraphState) -> tuple[SupervisorDecision, IntentResult]:
     """
-    Choose the next workflow branch (RAG, direct answer, or clarification). 
-    Inputs: state containing at least 'question' and 'messages'; Outputs: a SupervisorDecision string ('plan_and_retrieve' | 'answer_directly' | 'clarify' | 'refuse').
+    Classify the question with the local intent classifier and map the intent to a workflow branch.
+    Inputs: state containing at least 'question' and 'messages'; Outputs: (decision, intent result).
     """
     question = (state.get("question") or "").strip()
-    messages = state.get("messages") or []
-    last_user = _last_user_message(messages)
-
-    if not question:
-        return "clarify"
+    intent = classify_intent(question)
 
-    smalltalk = re.match(r"^(hi|hello|hey|thanks|thank you)\b", question.lower())
-    meta = "how does this work" in question.lower() or "what can you do" in question.lower()
-    if smalltalk or meta:
-        return "answer_directly"
+    decision = _INTENT_DECISIONS.get(intent.intent)
+    if decision is not None:
+        return decision, intent
 
-    referential = any(w in question.lower().split() for w in ["it", "this", "that", "they", "them"])
+    last_user = _last_user_message(state.get("messages") or [])
+    referential = not _REFERENTIAL_WORDS.isdisjoint(question.lower().split())
     if referential and len(last_user) < 5:
-        return "clarify"
+        return "clarify", intent
 
-    return "plan_and_retrieve"
+    return "plan_and_retrieve", intent
 
-def supervisor_node(state: GraphState) -> dict:
+def decide_next_step(state: GraphState) -> SupervisorDecision:
     """
-    Run the supervisor decision logic, store the chosen branch label in state, and append an internal trace message for debugging/observability.
-    Inputs: state ; Outputs: a partial state update dict with 'supervisor_decision' and an appended 'messages' trace entry.
+    Choose the next workflow branch (RAG, direct answer, clarification or refusal) from the local intent classifier: smalltalk, meta and
+    conversation-history questions are answered directly, out-of-scope requests refused, everything else goes through retrieval.
+    Inputs: state containing at least 'question' and 'messages'; Outputs: a SupervisorDecision string ('plan_and_retrieve' | 'answer_directly' | 'clarify' | 'refuse').
     """
-    decision = decide_next_step(state)
+    return _route(state)[0]
 
-    msg = AIMessage(
-        content=f"Supervisor decision: {decision}",
-        name="supervisor",
-    )
+def supervisor_node(state: GraphState) -> dict:
+    """
+    Run the supervisor decision logic, store the chosen branch label in state, and append an internal trace event for debugging/observability.
+    Inputs: state ; Outputs: a partial state update dict with 'supervisor_decision', 'intent' and an appended 'trace' event.
+    """
+    decision, intent = _route(state)
 
     return {
-        "messages": [msg],
+        "trace": [trace_event("supervisor", f"Supervisor decision: {decision}", decision=decision)],
         "supervisor_decision": decision,
+        "intent": {"intent": intent.intent, "source": intent.source, "score": intent.score},
     }
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from langchain_core.documents import Document
+
+from src.app.core.concurrency import submit
+from src.rag.retrieval.hybrid_retriever import get_hybrid_retriever
+
+_MAX_AGE_SECONDS = 120.0
+
+
+@dataclass
+class _Speculation:
+    future: Future
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    started_at: float = field(default_factory=time.monotonic)
+
+
+_inflight: Dict[str, _Speculation] = {}
+_lock = threading.Lock()
+
+# Tokens started during the current turn (shared by reference with the node threads, like the request timings)
+_turn_tokens: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("speculation_turn_tokens", default=None)
+
+
+def _run_speculative_retrieval(question: str, cancelled: threading.Event) -> Optional[List[Document]]:
+    """
+    Worker body of a speculative retrieval: skip the work entirely when it was cancelled before it got scheduled.
+    Inputs: question, cancelled event ; Outputs: retrieved documents, or None when cancelled.
+    """
+    if cancelled.is_set():
+        return None
+    return get_hybrid_retriever().retrieve(question)
+
+
+def _evict_stale() -> None:
+    """
+    Cancel and drop speculations older than _MAX_AGE_SECONDS, a backstop for work started outside a speculation_scope.
+    Inputs: none ; Outputs: None. Caller must hold _lock.
+    """
+    now = time.monotonic()
+    for token in [t for t, s in _inflight.items() if now - s.started_at > _MAX_AGE_SECONDS]:
+        spec = _inflight.pop(token)
+        spec.cancelled.set()
+        spec.future.cancel()
+
+
+def start_speculative_retrieval(question: str) -> str:
+    """
+    Launch embedding + hybrid search on the raw question on the shared worker pool, ahead of memory load, routing and planning.
+    Inputs: question ; Outputs: a token used to claim or cancel the speculative result.
+    """
+    cancelled = threading.Event()
+    future = submit(_run_speculative_retrieval, question, cancelled)
+    token = uuid.uuid4().hex
+    with _lock:
+        _evict_stale()
+        _inflight[token] = _Speculation(future=future, cancelled=cancelled)
+    turn = _turn_tokens.get()
+    if turn is not None:
+        turn.append(token)
+    return token
+
+
+def claim_speculative_retrieval(token: Optional[str]) -> Optional[List[Document]]:
+    """
+    Wait for and take ownership of a speculative retrieval result.
+    Inputs: token ; Outputs: retrieved documents, or None when the token is unknown, the work was cancelled or it failed (callers then retrieve normally).
+    """
+    if not token:
+        return None
+    with _lock:
+        spec = _inflight.pop(token, None)
+    if spec is None or spec.future.cancelled():
+        return None
+    try:
+        return spec.future.result()
+    except Exception:
+        return None
+
+
+def cancel_speculative_retrieval(token: Optional[str]) -> None:
+    """
+    Cancel a speculative retrieval whose result will not be used (non-RAG route or rewritten query).
+    Work that has not started is dropped; work already running finishes in the background and is discarded.
+    Inputs: token ; Outputs: None.
+    """
+    if not token:
+        return
+    with _lock:
+        spec = _inflight.pop(token, None)
+    if spec is not None:
+        spec.cancelled.set()
+        spec.future.cancel()
+
+
+@contextmanager
+def speculation_scope() -> Iterator[None]:
+    """
+    Scope speculative retrievals to one turn: whatever was started inside the block and not claimed by its end is cancelled and evicted,
+    whichever route the turn took and also when it failed.
+    Inputs: none ; Outputs: context manager.
+    """
+    tokens: List[str] = []
+    reset = _turn_tokens.set(tokens)
+    try:
+        yield
+    finally:
+        _turn_tokens.reset(reset)
+        for token in tokens:
+            cancel_speculative_retrieval(token)
@@ -7,21 +7,35 @@ from langchain_core.messages import BaseMessage
 from langchain_core.documents import Document
 from langgraph.graph import add_messages
 
+from src.graph.trace import TraceEvent, add_trace
+
 
 class GraphState(TypedDict):
     """
     Shared state passed between all LangGraph nodes.
     Each agent reads from this structure and returns a partial update that LangGraph will merge into the global state.
     """
-    # Full conversational history
+    # User visible conversation: client messages, injected memory and assistant replies
     messages: Annotated[List[BaseMessage], add_messages]
 
+    # Internal agent events (routing, planning, retrieval, citations), bounded to GRAPH_TRACE_MAX_EVENTS and never sent to LLMs
+    trace: Annotated[List[TraceEvent], add_trace]
+
     # Current user question for this turn 
     question: str
 
     # Optional structured plan produced by QueryPlannerAgent
     plan: Optional[str]
 
+    # Search text chosen by the planner; None means the retrieval node derives it from question + plan
+    retrieval_query: Optional[str]
+
+    # Documents already retrieved on the raw question while the planner was running, consumed by the retrieval node
+    prefetched_documents: Optional[List[Document]]
+
+    # Token of the speculative retrieval started at the beginning of the turn, if any
+    speculation_id: Optional[str]
+
     # Retrieved documents for this turn
     documents: List[Document]
 
@@ -31,14 +45,27 @@ class GraphState(TypedDict):
     # Structured citation data 
     citations: List[dict[str, Any]]
 
+    # Raw {"answer_with_citations", "citations"} output of the fused reasoning mode, validated by the citation node
+    fused_citations: Optional[dict[str, Any]]
+
     # Session identifier for multi‑turn / Redis memory
     session_id: Optional[str]
 
+    # Memory bundle loaded once per turn by load_memory_node and reused by save_memory_node
+    memory_summary: Optional[str]
+    memory_messages: Optional[List[BaseMessage]]
+
     # Small integer used for retries 
     retry_count: int
 
     # Supervisor routing decision for this turn
     supervisor_decision: Optional[str]
 
+    # Intent behind that decision: {"intent", "source" (pattern / embedding / default), "score"}
+    intent: Optional[dict[str, Any]]
+
+    # Decision of the retrieval quality gate ("continue", "retry" or "not_found"), read by its router
+    gate_decision: Optional[str]
+
     # Used by quality gate to avoid infinite loops
     retrieval_attempted: bool
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from src.app.core.config import settings
+
+TraceEvent = Dict[str, Any]
+
+# AIMessage names used by nodes before internal events moved to the trace channel; still filtered out of
+# prompts and memory in case such messages come back from older stored sessions or client supplied history.
+INTERNAL_AGENT_NAMES = {
+    "supervisor",
+    "query_planner",
+    "retrieval_agent",
+    "reasoning_agent",
+    "citation_agent",
+    "memory_agent",
+    "quality_gate",
+}
+
+
+def trace_event(agent: str, message: str, **data: Any) -> TraceEvent:
+    """
+    Build one internal trace event for the GraphState 'trace' channel.
+    Inputs: agent (node name), message (short human readable text), optional structured fields ; Outputs: a trace event dict.
+    """
+    return {"agent": agent, "message": message, **data}
+
+
+def add_trace(left: Optional[List[TraceEvent]], right: Optional[Sequence[TraceEvent]]) -> List[TraceEvent]:
+    """
+    LangGraph reducer for the 'trace' channel: append new events and keep only the last GRAPH_TRACE_MAX_EVENTS.
+    Inputs: current events, events returned by a node ; Outputs: the bounded merged list.
+    """
+    merged = list(left or []) + list(right or [])
+    max_events = settings.GRAPH_TRACE_MAX_EVENTS
+    return merged[-max_events:] if max_events > 0 else []
+
+
+def is_user_visible_message(m: BaseMessage) -> bool:
+    """
+    Decide whether a message is part of the user visible conversation rather than an internal agent trace.
+    Inputs: BaseMessage from the graph message history; Outputs: True for user/system messages and assistant replies, False for internal agent traces.
+    """
+    if isinstance(m, (SystemMessage, HumanMessage)):
+        return True
+    if isinstance(m, AIMessage):
+        return getattr(m, "name", None) not in INTERNAL_AGENT_NAMES
+    return False
+
+
+def conversation_history(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """
+    Select the user visible turns of the message history, for LLM prompts.
+    Inputs: messages ; Outputs: list of user visible messages in order.
+    """
+    return [m for m in messages or [] if is_user_visible_message(m)]
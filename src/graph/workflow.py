@@ -1,67 +1,96 @@
 from __future__ import annotations
 
+import threading
 from typing import Literal
 
 from langgraph.graph import StateGraph, START, END
 
+from src.app.core.config import settings
+from src.app.core.metrics import instrument_node, record_cache
+from src.graph.coalescing import coalesce_key, is_coalescable, single_flight
+from src.graph.speculation import cancel_speculative_retrieval, start_speculative_retrieval
 from src.graph.state import GraphState
+from src.graph.trace import trace_event
 from src.graph.nodes.supervisor import supervisor_node
 from src.graph.nodes.query_planner import query_planner_node
 from src.graph.nodes.retrieval_agent import retrieval_node
 from src.graph.nodes.retrieval_quality_gate import quality_gate_node
 from src.graph.nodes.reasoning_agent import reasoning_node
 from src.graph.nodes.citation_agent import citation_node
-from src.graph.nodes.memory_agent import load_memory_node, save_memory_node
+from src.graph.nodes.memory_agent import (
+    aload_memory_node,
+    asave_memory_node,
+    load_memory_node,
+    save_memory_node,
+)
 from src.graph.nodes.direct_answer import direct_answer_node
 from src.graph.nodes.clarify_agent import clarify_node
+from src.graph.nodes.not_found import not_found_node
+from src.graph.nodes.refuse import refuse_node
+
+
+def speculative_retrieval_node(state: GraphState) -> dict:
+    """
+    Kick off embedding + hybrid search on the raw question in the background so retrieval overlaps with memory load, supervisor routing and planning.
+    Inputs: state containing `question`; Outputs: a partial state update dict with `speculation_id` (None when disabled or the question is empty).
+    """
+    question = (state.get("question") or "").strip()
+    if not settings.SPECULATIVE_RETRIEVAL or not question:
+        return {"speculation_id": None}
+    return {"speculation_id": start_speculative_retrieval(question)}
 
 
 def supervisor_router(state: GraphState,) -> Literal["plan_and_retrieve", "answer_directly", "clarify", "refuse"]:
     """
-    Route execution after the Supervisor node by mapping `state["supervisor_decision"]` to a valid workflow branch.
+    Route execution after the Supervisor node by mapping `state["supervisor_decision"]` to a valid workflow branch, cancelling speculative retrieval on non-RAG branches.
     Inputs: state (GraphState) containing `supervisor_decision`; Outputs: a branch label string for LangGraph conditional edges.
     """
     decision = state.get("supervisor_decision", "plan_and_retrieve")
     if decision not in ("plan_and_retrieve", "answer_directly", "clarify", "refuse"):
-        return "plan_and_retrieve"
+        decision = "plan_and_retrieve"
+    if decision != "plan_and_retrieve":
+        cancel_speculative_retrieval(state.get("speculation_id"))
     return decision
 
 
-def quality_gate_router(state: GraphState) -> Literal["retry", "continue"]:
+def quality_gate_router(state: GraphState) -> Literal["retry", "continue", "not_found"]:
     """
-    Route execution after the retrieval quality gate by deciding whether to retry planning/retrieval or continue to reasoning.
-    Inputs: state (GraphState) containing `retry_count` and `documents`; Outputs: "retry" or "continue" for LangGraph conditional edges.
+    Route execution after the retrieval quality gate using the decision it recorded: retry retrieval with the rewritten query, continue to reasoning, or answer "not found".
+    Inputs: state (GraphState) containing `gate_decision`; Outputs: "retry", "continue" or "not_found" for LangGraph conditional edges.
     """
-    retry_count = int(state.get("retry_count", 0) or 0)
-    docs = state.get("documents") or []
-    if retry_count == 0 and len(docs) < 2:
-        return "retry"
-    return "continue"
+    decision = state.get("gate_decision")
+    if decision not in ("retry", "continue", "not_found"):
+        decision = "continue"
+    return decision
 
 
-def build_graph() -> StateGraph:
+def _add_node(workflow: StateGraph, name: str, node) -> None:
     """
-    Construct the LangGraph StateGraph by registering all nodes and wiring the main branches, retry loop, and terminal edges.
-    Inputs: none; Outputs: a compiled StateGraph workflow definition ready to be executed by the API layer.
+    Register a node wrapped with latency instrumentation (rag_node_duration_seconds and the per-request breakdown).
+    Inputs: workflow, node name, node function; Outputs: None.
     """
-    workflow = StateGraph(GraphState)
+    workflow.add_node(name, instrument_node(name, node))
 
-    workflow.add_node("load_memory", load_memory_node)
-    workflow.add_node("supervisor", supervisor_node)
 
-    workflow.add_node("clarify", clarify_node)
-    workflow.add_node("direct_answer", direct_answer_node)
+def _add_answer_nodes(workflow: StateGraph, end: str) -> None:
+    """
+    Register the answering part of the workflow (routing, planning, retrieval, quality gate, reasoning, citations) and its edges, ending at `end`.
+    Shared by the full graph and by the answer graph that coalesced turns run once per group.
+    Inputs: workflow, name of the node (or END) every branch finishes at; Outputs: None.
+    """
+    _add_node(workflow, "supervisor", supervisor_node)
 
-    workflow.add_node("query_planner", query_planner_node)
-    workflow.add_node("retrieval", retrieval_node)
-    workflow.add_node("quality_gate", quality_gate_node)
+    _add_node(workflow, "clarify", clarify_node)
+    _add_node(workflow, "direct_answer", direct_answer_node)
+    _add_node(workflow, "refuse", refuse_node)
 
-    workflow.add_node("reasoning", reasoning_node)
-    workflow.add_node("citation", citation_node)
-    workflow.add_node("save_memory", save_memory_node)
+    _add_node(workflow, "query_planner", query_planner_node)
+    _add_node(workflow, "retrieval", retrieval_node)
+    _add_node(workflow, "quality_gate", quality_gate_node)
+    _add_node(workflow, "not_found", not_found_node)
 
-    workflow.add_edge(START, "load_memory")
-    workflow.add_edge("load_memory", "supervisor")
+    _add_node(workflow, "reasoning", reasoning_node)
+    _add_node(workflow, "citation", citation_node)
 
     workflow.add_conditional_edges(
         "supervisor",
@@ -70,12 +99,13 @@ def build_graph() -> StateGraph:
             "plan_and_retrieve": "query_planner",
             "answer_directly": "direct_answer",
             "clarify": "clarify",
-            "refuse": "clarify", 
+            "refuse": "refuse",
         },
     )
 
-    workflow.add_edge("clarify", "save_memory")
-    workflow.add_edge("direct_answer", "save_memory")
+    workflow.add_edge("clarify", end)
+    workflow.add_edge("direct_answer", end)
+    workflow.add_edge("refuse", end)
 
     workflow.add_edge("query_planner", "retrieval")
     workflow.add_edge("retrieval", "quality_gate")
@@ -84,24 +114,128 @@ def build_graph() -> StateGraph:
         "quality_gate",
         quality_gate_router,
         {
-            "retry": "query_planner",
+            "retry": "retrieval",
             "continue": "reasoning",
+            "not_found": "not_found",
         },
     )
 
+    workflow.add_edge("not_found", end)
+
     workflow.add_edge("reasoning", "citation")
-    workflow.add_edge("citation", "save_memory")
+    workflow.add_edge("citation", end)
+
+
+def coalesce_router(state: GraphState) -> Literal["coalesce", "run"]:
+    """
+    Route turns without session history through the coalescing node, so identical concurrent questions share one run.
+    Inputs: state after load_memory; Outputs: "coalesce" or "run".
+    """
+    if settings.COALESCE_ENABLED and is_coalescable(state):
+        return "coalesce"
+    return "run"
+
+
+async def coalesced_turn_node(state: GraphState) -> dict:
+    """
+    Answer the turn through single-flight: the first of concurrent identical questions runs the answer graph, the others wait for it and copy
+    its answer, citations and documents. Memory is not part of the shared run; save_memory still writes each session separately.
+    Inputs: state ; Outputs: a partial state update dict with the (possibly shared) answer and a coalescing trace event.
+    """
+    key = coalesce_key(state.get("question") or "", settings.QDRANT_COLLECTION_NAME)
+
+    async def _run() -> dict:
+        return await get_answer_app().ainvoke({**state, "trace": []})
+
+    try:
+        result, shared = await single_flight(key, _run)
+    finally:
+        # A follower never retrieves; a leader's answer run has claimed or cancelled it already (then this is a no-op)
+        cancel_speculative_retrieval(state.get("speculation_id"))
+    record_cache("coalesced_turn", shared)
+
+    message = "Shared the answer of an identical in-flight question." if shared else "Ran the answer workflow for this question."
+    return {
+        "answer": result.get("answer"),
+        "citations": list(result.get("citations") or []),
+        "documents": list(result.get("documents") or []),
+        "plan": result.get("plan"),
+        "retrieval_query": result.get("retrieval_query"),
+        "supervisor_decision": result.get("supervisor_decision"),
+        "intent": result.get("intent"),
+        "retry_count": result.get("retry_count", 0),
+        "trace": [*(result.get("trace") or []), trace_event("coalescing", message, shared=shared)],
+    }
+
+
+def build_graph() -> StateGraph:
+    """
+    Construct the LangGraph StateGraph by registering all nodes and wiring the main branches, retry loop, and terminal edges.
+    Inputs: none; Outputs: a compiled StateGraph workflow definition ready to be executed by the API layer.
+    """
+    workflow = StateGraph(GraphState)
+    async_memory = (settings.MEMORY_BACKEND or "sync").lower() == "async"
+
+    _add_node(workflow, "speculative_retrieval", speculative_retrieval_node)
+    _add_node(workflow, "load_memory", aload_memory_node if async_memory else load_memory_node)
+    _add_node(workflow, "coalesce", coalesced_turn_node)
+    _add_node(workflow, "save_memory", asave_memory_node if async_memory else save_memory_node)
+    _add_answer_nodes(workflow, end="save_memory")
+
+    workflow.add_edge(START, "speculative_retrieval")
+    workflow.add_edge("speculative_retrieval", "load_memory")
+    workflow.add_conditional_edges(
+        "load_memory",
+        coalesce_router,
+        {
+            "coalesce": "coalesce",
+            "run": "supervisor",
+        },
+    )
+    workflow.add_edge("coalesce", "save_memory")
     workflow.add_edge("save_memory", END)
 
     return workflow
 
 
-_graph_app = build_graph().compile()
+def build_answer_graph() -> StateGraph:
+    """
+    Construct the answering subgraph (supervisor to citation, no memory nodes) run once per group of coalesced turns.
+    Inputs: none; Outputs: a StateGraph workflow definition.
+    """
+    workflow = StateGraph(GraphState)
+    _add_answer_nodes(workflow, end=END)
+    workflow.add_edge(START, "supervisor")
+    return workflow
+
+
+_graph_app = None
+_answer_app = None
+_graph_lock = threading.Lock()
 
 
 def get_graph_app():
     """
     Return the compiled LangGraph application instance used by the `/chat` endpoint to run the multi agent workflow.
+    The graph is compiled on first use (normally by the startup warmup) rather than at import time.
     Inputs: none; Outputs: a compiled LangGraph app object.
     """
+    global _graph_app
+    if _graph_app is None:
+        with _graph_lock:
+            if _graph_app is None:
+                _graph_app = build_graph().compile()
     return _graph_app
+
+
+def get_answer_app():
+    """
+    Return the compiled answer subgraph used by coalesced turns (compiled on first use).
+    Inputs: none; Outputs: a compiled LangGraph app object.
+    """
+    global _answer_app
+    if _answer_app is None:
+        with _graph_lock:
+            if _answer_app is None:
+                _answer_app = build_answer_graph().compile()
+    return _answer_app
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.rag.text_utils import content_tokens, sentence_spans
+
+_EXISTING_MARKER_RE = re.compile(r"\[\d+\]")
+_TRAILING_PUNCT_RE = re.compile(r"[.!?:;,]*$")
+
+
+@dataclass(frozen=True)
+class LocalCitationResult:
+    answer_with_citations: str
+    citations: List[Dict[str, Any]]
+    confidence: float
+
+
+def _insert_marker(sentence: str, marker: str) -> str:
+    """
+    Place an inline citation marker before the sentence's trailing punctuation, e.g. "X is Y [2].".
+    Inputs: sentence text and marker string; Outputs: the sentence with the marker attached.
+    """
+    punct = _TRAILING_PUNCT_RE.search(sentence).group(0)
+    body = sentence[: len(sentence) - len(punct)] if punct else sentence
+    return f"{body.rstrip()} {marker}{punct}"
+
+
+def cite_answer_locally(
+    answer: str,
+    documents: List[Document],
+    *,
+    max_docs: int,
+    min_sentence_score: float,
+    min_claim_tokens: int = 3,
+) -> LocalCitationResult:
+    """
+    Attach citation markers to an answer without an LLM call by scoring every answer sentence against every passage with vectorized token overlap.
+    A sentence is supported by the passage that covers the largest share of its content tokens; confidence is the share of claim-bearing sentences that found support.
+    Inputs: answer, documents (passage index = list position), max_docs, min_sentence_score, min_claim_tokens ; Outputs: LocalCitationResult with citations as [{"index": i}, ...].
+    """
+    passages = documents[:max_docs]
+    spans = sentence_spans(answer)
+    if not passages or not spans or _EXISTING_MARKER_RE.search(answer or ""):
+        return LocalCitationResult(answer_with_citations=answer, citations=[], confidence=0.0)
+
+    sentence_tokens = [set(content_tokens(answer[s:e])) for s, e in spans]
+    vocab = {t: i for i, t in enumerate(sorted(set().union(*sentence_tokens)))}
+    if not vocab:
+        return LocalCitationResult(answer_with_citations=answer, citations=[], confidence=0.0)
+
+    sent_matrix = np.zeros((len(spans), len(vocab)), dtype=np.float32)
+    for row, toks in enumerate(sentence_tokens):
+        sent_matrix[row, [vocab[t] for t in toks]] = 1.0
+
+    passage_matrix = np.zeros((len(passages), len(vocab)), dtype=np.float32)
+    for row, d in enumerate(passages):
+        cols = [vocab[t] for t in set(content_tokens(d.page_content)) if t in vocab]
+        if cols:
+            passage_matrix[row, cols] = 1.0
+
+    token_counts = sent_matrix.sum(axis=1)
+    scores = (sent_matrix @ passage_matrix.T) / np.maximum(token_counts, 1.0)[:, None]
+    best_idx = scores.argmax(axis=1)
+    best_score = scores[np.arange(len(spans)), best_idx]
+
+    is_claim = token_counts >= min_claim_tokens
+    is_cited = is_claim & (best_score >= min_sentence_score)
+    n_claims = int(is_claim.sum())
+    confidence = float(is_cited.sum()) / n_claims if n_claims else 0.0
+
+    pieces: List[str] = []
+    cited_order: List[int] = []
+    cursor = 0
+    for row, (s, e) in enumerate(spans):
+        pieces.append(answer[cursor:s])
+        sentence = answer[s:e]
+        if is_cited[row]:
+            idx = int(best_idx[row])
+            sentence = _insert_marker(sentence, f"[{idx}]")
+            if idx not in cited_order:
+                cited_order.append(idx)
+        pieces.append(sentence)
+        cursor = e
+    pieces.append(answer[cursor:])
+
+    return LocalCitationResult(
+        answer_with_citations="".join(pieces),
+        citations=[{"index": i} for i in cited_order],
+        confidence=confidence,
+    )
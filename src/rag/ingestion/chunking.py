@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from typing import List
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.app.core.config import settings
+from src.rag.llm.context_builder import count_tokens
+from src.rag.llm.models import get_embedding_model
+from src.rag.text_utils import sentence_spans
+
+Span = Tuple[int, int]
+
+_WORD_RE = re.compile(r"\S+")
 
 
 def _get_splitter() -> RecursiveCharacterTextSplitter:
@@ -18,20 +27,152 @@ def _get_splitter() -> RecursiveCharacterTextSplitter:
         chunk_overlap=settings.CHUNK_OVERLAP,
         separators=["\n\n", "\n", " ", ""],
         length_function=len,
+        add_start_index=True,
     )
 
 
+def _sentence_units(text: str, max_tokens: int) -> List[Tuple[Span, int]]:
+    """
+    Split a text into sentence spans with their token counts; a sentence longer than max_tokens is cut on word boundaries into pieces that fit.
+    Inputs: text, max_tokens ; Outputs: list of ((start, end), tokens) in text order.
+    """
+    units: List[Tuple[Span, int]] = []
+    for start, end in sentence_spans(text):
+        tokens = count_tokens(text[start:end])
+        if tokens <= max_tokens:
+            units.append(((start, end), tokens))
+            continue
+        piece_start, piece_end, used = None, None, 0
+        for word in _WORD_RE.finditer(text, start, end):
+            cost = count_tokens(word.group()) + 1
+            if piece_start is not None and used + cost > max_tokens:
+                units.append(((piece_start, piece_end), count_tokens(text[piece_start:piece_end])))
+                piece_start, used = None, 0
+            if piece_start is None:
+                piece_start = word.start()
+            piece_end = word.end()
+            used += cost
+        if piece_start is not None:
+            units.append(((piece_start, piece_end), count_tokens(text[piece_start:piece_end])))
+    return units
+
+
+def adjacent_similarities(vectors: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each pair of consecutive sentence vectors, computed in one vectorised pass.
+    Inputs: sentence vectors (n x dim, any norm) ; Outputs: array of n - 1 similarities (empty for fewer than two sentences).
+    """
+    if len(vectors) < 2:
+        return np.zeros(0, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.where(norms == 0, 1.0, norms)
+    return np.einsum("ij,ij->i", unit[:-1], unit[1:])
+
+
+def merge_units(
+    units: Sequence[Tuple[Span, int]],
+    max_tokens: int,
+    min_tokens: int,
+    similarities: Optional[np.ndarray] = None,
+    break_percentile: Optional[float] = None,
+) -> List[Span]:
+    """
+    Pack consecutive sentence units into chunks of at most max_tokens.
+    Without similarities a chunk is filled greedily. With them (similarities[i] between units i and i + 1), a chunk that overflows is cut at
+    its lowest-similarity boundary past min_tokens instead of at the overflow point, and a chunk past min_tokens also ends early at a
+    boundary at or below break_percentile of the document's similarities (a clear topic shift).
+    Inputs: units ((start, end), tokens), budgets, optional adjacent similarities and break percentile ; Outputs: chunk spans.
+    """
+    n = len(units)
+    semantic = similarities is not None and len(similarities) == n - 1 and n > 1
+    hard_break = float(np.percentile(similarities, break_percentile)) if semantic and break_percentile is not None else None
+
+    spans: List[Span] = []
+    i = 0
+    while i < n:
+        j, used, cut = i, 0, None
+        while j < n and (j == i or used + units[j][1] <= max_tokens):
+            used += units[j][1]
+            j += 1
+            if hard_break is not None and j < n and used >= min_tokens and similarities[j - 1] <= hard_break:
+                cut = j
+                break
+        if cut is None:
+            cut = j
+            if semantic and j < n:
+                filled = np.cumsum([units[k][1] for k in range(i, j)])
+                candidates = [k for k in range(i, j - 1) if filled[k - i] >= min_tokens]
+                if candidates:
+                    cut = min(candidates, key=lambda k: (similarities[k], -k)) + 1
+        spans.append((units[i][0][0], units[cut - 1][0][1]))
+        i = cut
+    return spans
+
+
+def _embed_units(texts: List[str]) -> np.ndarray:
+    """
+    Embed sentence texts in batches of EMBEDDING_BATCH_SIZE (so ingestion holds an embedding slot only briefly).
+    Inputs: texts ; Outputs: float32 matrix aligned with texts.
+    """
+    embedder = get_embedding_model()
+    size = max(settings.EMBEDDING_BATCH_SIZE, 1)
+    rows: List[List[float]] = []
+    for i in range(0, len(texts), size):
+        rows.extend(embedder.embed_documents(texts[i : i + size]))
+    return np.asarray(rows, dtype=np.float32)
+
+
+def _sentence_chunks(documents: List[Document], semantic: bool) -> List[Document]:
+    """
+    Sentence-aware chunking: each document is split into sentences, which are packed by token budget (CHUNK_MAX_TOKENS) without overlap.
+    With semantic=True the sentences of all documents are embedded in batches and chunk boundaries go to low-similarity sentence pairs (see merge_units).
+    Chunk text is the exact slice of the source text, so the same input (and embedding model) always yields the same chunks.
+    Inputs: documents, semantic ; Outputs: chunks carrying the source metadata plus 'start_index'.
+    """
+    max_tokens = max(settings.CHUNK_MAX_TOKENS, 1)
+    min_tokens = max(settings.CHUNK_MIN_TOKENS, 0)
+    per_doc = [_sentence_units(d.page_content or "", max_tokens) for d in documents]
+
+    similarities: List[Optional[np.ndarray]] = [None] * len(documents)
+    if semantic:
+        texts = [d.page_content[s:e] for d, units in zip(documents, per_doc) for (s, e), _ in units]
+        vectors = _embed_units(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+        offset = 0
+        for i, units in enumerate(per_doc):
+            similarities[i] = adjacent_similarities(vectors[offset : offset + len(units)])
+            offset += len(units)
+
+    chunks: List[Document] = []
+    for doc, units, sims in zip(documents, per_doc, similarities):
+        text = doc.page_content or ""
+        spans = merge_units(units, max_tokens, min_tokens, sims, settings.CHUNK_SEMANTIC_BREAK_PERCENTILE if semantic else None)
+        for start, end in spans:
+            chunks.append(Document(page_content=text[start:end], metadata={**(doc.metadata or {}), "start_index": start}))
+    return chunks
+
+
 def chunk_documents(documents: List[Document]) -> List[Document]:
     """
-    Split loaded Documents into smaller overlapping chunks while preserving and augmenting metadata required for stable chunk identification.
+    Split loaded Documents into smaller chunks while preserving and augmenting metadata required for stable chunk identification.
+    CHUNKING_STRATEGY selects the splitter: "recursive" (overlapping CHUNK_SIZE character windows), "sentence" (sentences packed by token
+    budget, no overlap) or "semantic" (as "sentence", with extra boundaries where adjacent sentence embeddings diverge).
+    Every chunk records 'start_index' (character offset in its page) and 'chunk_id', its ordinal within its (source, page), so neither
+    depends on which other pages or files are chunked in the same batch.
     Inputs: loaded docs ; Outputs: chunks with metadata.
     """
-    splitter = _get_splitter()
-    chunks = splitter.split_documents(documents)
+    strategy = (settings.CHUNKING_STRATEGY or "recursive").lower()
+    if strategy in ("sentence", "semantic"):
+        chunks = _sentence_chunks(documents, semantic=strategy == "semantic")
+    else:
+        chunks = _get_splitter().split_documents(documents)
 
-    for i, c in enumerate(chunks):
+    ordinals: Dict[Tuple[str, object], int] = {}
+    for c in chunks:
         meta = c.metadata or {}
-        meta.setdefault("chunk_id", i)
+        page_key = (str(meta.get("source", "unknown")), meta.get("page", meta.get("section", None)))
+        ordinal = ordinals.get(page_key, 0)
+        ordinals[page_key] = ordinal + 1
+        meta.setdefault("chunk_id", ordinal)
         c.metadata = meta
 
     return chunks
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.app.core.config import settings
+from src.rag.text_utils import tokenize
+
+_PRIME = (1 << 31) - 1
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_rng = np.random.default_rng(0x5EED)
+_PERM_A = _rng.integers(1, _PRIME, size=_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, size=_NUM_PERM, dtype=np.uint64)
+
+
+def _shingle_hashes(tokens: Sequence[str], size: int) -> np.ndarray:
+    """
+    Hash every run of `size` consecutive tokens (blake2b, stable across processes unlike hash()), reduced modulo a 31-bit prime.
+    Inputs: tokens, shingle size ; Outputs: uint64 array with one value per distinct shingle (one shingle for texts shorter than size).
+    """
+    size = max(size, 1)
+    shingles = {" ".join(tokens[i : i + size]) for i in range(max(len(tokens) - size + 1, 1))}
+    return np.array(
+        sorted(int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") % _PRIME for s in shingles),
+        dtype=np.uint64,
+    )
+
+
+def minhash(text: str, shingle_size: Optional[int] = None) -> np.ndarray:
+    """
+    MinHash signature of a text's word shingles: for each of 64 fixed hash permutations (a * x + b mod p), the minimum over the shingles,
+    computed as one (shingles x 64) NumPy operation. The share of equal positions between two signatures estimates their Jaccard similarity.
+    Inputs: text, shingle_size (defaults to DEDUP_SHINGLE_SIZE) ; Outputs: uint64 array of 64 values (all zero for text without tokens).
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return np.zeros(_NUM_PERM, dtype=np.uint64)
+    hashes = _shingle_hashes(tokens, shingle_size or settings.DEDUP_SHINGLE_SIZE)
+    return ((hashes[:, None] * _PERM_A + _PERM_B) % _PRIME).min(axis=0)
+
+
+def jaccard_estimate(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def _bands(signature: np.ndarray) -> List[bytes]:
+    return [signature[i * _ROWS : (i + 1) * _ROWS].tobytes() for i in range(_BANDS)]
+
+
+def _normalized(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+# Tokens that carry the facts of templated text (reports, invoices, per-period pages): numbers, capitalised names, ordinals and months.
+# Two chunks that differ in one of them say different things however similar the rest is.
+_FACT_RE = re.compile(r"\d[\d.,:/%-]*|\b[A-Z][\w&'-]*")
+_FACT_WORDS = frozenset(
+    "first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth "
+    "january february march april may june july august september october november december".split()
+)
+
+
+def fact_tokens(text: str) -> tuple:
+    """
+    Numbers, capitalised words, ordinals and month names of a text, in order; near-duplicate matches must agree on all of them.
+    Inputs: text ; Outputs: tuple of tokens.
+    """
+    facts = [m.group().rstrip(".,:/-") for m in _FACT_RE.finditer(text or "")]
+    facts += [t for t in tokenize(text) if t in _FACT_WORDS]
+    return tuple(facts)
+
+
+class MinHashIndex:
+    """
+    Duplicate lookup. By default only identical normalised text matches. With DEDUP_NEAR_DUPLICATES, LSH over MinHash signatures
+    (16 bands of 4 rows, so pairs above roughly 0.5 Jaccard usually share a band) also finds near duplicates: candidates reaching
+    DEDUP_MIN_JACCARD that carry exactly the same fact_tokens (same figures, names, periods), so a template filled with other
+    figures is never taken for a copy. Texts under DEDUP_MIN_TOKENS words have too few shingles for a stable estimate and only
+    match on identical normalised text.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._entries: List[tuple] = []
+        self._exact: Dict[str, int] = {}
+
+    def find(self, text: str, signature: np.ndarray) -> Optional[int]:
+        """
+        Return the key of the first stored entry that is a duplicate of text, or None.
+        Inputs: text, its signature ; Outputs: stored key or None.
+        """
+        normalized = _normalized(text)
+        exact = self._exact.get(normalized)
+        if exact is not None or not settings.DEDUP_NEAR_DUPLICATES or len(normalized.split()) < settings.DEDUP_MIN_TOKENS:
+            return exact
+        facts = fact_tokens(text)
+        seen = set()
+        for band, value in enumerate(_bands(signature)):
+            for pos in self._buckets.get((band, value), ()):
+                if pos in seen:
+                    continue
+                seen.add(pos)
+                key, other, other_facts = self._entries[pos]
+                if other_facts == facts and jaccard_estimate(signature, other) >= settings.DEDUP_MIN_JACCARD:
+                    return key
+        return None
+
+    def add(self, key: int, text: str, signature: np.ndarray) -> None:
+        normalized = _normalized(text)
+        self._exact.setdefault(normalized, key)
+        if not settings.DEDUP_NEAR_DUPLICATES or len(normalized.split()) < settings.DEDUP_MIN_TOKENS:
+            return
+        pos = len(self._entries)
+        self._entries.append((key, signature, fact_tokens(text)))
+        for band, value in enumerate(_bands(signature)):
+            self._buckets.setdefault((band, value), []).append(pos)
+
+
+@dataclass
+class DedupResult:
+    """
+    Canonical chunks (first occurrence of each near-duplicate group, in input order) and, per canonical index, the chunks folded into it.
+    """
+    canonical: List[Document]
+    duplicates: Dict[int, List[Document]] = field(default_factory=dict)
+
+
+def dedup_chunks(chunks: List[Document]) -> DedupResult:
+    """
+    Fold duplicate chunks (boilerplate disclaimers, headers, footers; see MinHashIndex for what counts as a duplicate) into the first
+    occurrence, before embedding; duplicates are returned separately so they can be stored as references.
+    Deterministic: the same chunks in the same order always produce the same canonical set.
+    Inputs: chunks in ingestion order ; Outputs: DedupResult.
+    """
+    index = MinHashIndex()
+    result = DedupResult(canonical=[])
+    for chunk in chunks:
+        text = chunk.page_content or ""
+        signature = minhash(text)
+        canonical_pos = index.find(text, signature)
+        if canonical_pos is not None:
+            result.duplicates.setdefault(canonical_pos, []).append(chunk)
+            continue
+        index.add(len(result.canonical), text, signature)
+        result.canonical.append(chunk)
+    return result
+
+
+def _reference(meta: dict) -> dict:
+    return {k: meta.get(k) for k in ("source", "source_name", "doc_id", "page", "chunk_id")}
+
+
+def collapse_near_duplicates(docs: List[Document]) -> List[Document]:
+    """
+    Drop retrieved chunks that are duplicates (as MinHashIndex defines them) of a better ranked one, so duplicates do not take top-k slots
+    (copies stored before ingest dedup existed, or ingested by separate jobs). A dropped chunk is added, with the references it carried
+    itself, to the kept chunk's metadata['duplicates'], the same list ingest folding stores, so citations still name every copy.
+    Inputs: docs in rank order ; Outputs: docs in the same order without near duplicates.
+    """
+    index = MinHashIndex()
+    kept: List[Document] = []
+    for d in docs:
+        text = d.page_content or ""
+        signature = minhash(text)
+        pos = index.find(text, signature)
+        if pos is not None:
+            target = kept[pos]
+            meta = d.metadata or {}
+            refs = list((target.metadata or {}).get("duplicates") or []) + [_reference(meta)] + list(meta.get("duplicates") or [])
+            target.metadata = {**(target.metadata or {}), "duplicates": refs}
+            continue
+        index.add(len(kept), text, signature)
+        kept.append(d)
+    return kept
@@ -4,15 +4,20 @@ import hashlib
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 from langchain_core.documents import Document
 from qdrant_client import models
 
+from src.app.core.admission import limit
 from src.app.core.config import settings
-from src.rag.vectorstore.qdrant_client import get_qdrant_client, ensure_collection
-from src.rag.ingestion.loaders import load_any
+from src.app.core.metrics import QDRANT_LATENCY, timed
+from src.app.core.profiling import profiled
+from src.rag.vectorstore.qdrant_client import bump_collection_generation, get_qdrant_client, ensure_collection
+from src.rag.ingestion.loaders import iter_pdf_pages, load_any
 from src.rag.ingestion.chunking import chunk_documents
+from src.rag.ingestion.dedup import dedup_chunks
+from src.rag.llm.context_builder import count_tokens, tokenizer_name
 from src.rag.llm.models import get_embedding_model
 
 
@@ -22,6 +27,7 @@ class IngestionResult:
     documents_loaded: int
     chunks_indexed: int
     points_upserted: int
+    duplicates_folded: int = 0
 
 _CHUNK_UID_NAMESPACE = uuid.UUID("2b1c9b44-8bfe-4b18-9a3f-5db2b9de6e8a")
 
@@ -29,17 +35,80 @@ def _sha1(text: str) -> str:
     return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
 
+def _doc_id(meta: dict) -> str:
+    return str(meta.get("doc_id") or _sha1(str(meta.get("source", "unknown"))))
+
+
+def chunk_point_id(doc_id: str, page, start_index, chunk_id=None) -> str:
+    """
+    Qdrant point id (and chunk_uid) of a chunk: uuid5 of the document id, page and character offset in the page, so the same chunk gets
+    the same id whatever else is ingested with it. Chunks without an offset fall back to their per-page chunk_id.
+    Inputs: doc_id, page, start_index, chunk_id ; Outputs: UUID string.
+    """
+    offset = start_index if start_index is not None else f"chunk:{chunk_id}"
+    return str(uuid.uuid5(_CHUNK_UID_NAMESPACE, f"{doc_id}|{page}|{offset}"))
+
+
+def _duplicate_ref(chunk: Document) -> dict:
+    """
+    Reference to a near-duplicate chunk folded into a canonical point, so citations can still name every copy.
+    Inputs: chunk ; Outputs: dict with source, source_name, doc_id, page and chunk_id.
+    """
+    meta = chunk.metadata or {}
+    source = str(meta.get("source", "unknown"))
+    return {
+        "source": source,
+        "source_name": meta.get("source_name") or (Path(source).name if source != "unknown" else "unknown"),
+        "doc_id": _doc_id(meta),
+        "page": meta.get("page", meta.get("section", None)),
+        "chunk_id": meta.get("chunk_id", None),
+    }
+
+
+def _page_batches(path) -> Iterator[List[Document]]:
+    """
+    Loaded documents of one file, in the batches they are chunked in: PDFs page by page as the extractor yields them (chunking overlaps
+    with the extraction of later pages), other formats in one batch.
+    Inputs: path ; Outputs: iterator of document lists.
+    """
+    if Path(path).suffix.lower() == ".pdf":
+        for page in iter_pdf_pages(path):
+            yield [page]
+    else:
+        yield load_any(path)
+
+
 def _embed_chunks(chunks: List[Document]) -> List[List[float]]:
+    """
+    Embed chunks in batches of EMBEDDING_BATCH_SIZE, so an ingestion job only holds an embedding slot briefly and queued chat queries interleave.
+    Inputs: chunks ; Outputs: vectors aligned with chunks.
+    """
     embedder = get_embedding_model()
     texts = [c.page_content for c in chunks]
-    return embedder.embed_documents(texts)
+    size = max(settings.EMBEDDING_BATCH_SIZE, 1)
+    vectors: List[List[float]] = []
+    for i in range(0, len(texts), size):
+        vectors.extend(embedder.embed_documents(texts[i : i + size]))
+    return vectors
 
 
 def index_documents(paths: Iterable[str]) -> IngestionResult:
     """
     End-to-end ingestion entrypoint: load documents from paths, chunk them, embed chunks, ensure the Qdrant collection exists, and upsert deterministic chunk points.
+    Point ids come from chunk_point_id (document, page, offset), so re-ingesting a file overwrites its points in place.
+    With DEDUP_ENABLED, duplicate chunks (identical normalised text; near duplicates with the same figures under DEDUP_NEAR_DUPLICATES) are not embedded nor stored: they are listed as references
+    in the 'duplicates' payload field of the first occurrence's point, and citations of that point name them. The references live only
+    in that payload: re-ingesting the canonical file on its own rewrites the point without them, and the copies (never stored) are lost
+    until their files are ingested again, so files sharing content should be re-ingested together.
+    Each payload caches the chunk's token count so prompt packing does not re-tokenise retrieved passages.
+    The whole job runs under the profiler hook, so an admin session armed with trigger="ingest" captures it end to end.
     Inputs: paths to ingest; Outputs: IngestionResult containing counts and the list of indexed file paths.
     """
+    with profiled("ingest"):
+        return _index_documents(paths)
+
+
+def _index_documents(paths: Iterable[str]) -> IngestionResult:
     client = get_qdrant_client()
 
     indexed_files: List[str] = []
@@ -47,12 +116,10 @@ def index_documents(paths: Iterable[str]) -> IngestionResult:
     all_chunks: List[Document] = []
 
     for path in paths:
-        docs = load_any(path)
         indexed_files.append(str(path))
-        documents_loaded += len(docs)
-
-        chunks = chunk_documents(docs)
-        all_chunks.extend(chunks)
+        for docs in _page_batches(path):
+            documents_loaded += len(docs)
+            all_chunks.extend(chunk_documents(docs))
 
     if not all_chunks:
         return IngestionResult(
@@ -62,7 +129,13 @@ def index_documents(paths: Iterable[str]) -> IngestionResult:
             points_upserted=0,
         )
 
-    vectors = _embed_chunks(all_chunks)
+    if settings.DEDUP_ENABLED:
+        dedup = dedup_chunks(all_chunks)
+        canonical_chunks, duplicates = dedup.canonical, dedup.duplicates
+    else:
+        canonical_chunks, duplicates = all_chunks, {}
+
+    vectors = _embed_chunks(canonical_chunks)
 
     dim = len(vectors[0]) if vectors else None
     if dim and dim != settings.QDRANT_VECTOR_DIM:
@@ -73,19 +146,17 @@ def index_documents(paths: Iterable[str]) -> IngestionResult:
 
     ensure_collection()
 
+    encoding = tokenizer_name()
     points: List[models.PointStruct] = []
-    for doc, vec in zip(all_chunks, vectors):
+    for pos, (doc, vec) in enumerate(zip(canonical_chunks, vectors)):
         meta = doc.metadata or {}
 
         source = str(meta.get("source", "unknown"))
         page = meta.get("page", meta.get("section", None))
         chunk_id = meta.get("chunk_id", None)
 
-        doc_id = str(meta.get("doc_id") or _sha1(source))
-
-        content_prefix = (doc.page_content or "")[:120]
-        stable_key = f"{doc_id}|{page}|{chunk_id}|{content_prefix}"
-        chunk_uuid = str(uuid.uuid5(_CHUNK_UID_NAMESPACE, stable_key))
+        doc_id = _doc_id(meta)
+        chunk_uuid = chunk_point_id(doc_id, page, meta.get("start_index"), chunk_id)
 
         meta.setdefault("source", source)
         meta.setdefault("source_name", Path(source).name if source != "unknown" else "unknown")
@@ -95,6 +166,10 @@ def index_documents(paths: Iterable[str]) -> IngestionResult:
         meta.setdefault("chunk_id", chunk_id)
         meta.setdefault("page", page)
         meta.setdefault("type", meta.get("type", "unknown"))
+        meta["token_count"] = count_tokens(doc.page_content or "")
+        meta["token_encoding"] = encoding
+        if pos in duplicates:
+            meta["duplicates"] = [_duplicate_ref(d) for d in duplicates[pos]]
 
         points.append(
             models.PointStruct(
@@ -107,15 +182,18 @@ def index_documents(paths: Iterable[str]) -> IngestionResult:
             )
         )
 
-    client.upsert(
-        collection_name=settings.QDRANT_COLLECTION_NAME,
-        points=points,
-        wait=True,
-    )
+    with limit("qdrant"), timed(QDRANT_LATENCY, "qdrant.upsert", op="upsert"):
+        client.upsert(
+            collection_name=settings.QDRANT_COLLECTION_NAME,
+            points=points,
+            wait=True,
+        )
+    bump_collection_generation(settings.QDRANT_COLLECTION_NAME)
 
     return IngestionResult(
         indexed_files=indexed_files,
         documents_loaded=documents_loaded,
         chunks_indexed=len(all_chunks),
         points_upserted=len(points),
+        duplicates_folded=len(all_chunks) - len(canonical_chunks),
     )
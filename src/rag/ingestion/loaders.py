@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader
+
+from src.app.core.config import settings
+from src.rag.ingestion.pdf_backends import iter_page_texts
 
 
 def load_txt(path: str | Path) -> List[Document]:
@@ -27,22 +30,39 @@ def load_txt(path: str | Path) -> List[Document]:
     ]
 
 
-def load_pdf(path: str | Path) -> List[Document]:
+def iter_pdf_pages(path: str | Path) -> Iterator[Document]:
     """
-    Load a PDF into per-page LangChain Document objects and normalise metadata fields needed later for retrieval and citations.
-    Inputs: path to file ; Outputs: a list[Document] (one per page) with metadata.
+    Lazily extract a PDF page by page with the PDF_BACKEND extractor ("pypdf", "pypdfium2" or "pdfminer"); PDFs of PDF_PARALLEL_MIN_PAGES
+    pages or more are extracted by PDF_WORKERS processes (capped at the CPU count), PDF_PAGES_PER_TASK pages per task, while earlier
+    pages are already yielded.
+    Inputs: path to file ; Outputs: iterator of Documents (one per page, 0-based 'page' as PyPDFLoader numbered them) with metadata.
     """
     p = Path(path)
-    loader = PyPDFLoader(str(p))
-    docs = loader.load()
+    pages = iter_page_texts(
+        str(p),
+        settings.PDF_BACKEND,
+        workers=min(settings.PDF_WORKERS, os.cpu_count() or 1),
+        min_parallel_pages=settings.PDF_PARALLEL_MIN_PAGES,
+        pages_per_task=settings.PDF_PAGES_PER_TASK,
+    )
+    for page, text in pages:
+        yield Document(
+            page_content=text,
+            metadata={
+                "source": str(p),
+                "source_name": p.name,
+                "page": page,
+                "type": "pdf",
+            },
+        )
 
-    for i, d in enumerate(docs):
-        d.metadata.setdefault("source", str(p))
-        d.metadata.setdefault("source_name", p.name)
-        d.metadata.setdefault("page", d.metadata.get("page", i + 1))
-        d.metadata.setdefault("type", "pdf")
 
-    return docs
+def load_pdf(path: str | Path) -> List[Document]:
+    """
+    Load a PDF into per-page LangChain Document objects and normalise metadata fields needed later for retrieval and citations.
+    Inputs: path to file ; Outputs: a list[Document] (one per page) with metadata.
+    """
+    return list(iter_pdf_pages(path))
 
 
 def load_any(path: str | Path) -> List[Document]:
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Text extraction backends, by PDF_BACKEND name. Each one is imported lazily inside its functions, so only the selected library
+# has to be installed, and worker processes (which import this module) stay light.
+
+
+def _pypdf_page_count(path: str) -> int:
+    import pypdf
+
+    return len(pypdf.PdfReader(path).pages)
+
+
+def _pypdf_extract(path: str, start: int, end: int) -> Iterator[str]:
+    import pypdf
+
+    pages = pypdf.PdfReader(path).pages
+    for i in range(start, end):
+        yield pages[i].extract_text(extraction_mode="plain")
+
+
+def _pypdfium2_page_count(path: str) -> int:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pypdfium2_extract(path: str, start: int, end: int) -> Iterator[str]:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        for i in range(start, end):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range().replace("\r\n", "\n")
+            textpage.close()
+            page.close()
+            yield text
+    finally:
+        pdf.close()
+
+
+def _pdfminer_page_count(path: str) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    with open(path, "rb") as fp:
+        return sum(1 for _ in PDFPage.create_pages(PDFDocument(PDFParser(fp))))
+
+
+def _pdfminer_extract(path: str, start: int, end: int) -> Iterator[str]:
+    """
+    pdfminer with the box-ordering pass of layout analysis disabled (boxes_flow=None). Layout cannot be turned off entirely
+    (laparams=None): word spaces are only inferred by the layout pass, and without them the text is unusable for retrieval.
+    """
+    from io import StringIO
+
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    manager = PDFResourceManager(caching=True)
+    out = StringIO()
+    device = TextConverter(manager, out, laparams=LAParams(boxes_flow=None))
+    interpreter = PDFPageInterpreter(manager, device)
+    try:
+        with open(path, "rb") as fp:
+            for page in PDFPage.get_pages(fp, pagenos=set(range(start, end))):
+                interpreter.process_page(page)
+                text = out.getvalue()
+                out.seek(0)
+                out.truncate()
+                yield text
+    finally:
+        device.close()
+
+
+@dataclass(frozen=True)
+class PdfBackend:
+    page_count: Callable[[str], int]
+    extract: Callable[[str, int, int], Iterator[str]]
+
+
+PDF_BACKENDS: Dict[str, PdfBackend] = {
+    "pypdf": PdfBackend(_pypdf_page_count, _pypdf_extract),
+    "pypdfium2": PdfBackend(_pypdfium2_page_count, _pypdfium2_extract),
+    "pdfminer": PdfBackend(_pdfminer_page_count, _pdfminer_extract),
+}
+
+
+def get_pdf_backend(name: str) -> PdfBackend:
+    """
+    Look up a PDF text extraction backend by name.
+    Inputs: backend name ; Outputs: PdfBackend; raises ValueError for unknown names.
+    """
+    backend = PDF_BACKENDS.get((name or "").lower())
+    if backend is None:
+        raise ValueError(f"Unknown PDF backend: {name!r} (expected one of {', '.join(PDF_BACKENDS)})")
+    return backend
+
+
+def _extract_range(backend_name: str, path: str, start: int, end: int) -> List[str]:
+    return list(PDF_BACKENDS[backend_name].extract(path, start, end))
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+# Ingestion jobs run on worker threads, so two jobs may create or discard the shared pool at the same time
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool shared by PDF extraction jobs, created on first use. Processes rather than threads because extraction is CPU bound
+    (pure Python for pypdf/pdfminer) and pdfium is not thread safe; "spawn" because the API process runs threads when ingestion starts.
+    Inputs: workers ; Outputs: ProcessPoolExecutor with that many workers (recreated when the size changes).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool whose worker died (e.g. killed while parsing a malformed page), so the next job starts a fresh one.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_page_texts(
+    path: str,
+    backend_name: str,
+    workers: int = 0,
+    min_parallel_pages: int = 0,
+    pages_per_task: int = 8,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the text of each page of a PDF in page order, without holding the whole document's text.
+    PDFs with at least min_parallel_pages pages (and workers > 1) are split into ranges of pages_per_task pages extracted in the process
+    pool; at most two ranges per worker are in flight, so pages are handed to the caller while later ranges are still being parsed.
+    Smaller PDFs are read in this process, one page at a time.
+    Inputs: path, backend name, workers, min_parallel_pages, pages_per_task ; Outputs: iterator of (0-based page number, text).
+    """
+    backend = get_pdf_backend(backend_name)
+    name = backend_name.lower()
+    total = backend.page_count(path)
+
+    if workers <= 1 or total < max(min_parallel_pages, 2):
+        yield from enumerate(backend.extract(path, 0, total))
+        return
+
+    step = max(pages_per_task, 1)
+    ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+    pool = _get_pool(workers)
+    pending: Deque[Tuple[int, "Future[List[str]]"]] = deque()
+    todo = iter(ranges)
+    try:
+        for start, end in todo:
+            pending.append((start, pool.submit(_extract_range, name, path, start, end)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            start, future = pending.popleft()
+            texts = future.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt[0], pool.submit(_extract_range, name, path, *nxt)))
+            yield from enumerate(texts, start)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+from langchain_core.documents import Document
+from langchain_core.messages import BaseMessage
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.app.core.metrics import TOKENIZER_FALLBACKS
+
+logger = get_logger("context_builder")
+
+# Approximate counter used when the tiktoken encoding cannot be loaded (offline images, missing package):
+# one token per punctuation mark, and per started 4 characters of a word, which tracks BPE counts for English text.
+_APPROX_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_APPROX_CHARS_PER_TOKEN = 4
+
+# Role/formatting overhead the chat APIs add around each message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_SUMMARY_MESSAGE_ID = "memory:summary"
+
+
+_encoding: Optional[Any] = None
+_encoding_failed_at: Optional[float] = None
+_encoding_lock = threading.Lock()
+# A failed load is retried after this many seconds rather than on every count (tiktoken downloads the file on first use)
+_ENCODING_RETRY_S = 300.0
+
+
+def _get_encoding() -> Optional[Any]:
+    """
+    Load and cache the tiktoken encoding named by settings.TOKENIZER_ENCODING. Only a loaded encoding is cached: after a failure the
+    approximate counter is used and the load is retried once _ENCODING_RETRY_S has passed. The first failure is logged as a warning and
+    every failed load counts in rag_tokenizer_fallback_total.
+    Inputs: none ; Outputs: a tiktoken Encoding, or None when tiktoken or the encoding file is unavailable.
+    """
+    global _encoding, _encoding_failed_at
+    if _encoding is not None:
+        return _encoding
+    if _encoding_failed_at is not None and time.monotonic() - _encoding_failed_at < _ENCODING_RETRY_S:
+        return None
+    with _encoding_lock:
+        if _encoding is not None:
+            return _encoding
+        if _encoding_failed_at is not None and time.monotonic() - _encoding_failed_at < _ENCODING_RETRY_S:
+            return None
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+        except Exception as exc:
+            log = logger.warning if _encoding_failed_at is None else logger.debug
+            log("tokenizer_unavailable", encoding=settings.TOKENIZER_ENCODING, error=str(exc), fallback="approx")
+            TOKENIZER_FALLBACKS.labels(encoding=settings.TOKENIZER_ENCODING).inc()
+            _encoding_failed_at = time.monotonic()
+            return None
+        _encoding_failed_at = None
+        return _encoding
+
+
+def tokenizer_name() -> str:
+    """
+    Name of the counter in use, stored next to cached token counts so they are only reused when produced by the same tokenizer.
+    Inputs: none ; Outputs: the tiktoken encoding name, or "approx".
+    """
+    return settings.TOKENIZER_ENCODING if _get_encoding() is not None else "approx"
+
+
+def _approx_piece_tokens(piece: str) -> int:
+    return -(-len(piece) // _APPROX_CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text with the local tokenizer (no network, no model call).
+    Inputs: text ; Outputs: token count.
+    """
+    if not text:
+        return 0
+    enc = _get_encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return sum(_approx_piece_tokens(m.group()) for m in _APPROX_PIECE_RE.finditer(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text to at most max_tokens tokens.
+    Inputs: text, max_tokens ; Outputs: the text unchanged if it fits, otherwise its longest prefix within the budget.
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+    enc = _get_encoding()
+    if enc is not None:
+        ids = enc.encode(text, disallowed_special=())
+        return text if len(ids) <= max_tokens else enc.decode(ids[:max_tokens])
+
+    used = 0
+    for m in _APPROX_PIECE_RE.finditer(text):
+        used += _approx_piece_tokens(m.group())
+        if used > max_tokens:
+            return text[: m.start()].rstrip()
+    return text
+
+
+def document_token_count(doc: Document) -> int:
+    """
+    Token count of a chunk, read from the 'token_count' cached in its Qdrant payload at ingest when it was produced by the current tokenizer.
+    Inputs: doc ; Outputs: token count of doc.page_content.
+    """
+    meta = doc.metadata or {}
+    cached = meta.get("token_count")
+    if isinstance(cached, int) and meta.get("token_encoding") == tokenizer_name():
+        return cached
+    return count_tokens(doc.page_content or "")
+
+
+def message_token_count(m: BaseMessage) -> int:
+    content = m.content if isinstance(m.content, str) else str(m.content)
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    summary: Optional[BaseMessage]
+    history: List[BaseMessage]
+    documents: List[Document]
+    context_block: str
+    tokens_used: int
+    truncated_documents: int
+    dropped_documents: int
+
+
+def _default_passage_header(i: int, d: Document) -> str:
+    meta = d.metadata or {}
+    return f"[{i}] source={meta.get('source', 'unknown')} page={meta.get('page', meta.get('section', ''))}"
+
+
+def pack_context(
+    *,
+    fixed_text: Sequence[str],
+    documents: List[Document],
+    history: Sequence[BaseMessage] = (),
+    max_tokens: int,
+    history_max_tokens: int = 0,
+    summary_max_tokens: int = 0,
+    max_passages: int,
+    min_passage_tokens: int,
+    passage_header: Callable[[int, Document], str] = _default_passage_header,
+) -> PackedContext:
+    """
+    Pack prompt parts into a token budget, in priority order:
+    1. fixed text (system prompt, question, instructions) is always kept,
+    2. the memory summary message, cut to summary_max_tokens,
+    3. recent history, newest first, whole messages only, up to history_max_tokens,
+    4. retrieved passages in rank order; the first one that does not fit is cut if at least min_passage_tokens remain, and packing stops there.
+    Passages stay a prefix of `documents`, so the [i] indices in the context block still match positions in state["documents"].
+    Inputs: prompt parts and budgets ; Outputs: PackedContext with the selected summary/history/documents and the formatted context block.
+    """
+    used = sum(count_tokens(t) for t in fixed_text)
+
+    summary: Optional[BaseMessage] = None
+    turns: List[BaseMessage] = []
+    for m in history:
+        if getattr(m, "id", None) == _SUMMARY_MESSAGE_ID:
+            summary = m
+        else:
+            turns.append(m)
+
+    if summary is not None:
+        content = truncate_to_tokens(str(summary.content), summary_max_tokens)
+        if content:
+            summary = summary.model_copy(update={"content": content})
+            used += message_token_count(summary)
+        else:
+            summary = None
+
+    history_budget = min(history_max_tokens, max(max_tokens - used, 0))
+    kept: List[BaseMessage] = []
+    for m in reversed(turns):
+        cost = message_token_count(m)
+        if cost > history_budget:
+            break
+        kept.append(m)
+        history_budget -= cost
+        used += cost
+    kept.reverse()
+
+    blocks: List[str] = []
+    packed_docs: List[Document] = []
+    truncated = 0
+    for i, d in enumerate(documents[:max_passages]):
+        header = passage_header(i, d)
+        header_cost = count_tokens(header) + 1
+        body_cost = document_token_count(d)
+        remaining = max_tokens - used - header_cost
+        if body_cost <= remaining:
+            blocks.append(f"{header}\n{d.page_content or ''}")
+            packed_docs.append(d)
+            used += header_cost + body_cost
+            continue
+        if remaining >= min_passage_tokens:
+            body = truncate_to_tokens(d.page_content or "", remaining)
+            blocks.append(f"{header}\n{body}")
+            packed_docs.append(d)
+            used += header_cost + count_tokens(body)
+            truncated += 1
+        break
+
+    return PackedContext(
+        summary=summary,
+        history=kept,
+        documents=packed_docs,
+        context_block="\n\n".join(blocks),
+        tokens_used=used,
+        truncated_documents=truncated,
+        dropped_documents=len(documents) - len(packed_docs),
+    )
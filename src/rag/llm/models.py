@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List
 
-from openai import OpenAI
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
-from sentence_transformers import SentenceTransformer
 
+from src.app.core.admission import limit
 from src.app.core.config import settings
+from src.app.core.metrics import EMBEDDING_LATENCY, LLM_LATENCY, record_llm_tokens, timed
 from src.rag.llm.ollama_adapter import get_ollama_llm  
 
 class OpenAIChatWrapper(BaseChatModel):
@@ -16,6 +17,8 @@ class OpenAIChatWrapper(BaseChatModel):
     """
 
     def __init__(self, model_name: str, api_key: str | None):
+        from openai import OpenAI  # deferred: keeps the SDK out of application import time
+
         super().__init__()
         self._client = OpenAI(api_key=api_key)
         self.model_name = model_name
@@ -27,7 +30,7 @@ class OpenAIChatWrapper(BaseChatModel):
     def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs):
         """
         Convert LangChain messages into OpenAI chat completions format and request a completion, returning a LangChain LLMResult.
-        Inputs: messages, stop/run_manager, kwargs (such as temperature); Outputs: LLMResult containing the generated assistant text.
+        Inputs: messages, stop/run_manager, kwargs (such as temperature, or json_mode to request a JSON object response); Outputs: LLMResult containing the generated assistant text.
         """
         prompt = []
         for m in messages:
@@ -38,11 +41,20 @@ class OpenAIChatWrapper(BaseChatModel):
                 role = "assistant"
             prompt.append({"role": role, "content": m.content})
 
-        resp = self._client.chat.completions.create(
-            model=self.model_name,
-            messages=prompt,
-            temperature=kwargs.get("temperature", 0.1),
-        )
+        request_kwargs = {}
+        if kwargs.get("json_mode"):
+            request_kwargs["response_format"] = {"type": "json_object"}
+
+        with limit("llm"), timed(LLM_LATENCY, "llm.openai", provider="openai"):
+            resp = self._client.chat.completions.create(
+                model=self.model_name,
+                messages=prompt,
+                temperature=kwargs.get("temperature", 0.1),
+                **request_kwargs,
+            )
+        usage = getattr(resp, "usage", None)
+        if usage is not None:
+            record_llm_tokens("openai", usage.prompt_tokens, usage.completion_tokens)
 
         content = resp.choices[0].message.content or ""
 
@@ -59,7 +71,12 @@ class OpenAIChatWrapper(BaseChatModel):
         return type("Resp", (), {"content": result.generations[0][0].text})
 
 
+@lru_cache(maxsize=1)
 def _get_openai_llm() -> BaseChatModel:
+    """
+    Create and cache the OpenAI chat wrapper, so every call reuses one client and its HTTP connection pool.
+    Inputs: none; Outputs: an OpenAIChatWrapper instance.
+    """
     return OpenAIChatWrapper(
         model_name=settings.OPENAI_MODEL_NAME,
         api_key=settings.OPENAI_API_KEY,
@@ -91,6 +108,8 @@ class BGEEmbeddingModel:
     """
 
     def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer  # deferred: imports torch/transformers (seconds)
+
         self._model = SentenceTransformer(model_name)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
@@ -98,11 +117,17 @@ class BGEEmbeddingModel:
         Embed a batch of texts into normalised dense vectors for ingestion and retrieval.
         Inputs: texts input strings; Outputs: list[list[float]] embeddings aligned with the input order.
         """
-        return self._model.encode(
-            texts,
-            normalize_embeddings=True,
-            convert_to_numpy=False,
-        )
-
+        with limit("embedding"), timed(EMBEDDING_LATENCY, "embedding"):
+            return self._model.encode(
+                texts,
+                normalize_embeddings=True,
+                convert_to_numpy=False,
+            )
+
+@lru_cache(maxsize=1)
 def get_embedding_model() -> BGEEmbeddingModel:
+    """
+    Load and cache the embedding model; the first call downloads/loads the weights, so the API warms it up at startup.
+    Inputs: none; Outputs: a BGEEmbeddingModel instance shared by ingestion and retrieval.
+    """
     return BGEEmbeddingModel(model_name=settings.EMBEDDING_MODEL_NAME)
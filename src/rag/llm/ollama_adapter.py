@@ -8,7 +8,9 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import Generation, LLMResult
 
+from src.app.core.admission import limit
 from src.app.core.config import settings
+from src.app.core.metrics import LLM_LATENCY, record_llm_tokens, timed
 
 
 class OllamaChatModel(BaseChatModel):
@@ -42,7 +44,7 @@ class OllamaChatModel(BaseChatModel):
     ) -> LLMResult:
         """
         Convert LangChain chat messages into a plain text prompt and call the Ollama compatible /generate endpoint to obtain a completion.
-        Inputs: messages, stop, kwargs (such as temperature); Outputs: an LLMResult containing a single generated assistant text.
+        Inputs: messages, stop, kwargs (such as temperature, or json_mode to constrain the output to JSON); Outputs: an LLMResult containing a single generated assistant text.
         """
         lines: List[str] = []
         for m in messages:
@@ -60,10 +62,14 @@ class OllamaChatModel(BaseChatModel):
             "prompt": prompt,
             "stream": False,
         }
-
-        resp = requests.post(url, headers=headers, json=payload, timeout=120)
-        resp.raise_for_status()
-        data = resp.json()
+        if kwargs.get("json_mode"):
+            payload["format"] = "json"
+
+        with limit("llm"), timed(LLM_LATENCY, "llm.ollama", provider="ollama"):
+            resp = requests.post(url, headers=headers, json=payload, timeout=120)
+            resp.raise_for_status()
+            data = resp.json()
+        record_llm_tokens("ollama", data.get("prompt_eval_count"), data.get("eval_count"))
 
         content = data.get("response", "") or ""
 
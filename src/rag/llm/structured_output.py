@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+
+def extract_json(text: str) -> str:
+    """
+    Normalize an LLM response into raw JSON by stripping optional triple backtick code fences etc...
+    Inputs: model output that may include ``` fences; Outputs: a string expected to be valid JSON.
+    """
+    s = (text or "").strip()
+    if s.startswith("```"):
+        s = re.sub(r"^```[a-zA-Z]*\n", "", s)
+        s = re.sub(r"\n```$", "", s).strip()
+    return s
+
+
+def try_parse_json(resp_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Try to parse a model response as a JSON object, returning None if parsing fails to enable retry/refusal behavior upstream.
+    Inputs: raw model output; Outputs: a parsed dict on success, otherwise None.
+    """
+    try:
+        parsed = json.loads(extract_json(resp_text))
+    except Exception:
+        return None
+    return parsed if isinstance(parsed, dict) else None
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, TypeVar
+
+import redis.asyncio as aioredis
+from langchain_core.messages import BaseMessage
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.app.core.metrics import REDIS_LATENCY, observe
+from src.rag.memory.circuit_breaker import CircuitBreaker
+from src.rag.memory.codec import decode_messages
+from src.rag.memory.redis_memory import (
+    _APPEND_AND_TRIM_LUA,
+    UNAVAILABLE,
+    MemoryBundle,
+    _as_text,
+    _encode,
+    _legacy_key,
+    _log_key,
+    _log_lines_key,
+    _messages_key,
+    _summary_key,
+    _summary_line,
+)
+
+T = TypeVar("T")
+
+logger = get_logger("memory")
+
+# Returned by AsyncRedisMemoryStore._call when the operation timed out, failed or was skipped by the open circuit
+FAILED: Any = object()
+
+
+@dataclass
+class MemoryStoreStats:
+    """
+    Counters for memory operations, readable without touching Redis (e.g. from health/metrics endpoints).
+    """
+    calls: Dict[str, int] = field(default_factory=dict)
+    failures: Dict[str, int] = field(default_factory=dict)
+    timeouts: Dict[str, int] = field(default_factory=dict)
+    skipped: Dict[str, int] = field(default_factory=dict)
+    latency_total_s: Dict[str, float] = field(default_factory=dict)
+    latency_max_s: Dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _bump(self, counter: Dict[str, Any], op: str, value: Any = 1) -> None:
+        with self._lock:
+            counter[op] = counter.get(op, 0) + value
+
+    def record(self, op: str, elapsed_s: float, *, ok: bool, timed_out: bool = False) -> None:
+        self._bump(self.calls, op)
+        self._bump(self.latency_total_s, op, elapsed_s)
+        with self._lock:
+            self.latency_max_s[op] = max(self.latency_max_s.get(op, 0.0), elapsed_s)
+        if not ok:
+            self._bump(self.failures, op)
+        if timed_out:
+            self._bump(self.timeouts, op)
+
+    def record_skipped(self, op: str) -> None:
+        self._bump(self.skipped, op)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "failures": dict(self.failures),
+                "timeouts": dict(self.timeouts),
+                "skipped": dict(self.skipped),
+                "latency_total_s": dict(self.latency_total_s),
+                "latency_max_s": dict(self.latency_max_s),
+            }
+
+
+def _build_async_client() -> aioredis.Redis:
+    """
+    Build a redis.asyncio client on an explicitly sized blocking pool: when all connections are busy, callers wait at most REDIS_POOL_TIMEOUT_SECONDS.
+    Inputs: none ; Outputs: a redis.asyncio.Redis client.
+    """
+    pool = aioredis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_OP_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_OP_TIMEOUT_SECONDS,
+        decode_responses=False,
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+class AsyncRedisMemoryStore:
+    """
+    asyncio memory backend (redis.asyncio) with the same key layouts and codec as the sync stores.
+    Every call has a per-call timeout and goes through a circuit breaker: while Redis is unhealthy memory is skipped
+    (UNAVAILABLE load, no-op save) instead of making each turn wait for socket timeouts. Failures are logged and counted in `stats`.
+    """
+
+    def __init__(
+        self,
+        client: aioredis.Redis | None = None,
+        *,
+        layout: str | None = None,
+        breaker: CircuitBreaker | None = None,
+        op_timeout_s: float | None = None,
+    ):
+        self._client = client
+        self.layout = (layout or settings.MEMORY_STORAGE_LAYOUT or "blob").lower()
+        self.append_only = self.layout == "list"
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.REDIS_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout_s=settings.REDIS_CIRCUIT_RESET_SECONDS,
+        )
+        self.op_timeout_s = op_timeout_s if op_timeout_s is not None else settings.REDIS_OP_TIMEOUT_SECONDS
+        self.stats = MemoryStoreStats()
+
+    def _redis(self) -> aioredis.Redis:
+        if self._client is None:
+            self._client = _build_async_client()
+        return self._client
+
+    async def _call(self, op: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run one Redis operation under the circuit breaker and the per-call timeout, recording latency and failures.
+        A cancelled call is re-raised after releasing the breaker's half-open trial.
+        Inputs: op name, fn returning the awaitable ; Outputs: the operation result, or FAILED when it timed out, failed or was skipped.
+        """
+        if not self.breaker.allow():
+            self.stats.record_skipped(op)
+            return FAILED
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(fn(), timeout=self.op_timeout_s)
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - start
+            self.stats.record(op, elapsed, ok=False, timed_out=True)
+            observe(REDIS_LATENCY, f"redis.{op}", elapsed, backend="async", op=op)
+            self.breaker.record_failure()
+            logger.warning("memory_redis_timeout", op=op, timeout_s=self.op_timeout_s, circuit=self.breaker.state)
+            return FAILED
+        except Exception as exc:
+            elapsed = time.perf_counter() - start
+            self.stats.record(op, elapsed, ok=False)
+            observe(REDIS_LATENCY, f"redis.{op}", elapsed, backend="async", op=op)
+            self.breaker.record_failure()
+            logger.warning("memory_redis_failed", op=op, error=str(exc), circuit=self.breaker.state)
+            return FAILED
+        except BaseException:
+            # Cancelled (client disconnected, turn abandoned): says nothing about Redis, but a half-open trial must not stay claimed
+            self.breaker.release_trial()
+            raise
+
+        elapsed = time.perf_counter() - start
+        self.stats.record(op, elapsed, ok=True)
+        observe(REDIS_LATENCY, f"redis.{op}", elapsed, backend="async", op=op)
+        self.breaker.record_success()
+        return result
+
+    async def ping(self) -> bool:
+        """
+        Open a pooled connection and check that Redis answers (startup warmup and readiness).
+        Inputs: none ; Outputs: True when Redis replied, False when it failed or the circuit is open.
+        """
+        result = await self._call("ping", lambda: self._redis().ping())
+        return result is not FAILED and bool(result)
+
+    async def load(self, session_id: str) -> MemoryBundle:
+        """
+        Load the memory bundle in one pipelined round-trip (blob or list layout, with legacy fallback).
+        Inputs: session_id ; Outputs: MemoryBundle (UNAVAILABLE when the read timed out, failed or the circuit is open).
+        """
+        async def _load() -> Tuple[MemoryBundle, bool]:
+            pipe = self._redis().pipeline(transaction=False)
+            pipe.get(_summary_key(session_id))
+            if self.append_only:
+                pipe.lrange(_log_key(session_id), -settings.MEMORY_MAX_MESSAGES, -1)
+            pipe.get(_messages_key(session_id))
+            pipe.get(_legacy_key(session_id))
+            results = await pipe.execute()
+
+            summary = _as_text(results[0])
+            if self.append_only and results[1]:
+                messages = [m for e in results[1] for m in decode_messages(e)]
+                return MemoryBundle(summary=summary, messages=messages), False
+            messages = decode_messages(results[-2] or results[-1])
+            return MemoryBundle(summary=summary, messages=messages), self.append_only and bool(messages)
+
+        result = await self._call("load", _load)
+        if result is FAILED:
+            return UNAVAILABLE
+        bundle, needs_seed = result
+        if needs_seed:
+            await self._seed_log(session_id, bundle.messages)
+        return bundle
+
+    async def _seed_log(self, session_id: str, messages: List[BaseMessage]) -> None:
+        """
+        One-off migration of a blob/legacy session into the list layout, so later turns only need to append.
+        Each migrated message gets its summary line, so it still reaches the rolling summary when it overflows the window.
+        Inputs: session_id, messages ; Outputs: None.
+        """
+        async def _seed() -> None:
+            pipe = self._redis().pipeline(transaction=True)
+            pipe.rpush(_log_key(session_id), *[_encode([m]) for m in messages])
+            pipe.rpush(_log_lines_key(session_id), *[_summary_line(m) for m in messages])
+            pipe.expire(_log_key(session_id), settings.REDIS_TTL_SECONDS)
+            pipe.expire(_log_lines_key(session_id), settings.REDIS_TTL_SECONDS)
+            await pipe.execute()
+
+        await self._call("seed_log", _seed)
+
+    async def save(
+        self,
+        session_id: str,
+        *,
+        summary: str,
+        messages: List[BaseMessage],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """
+        Persist the blob layout bundle in one MULTI/EXEC transaction.
+        Inputs: session_id, summary, messages, ttl_seconds ; Outputs: None.
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else settings.REDIS_TTL_SECONDS
+
+        async def _save() -> None:
+            pipe = self._redis().pipeline(transaction=True)
+            pipe.set(_summary_key(session_id), summary, ex=ttl)
+            pipe.set(_messages_key(session_id), _encode(messages), ex=ttl)
+            await pipe.execute()
+
+        await self._call("save", _save)
+
+    async def append(
+        self,
+        session_id: str,
+        *,
+        messages: List[BaseMessage],
+        summary_lines: List[str],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """
+        Append the turn's new messages to the list layout with the same atomic Lua script as the sync store.
+        Inputs: session_id, messages, summary_lines, ttl_seconds ; Outputs: None.
+        """
+        if not messages:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else settings.REDIS_TTL_SECONDS
+
+        async def _append() -> None:
+            script = self._redis().register_script(_APPEND_AND_TRIM_LUA)
+            await script(
+                keys=[_log_key(session_id), _log_lines_key(session_id), _summary_key(session_id)],
+                args=[
+                    settings.MEMORY_MAX_MESSAGES,
+                    settings.MEMORY_SUMMARY_MAX_CHARS,
+                    ttl,
+                    len(messages),
+                    *[_encode([m]) for m in messages],
+                    *summary_lines,
+                ],
+            )
+
+        await self._call("append", _append)
+
+
+_async_memory_store: AsyncRedisMemoryStore | None = None
+
+
+def get_async_memory_store() -> AsyncRedisMemoryStore:
+    """
+    Create and cache the asyncio memory store used by the async memory nodes.
+    Inputs: none; Outputs: an AsyncRedisMemoryStore instance.
+    """
+    global _async_memory_store
+    if _async_memory_store is None:
+        _async_memory_store = AsyncRedisMemoryStore()
+    return _async_memory_store
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from typing import Any, List, Sequence
+
+import msgpack
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    message_to_dict,
+    messages_from_dict,
+    messages_to_dict,
+)
+
+try:
+    import zstandard
+except ImportError:  # optional: compression is skipped when zstandard is not installed
+    zstandard = None
+
+# Versioned header of the compact format: magic, format version, flags. Legacy JSON values never start with a NUL byte.
+MAGIC = b"\x00RM"
+VERSION = 1
+FLAG_ZSTD = 0x01
+_HEADER_LEN = len(MAGIC) + 2
+
+# Minimal schema: [type_code, content] or [type_code, content, name]; anything else is kept as a LangChain dict under _RAW.
+_HUMAN, _AI, _SYSTEM, _RAW = 0, 1, 2, 255
+_TYPE_CODES = {HumanMessage: _HUMAN, AIMessage: _AI, SystemMessage: _SYSTEM}
+_CODE_TYPES = {code: cls for cls, code in _TYPE_CODES.items()}
+
+
+def _pack_message(m: BaseMessage) -> List[Any]:
+    """
+    Convert a message into the minimal msgpack schema, dropping empty LangChain envelope fields.
+    Inputs: m ; Outputs: a small list ready for msgpack.
+    """
+    code = _TYPE_CODES.get(type(m))
+    if code is None or not isinstance(m.content, str) or m.additional_kwargs or m.response_metadata:
+        return [_RAW, message_to_dict(m)]
+    name = getattr(m, "name", None)
+    return [code, m.content, name] if name else [code, m.content]
+
+
+def _unpack_message(item: Sequence[Any]) -> BaseMessage:
+    """
+    Rebuild a LangChain message from its minimal msgpack schema.
+    Inputs: item ; Outputs: BaseMessage.
+    """
+    code = item[0]
+    if code == _RAW:
+        return messages_from_dict([item[1]])[0]
+    cls = _CODE_TYPES[code]
+    if len(item) > 2 and item[2]:
+        return cls(content=item[1], name=item[2])
+    return cls(content=item[1])
+
+
+def encode_messages(
+    messages: List[BaseMessage],
+    *,
+    codec: str = "msgpack",
+    compress_min_bytes: int = 1024,
+) -> bytes | str:
+    """
+    Serialise messages for Redis: legacy LangChain JSON for codec="json", otherwise header + msgpack, zstd compressed above compress_min_bytes.
+    Inputs: messages, codec ("json" | "msgpack"), compress_min_bytes (0 disables compression) ; Outputs: str for json, bytes for msgpack.
+    """
+    if codec == "json":
+        return json.dumps(messages_to_dict(messages))
+
+    body = msgpack.packb([_pack_message(m) for m in messages], use_bin_type=True)
+    flags = 0
+    if zstandard is not None and compress_min_bytes and len(body) >= compress_min_bytes:
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+        flags |= FLAG_ZSTD
+    return MAGIC + bytes((VERSION, flags)) + body
+
+
+def decode_messages(raw: bytes | str | None) -> List[BaseMessage]:
+    """
+    Deserialise a stored value written by any memory format: compact msgpack (any supported version/flags) or the legacy LangChain JSON used by chat:{id} and chat:{id}:messages.
+    Inputs: raw value as returned by Redis ; Outputs: list[BaseMessage] (empty for None/empty values).
+    """
+    if not raw:
+        return []
+
+    if isinstance(raw, bytes) and raw.startswith(MAGIC):
+        version, flags = raw[len(MAGIC)], raw[len(MAGIC) + 1]
+        if version != VERSION:
+            raise ValueError(f"Unsupported memory format version: {version}")
+        body = raw[_HEADER_LEN:]
+        if flags & FLAG_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read compressed memory")
+            body = zstandard.ZstdDecompressor().decompress(body)
+        return [_unpack_message(item) for item in msgpack.unpackb(body, raw=False)]
+
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        data = [data]
+    return messages_from_dict(data)
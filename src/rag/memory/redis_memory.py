@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
+from dataclasses import dataclass
 from typing import List, Tuple
 
 import redis
-from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
 from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.app.core.metrics import REDIS_LATENCY, timed
+from src.rag.memory.codec import decode_messages, encode_messages
+
+logger = get_logger("memory")
 
 _redis_client: redis.Redis | None = None
 
@@ -14,14 +19,59 @@ _redis_client: redis.Redis | None = None
 def _get_redis_client() -> redis.Redis:
     """
     Create and cache a Redis client using settings.REDIS_URL so memory operations share a single connection pool.
+    Responses are raw bytes because the compact memory codec is binary.
     Inputs: none; Outputs: a redis.Redis client instance.
     """
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
     return _redis_client
 
 
+def _as_text(value: bytes | str | None) -> str:
+    """
+    Decode a Redis string value that may come back as bytes or str depending on the client. Invalid UTF-8 is replaced rather than
+    raised, so one bad byte in a summary cannot make every later load of the session fail.
+    Inputs: value ; Outputs: str ("" for None).
+    """
+    if value is None:
+        return ""
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
+
+
+def _encode(messages: List[BaseMessage]) -> bytes | str:
+    """
+    Serialise messages with the configured memory codec.
+    Inputs: messages ; Outputs: value to store in Redis.
+    """
+    return encode_messages(
+        messages,
+        codec=(settings.MEMORY_CODEC or "json").lower(),
+        compress_min_bytes=settings.MEMORY_COMPRESSION_MIN_BYTES,
+    )
+
+
+def _truncate(s: str, max_chars: int) -> str:
+    """
+    Truncate a string to a maximum character length for safe storage in Redis summaries and debug friendly logs.
+    Inputs: s (str) raw text and max_chars (int); Outputs: a stripped string truncated to max_chars.
+    """
+    s = (s or "").strip()
+    return s if len(s) <= max_chars else s[: max_chars - 3] + "..."
+
+
+def _summary_line(m: BaseMessage) -> str:
+    """
+    Render the bullet line a message contributes to the rolling summary once it leaves the retention window.
+    Inputs: m ; Outputs: "- User: ..." / "- Assistant: ..." line, or "" for messages that are not summarised.
+    """
+    if isinstance(m, HumanMessage):
+        return f"- User: {_truncate(m.content, 200)}"
+    if isinstance(m, AIMessage):
+        return f"- Assistant: {_truncate(m.content, 200)}"
+    return ""
+
+
 def _messages_key(session_id: str) -> str:
     """
     Build the Redis key used to store the serialised recent message window for a given chat session.
@@ -38,30 +88,259 @@ def _summary_key(session_id: str) -> str:
     return f"chat:{session_id}:summary"
 
 
-def load_memory_bundle_from_redis(session_id: str) -> Tuple[str, List[BaseMessage]]:
+def _legacy_key(session_id: str) -> str:
     """
-    Load the conversation memory bundle for a session from Redis, with backward compatible fallback to a legacy single key format.
-    Inputs: session_id ; Outputs: (summary (str), recent_messages (list[BaseMessage])).
+    Build the legacy single key that stored the whole message list before summary/messages were split.
+    Inputs: session_id ; Outputs: a Redis key string.
+    """
+    return f"chat:{session_id}"
+
+
+@dataclass(frozen=True)
+class MemoryBundle:
+    """
+    A session's rolling summary and recent message window. loaded=False marks a failed read (Redis or decoding error), which callers
+    must not confuse with an empty session: writing memory back after it would overwrite the stored history with this turn only.
+    """
+    summary: str
+    messages: List[BaseMessage]
+    loaded: bool = True
+
+
+UNAVAILABLE = MemoryBundle(summary="", messages=[], loaded=False)
+
+
+class RedisMemoryStore:
+    """
+    Conversation memory persistence with one Redis round-trip per operation:
+    - load: a single pipelined read of the summary, messages and legacy keys,
+    - save: a single MULTI/EXEC transaction writing summary and messages with their TTL.
     """
-    try:
-        client = _get_redis_client()
 
-        summary = client.get(_summary_key(session_id)) or ""
+    append_only = False
+
+    def ping(self) -> bool:
+        """
+        Open a connection and check that Redis answers (startup warmup and readiness).
+        Inputs: none ; Outputs: True when Redis replied, False on any failure.
+        """
+        try:
+            return bool(_get_redis_client().ping())
+        except Exception as exc:
+            logger.warning("memory_redis_failed", op="ping", error=str(exc))
+            return False
+
+    def load(self, session_id: str) -> MemoryBundle:
+        """
+        Load the conversation memory bundle for a session, with backward compatible fallback to the legacy single key format.
+        Inputs: session_id ; Outputs: MemoryBundle (UNAVAILABLE on any Redis/decoding failure).
+        """
+        try:
+            pipe = _get_redis_client().pipeline(transaction=False)
+            pipe.get(_summary_key(session_id))
+            pipe.get(_messages_key(session_id))
+            pipe.get(_legacy_key(session_id))
+            with timed(REDIS_LATENCY, "redis.load", backend="sync", op="load"):
+                summary, raw_messages, legacy_raw = pipe.execute()
 
-        raw_messages = client.get(_messages_key(session_id))
-        if raw_messages:
-            data = json.loads(raw_messages)
-            return summary, messages_from_dict(data)
+            raw = raw_messages or legacy_raw
+            return MemoryBundle(summary=_as_text(summary), messages=decode_messages(raw))
 
-        legacy_raw = client.get(f"chat:{session_id}")
-        if not legacy_raw:
-            return summary, []
+        except Exception as exc:
+            logger.warning("memory_redis_failed", op="load", error=str(exc))
+            return UNAVAILABLE
 
-        legacy_data = json.loads(legacy_raw)
-        return summary, messages_from_dict(legacy_data)
+    def save(
+        self,
+        session_id: str,
+        *,
+        summary: str,
+        messages: List[BaseMessage],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """
+        Persist the conversation memory bundle atomically with a TTL to enable multi turn continuity across requests.
+        Inputs: session_id, summary, messages, ttl_seconds ; Outputs: None.
+        """
+        try:
+            ttl = ttl_seconds if ttl_seconds is not None else settings.REDIS_TTL_SECONDS
 
-    except Exception:
-        return "", []
+            pipe = _get_redis_client().pipeline(transaction=True)
+            pipe.set(_summary_key(session_id), summary, ex=ttl)
+            pipe.set(_messages_key(session_id), _encode(messages), ex=ttl)
+            with timed(REDIS_LATENCY, "redis.save", backend="sync", op="save"):
+                pipe.execute()
+
+        except Exception as exc:
+            logger.warning("memory_redis_failed", op="save", error=str(exc))
+
+
+def _log_key(session_id: str) -> str:
+    """
+    Build the Redis list key holding one serialised message per entry for the append-only layout.
+    Inputs: session_id ; Outputs: a Redis key string.
+    """
+    return f"chat:{session_id}:log"
+
+
+def _log_lines_key(session_id: str) -> str:
+    """
+    Build the Redis list key holding, for each log entry, the summary line it contributes once it overflows the window.
+    Inputs: session_id ; Outputs: a Redis key string.
+    """
+    return f"chat:{session_id}:log_lines"
+
+
+# KEYS: log, log_lines, summary ; ARGV: max_messages, summary_max_chars, ttl, n, n entries, n summary lines
+_APPEND_AND_TRIM_LUA = r"""
+local max_messages = tonumber(ARGV[1])
+local summary_max = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local n = tonumber(ARGV[4])
+for i = 1, n do
+    redis.call('RPUSH', KEYS[1], ARGV[4 + i])
+    redis.call('RPUSH', KEYS[2], ARGV[4 + n + i])
+end
+local overflow = redis.call('LLEN', KEYS[1]) - max_messages
+if overflow > 0 then
+    local dropped = redis.call('LRANGE', KEYS[2], 0, overflow - 1)
+    redis.call('LTRIM', KEYS[1], overflow, -1)
+    redis.call('LTRIM', KEYS[2], overflow, -1)
+    local lines = {}
+    for _, line in ipairs(dropped) do
+        if line ~= '' then table.insert(lines, line) end
+    end
+    local delta = table.concat(lines, '\n'):gsub('^%s+', ''):gsub('%s+$', '')
+    local existing = redis.call('GET', KEYS[3]) or ''
+    local combined = delta
+    if existing ~= '' then
+        combined = (existing:gsub('^%s+', ''):gsub('%s+$', '') .. '\n' .. delta):gsub('^%s+', ''):gsub('%s+$', '')
+    end
+    if string.len(combined) > summary_max then
+        -- string.sub counts bytes: back the cut up to a character boundary so no UTF-8 sequence is split
+        local cut = summary_max - 3
+        while cut > 0 do
+            local b = string.byte(combined, cut + 1)
+            if b < 128 or b >= 192 then break end
+            cut = cut - 1
+        end
+        combined = string.sub(combined, 1, cut) .. '...'
+    end
+    redis.call('SET', KEYS[3], combined)
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('EXPIRE', KEYS[2], ttl)
+if redis.call('EXISTS', KEYS[3]) == 1 then redis.call('EXPIRE', KEYS[3], ttl) end
+return overflow
+"""
+
+
+class RedisListMemoryStore(RedisMemoryStore):
+    """
+    Append-only memory layout: one Redis list entry per message, trimmed server side to the retention window.
+    A Lua script appends the turn's new messages, moves the overflow into the rolling summary and trims the list in one atomic step,
+    so write cost is O(new messages) and concurrent turns on the same session cannot overwrite each other.
+    """
+
+    append_only = True
+
+    def load(self, session_id: str) -> MemoryBundle:
+        """
+        Load the summary and message log in one pipelined read, migrating sessions still stored in the blob or legacy layout on first access.
+        Inputs: session_id ; Outputs: MemoryBundle (UNAVAILABLE on any Redis/decoding failure).
+        """
+        try:
+            client = _get_redis_client()
+            pipe = client.pipeline(transaction=False)
+            pipe.get(_summary_key(session_id))
+            pipe.lrange(_log_key(session_id), -settings.MEMORY_MAX_MESSAGES, -1)
+            pipe.get(_messages_key(session_id))
+            pipe.get(_legacy_key(session_id))
+            with timed(REDIS_LATENCY, "redis.load", backend="sync", op="load"):
+                summary, entries, raw_messages, legacy_raw = pipe.execute()
+
+            if entries:
+                messages = [m for e in entries for m in decode_messages(e)]
+                return MemoryBundle(summary=_as_text(summary), messages=messages)
+
+            messages = decode_messages(raw_messages or legacy_raw)
+            if messages:
+                self._seed_log(client, session_id, messages)
+            return MemoryBundle(summary=_as_text(summary), messages=messages)
+
+        except Exception as exc:
+            logger.warning("memory_redis_failed", op="load", error=str(exc))
+            return UNAVAILABLE
+
+    def _seed_log(self, client: redis.Redis, session_id: str, messages: List[BaseMessage]) -> None:
+        """
+        One-off migration of a blob/legacy session into the list layout, so later turns only need to append.
+        Each migrated message gets its summary line, so it still reaches the rolling summary when it overflows the window.
+        Inputs: client, session_id, messages ; Outputs: None.
+        """
+        pipe = client.pipeline(transaction=True)
+        pipe.rpush(_log_key(session_id), *[_encode([m]) for m in messages])
+        pipe.rpush(_log_lines_key(session_id), *[_summary_line(m) for m in messages])
+        pipe.expire(_log_key(session_id), settings.REDIS_TTL_SECONDS)
+        pipe.expire(_log_lines_key(session_id), settings.REDIS_TTL_SECONDS)
+        with timed(REDIS_LATENCY, "redis.seed_log", backend="sync", op="seed_log"):
+            pipe.execute()
+
+    def append(
+        self,
+        session_id: str,
+        *,
+        messages: List[BaseMessage],
+        summary_lines: List[str],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """
+        Atomically append the turn's new messages, fold the overflow into the summary and trim the log to MEMORY_MAX_MESSAGES.
+        Inputs: session_id, messages, summary_lines (one per message, "" for none), ttl_seconds ; Outputs: None.
+        """
+        if not messages:
+            return
+        try:
+            client = _get_redis_client()
+            ttl = ttl_seconds if ttl_seconds is not None else settings.REDIS_TTL_SECONDS
+            script = client.register_script(_APPEND_AND_TRIM_LUA)
+            args = [
+                settings.MEMORY_MAX_MESSAGES,
+                settings.MEMORY_SUMMARY_MAX_CHARS,
+                ttl,
+                len(messages),
+                *[_encode([m]) for m in messages],
+                *summary_lines,
+            ]
+            with timed(REDIS_LATENCY, "redis.append", backend="sync", op="append"):
+                script(keys=[_log_key(session_id), _log_lines_key(session_id), _summary_key(session_id)], args=args)
+
+        except Exception as exc:
+            logger.warning("memory_redis_failed", op="append", error=str(exc))
+
+
+_memory_store: RedisMemoryStore | None = None
+
+
+def get_memory_store() -> RedisMemoryStore:
+    """
+    Create and cache the memory store used by the memory nodes, following settings.MEMORY_STORAGE_LAYOUT ("blob" or "list").
+    Inputs: none; Outputs: a RedisMemoryStore instance.
+    """
+    global _memory_store
+    if _memory_store is None:
+        layout = (settings.MEMORY_STORAGE_LAYOUT or "blob").lower()
+        _memory_store = RedisListMemoryStore() if layout == "list" else RedisMemoryStore()
+    return _memory_store
+
+
+def load_memory_bundle_from_redis(session_id: str) -> Tuple[str, List[BaseMessage]]:
+    """
+    Load the conversation memory bundle for a session from Redis, with backward compatible fallback to a legacy single key format.
+    Inputs: session_id ; Outputs: (summary (str), recent_messages (list[BaseMessage])).
+    """
+    bundle = get_memory_store().load(session_id)
+    return bundle.summary, bundle.messages
 
 
 def save_memory_bundle_to_redis(
@@ -75,12 +354,4 @@ def save_memory_bundle_to_redis(
     Persist the conversation memory bundle to Redis with a TTL to enable multi turn continuity across requests.
     Inputs: session_id, summary, messages, ttl_seconds ; Outputs: None.
     """
-    try:
-        client = _get_redis_client()
-        ttl = ttl_seconds if ttl_seconds is not None else settings.REDIS_TTL_SECONDS
-
-        client.set(_summary_key(session_id), summary, ex=ttl)
-        client.set(_messages_key(session_id), json.dumps(messages_to_dict(messages)), ex=ttl)
-
-    except Exception:
-        return
+    get_memory_store().save(session_id, summary=summary, messages=messages, ttl_seconds=ttl_seconds)
@@ -1,17 +1,72 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from langchain_core.documents import Document
 from qdrant_client import models
 
+from src.app.core.admission import limit
+from src.app.core.concurrency import submit
 from src.app.core.config import settings
+from src.app.core.metrics import QDRANT_LATENCY, record_candidates, timed
+from src.rag.ingestion.dedup import collapse_near_duplicates
 from src.rag.llm.models import get_embedding_model
-from src.rag.retrieval.reranker import simple_rerank
+from src.rag.retrieval.reranker import reciprocal_rank_fusion, simple_rerank
 from src.rag.vectorstore.qdrant_client import get_qdrant_client
 
 
+def _doc_key(d: Document) -> str:
+    """
+    Build the deduplication key of a retrieved chunk: chunk_uid when present, otherwise a composite of source, page, chunk id and text prefix.
+    Inputs: d ; Outputs: key string.
+    """
+    meta = d.metadata or {}
+    chunk_uid = meta.get("chunk_uid")
+    if chunk_uid:
+        return str(chunk_uid)
+    return f"{meta.get('source')}|{meta.get('page')}|{meta.get('chunk_id')}|{d.page_content[:50]}"
+
+
+_query_vectors: "OrderedDict[Tuple[int, str], Future]" = OrderedDict()
+_query_vectors_lock = threading.Lock()
+
+
+def embed_query(query: str) -> List[float]:
+    """
+    Embed a search text once per process: recent query embeddings are kept in a small LRU (QUERY_EMBEDDING_CACHE_SIZE), and a caller asking
+    for a text that another thread is already embedding waits for that result. This lets the supervisor's intent classifier reuse the embedding
+    of the speculative retrieval on the raw question (or the other way round) instead of paying for it twice.
+    Inputs: query ; Outputs: the query vector from the current embedding model.
+    """
+    embedder = get_embedding_model()
+    key = (id(embedder), query)
+    with _query_vectors_lock:
+        future = _query_vectors.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _query_vectors[key] = future
+            while len(_query_vectors) > max(settings.QUERY_EMBEDDING_CACHE_SIZE, 1):
+                _query_vectors.popitem(last=False)
+        else:
+            _query_vectors.move_to_end(key)
+
+    if owner:
+        try:
+            future.set_result(embedder.embed_documents([query])[0])
+        except BaseException as exc:
+            with _query_vectors_lock:
+                if _query_vectors.get(key) is future:
+                    del _query_vectors[key]
+            future.set_exception(exc)
+            raise
+    return future.result()
+
+
 @dataclass
 class HybridRetriever:
     """
@@ -35,31 +90,37 @@ class HybridRetriever:
 
     def _dense_search(self, query: str, filters: Optional[models.Filter]) -> List[Document]:
         """
-        Perform dense retrieval by embedding the query and running a Qdrant vector search, converting hits into LangChain Document objects with payload metadata.
+        Perform dense retrieval by embedding the query (through the query embedding cache) and running a Qdrant vector search, converting hits into LangChain Document objects with payload metadata.
         Inputs: search text, filters ; Outputs: a list[Document] of dense retrieved chunks.
         """
-        client = get_qdrant_client()
-        embedder = get_embedding_model()
+        return self._dense_search_by_vector(embed_query(query), filters)
 
-        qvec = embedder.embed_documents([query])[0]
-        hits = client.search(
-            collection_name=self.collection_name,
-            query_vector=qvec,
-            query_filter=filters,
-            limit=self.dense_k,
-            with_vectors=False,
-        )
+    def _dense_search_by_vector(self, qvec: List[float], filters: Optional[models.Filter]) -> List[Document]:
+        """
+        Run a Qdrant vector search for an already computed query embedding.
+        Inputs: query vector, filters ; Outputs: a list[Document] of dense retrieved chunks, each with its similarity in metadata['dense_score'].
+        """
+        client = get_qdrant_client()
+        with limit("qdrant"), timed(QDRANT_LATENCY, "qdrant.search", op="search"):
+            hits = client.search(
+                collection_name=self.collection_name,
+                query_vector=qvec,
+                query_filter=filters,
+                limit=self.dense_k,
+                with_vectors=False,
+            )
+        record_candidates("dense", len(hits))
 
         docs: List[Document] = []
         for h in hits:
             payload = h.payload or {}
-            docs.append(Document(page_content=payload.get("text", ""), metadata=payload))
+            docs.append(Document(page_content=payload.get("text", ""), metadata={**payload, "dense_score": float(h.score)}))
         return docs
 
     def _lexical_search(self, query: str, filters: Optional[models.Filter]) -> List[Document]:
         """
         Perform lexical retrieval by scrolling Qdrant points matching the query text against the stored payload field 'text'.
-        Inputs: search text, filters ; Outputs: a list[Document] of lexically matched chunks.
+        Inputs: search text, filters ; Outputs: a list[Document] of lexically matched chunks, flagged with metadata['lexical_match'].
         """
         client = get_qdrant_client()
 
@@ -76,22 +137,26 @@ class HybridRetriever:
 
         lexical_filter = models.Filter(must=must)
 
-        points, _ = client.scroll(
-            collection_name=self.collection_name,
-            scroll_filter=lexical_filter,
-            with_vectors=False,
-            limit=self.lexical_k,
-        )
+        with limit("qdrant"), timed(QDRANT_LATENCY, "qdrant.scroll", op="scroll"):
+            points, _ = client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=lexical_filter,
+                with_vectors=False,
+                limit=self.lexical_k,
+            )
+        record_candidates("lexical", len(points))
 
         docs: List[Document] = []
         for p in points:
             payload = p.payload or {}
-            docs.append(Document(page_content=payload.get("text", ""), metadata=payload))
+            docs.append(Document(page_content=payload.get("text", ""), metadata={**payload, "lexical_match": True}))
         return docs
 
     def retrieve(self, query: str, filters: Optional[models.Filter] = None) -> List[Document]:
         """
         Retrieve candidate chunks using dense and lexical search, merge duplicates using chunk identifiers, rerank candidates, and return the top results.
+        A chunk found by both legs keeps the metadata of both, so its 'dense_score' survives the merge for the retrieval quality gate.
+        With RETRIEVAL_COLLAPSE_DUPLICATES, duplicate chunks (identical text, or near duplicates with the same figures under DEDUP_NEAR_DUPLICATES) are dropped before the top_k cut so they do not take slots.
         Inputs: search text, filters ; Outputs: a list[Document] reranked and truncated to top_k.
         """
         dense = self._dense_search(query, filters)
@@ -99,12 +164,92 @@ class HybridRetriever:
 
         merged: Dict[str, Document] = {}
         for d in (dense + lexical):
-            meta = d.metadata or {}
-            key = (
-                str(meta.get("chunk_uid"))
-                or f"{meta.get('source')}|{meta.get('page')}|{meta.get('chunk_id')}|{d.page_content[:50]}"
-            )
-            merged[key] = d
-
-        reranked = simple_rerank(list(merged.values()), query=query, top_k=self.top_k)
+            doc_key = _doc_key(d)
+            seen = merged.get(doc_key)
+            if seen is not None:
+                d = Document(page_content=d.page_content, metadata={**(seen.metadata or {}), **(d.metadata or {})})
+            merged[doc_key] = d
+        record_candidates("merged", len(merged))
+
+        candidates = list(merged.values())
+        if settings.RETRIEVAL_COLLAPSE_DUPLICATES:
+            reranked = collapse_near_duplicates(simple_rerank(candidates, query=query, top_k=len(candidates)))[: self.top_k]
+        else:
+            reranked = simple_rerank(candidates, query=query, top_k=self.top_k)
+        record_candidates("reranked", len(reranked))
         return reranked
+
+    def retrieve_many(
+        self,
+        queries: List[str],
+        filters: Optional[models.Filter] = None,
+        prefetched: Optional[List[Document]] = None,
+    ) -> List[Document]:
+        """
+        Retrieve for several sub-queries at once: embed all queries in one batch, run every dense and lexical search concurrently, then fuse the ranked lists with RRF and deduplicate by chunk identifier.
+        `prefetched` is an already ranked result list (e.g. retrieve() on the raw question, run while the planner LLM was busy) fused in as one more list instead of searching again.
+        Inputs: search texts (first one is the user question unless prefetched covers it), filters, prefetched ; Outputs: a list[Document] truncated to top_k, each carrying its fused score
+        in metadata['fused_score'] and its best dense similarity over all sub-queries in metadata['dense_score'] (when a dense search found it).
+        """
+        queries = [q for q in dict.fromkeys(q.strip() for q in queries) if q]
+        if not queries:
+            return list(prefetched or [])
+        if len(queries) == 1 and prefetched is None:
+            return self.retrieve(queries[0], filters)
+
+        embedder = get_embedding_model()
+        qvecs = embedder.embed_documents(queries)
+
+        futures = [submit(self._dense_search_by_vector, qvec, filters) for qvec in qvecs]
+        futures += [submit(self._lexical_search, q, filters) for q in queries]
+        ranked_lists = [f.result() for f in futures]
+        if prefetched:
+            ranked_lists.append(list(prefetched))
+
+        collapse = settings.RETRIEVAL_COLLAPSE_DUPLICATES
+        fused = reciprocal_rank_fusion(
+            ranked_lists,
+            key=_doc_key,
+            k=settings.RETRIEVAL_RRF_K,
+            top_k=sum(len(r) for r in ranked_lists) if collapse else self.top_k,
+        )
+        if collapse:
+            kept = {id(d) for d in collapse_near_duplicates([d for d, _ in fused])}
+            fused = [(d, score) for d, score in fused if id(d) in kept][: self.top_k]
+        record_candidates("fused", len(fused))
+
+        best_dense: Dict[str, float] = {}
+        lexical_keys = set()
+        for ranked in ranked_lists:
+            for d in ranked:
+                meta = d.metadata or {}
+                doc_key = _doc_key(d)
+                if "dense_score" in meta:
+                    best_dense[doc_key] = max(best_dense.get(doc_key, meta["dense_score"]), meta["dense_score"])
+                if meta.get("lexical_match"):
+                    lexical_keys.add(doc_key)
+
+        docs: List[Document] = []
+        for d, score in fused:
+            doc_key = _doc_key(d)
+            meta = {**(d.metadata or {}), "fused_score": score}
+            if doc_key in best_dense:
+                meta["dense_score"] = best_dense[doc_key]
+            if doc_key in lexical_keys:
+                meta["lexical_match"] = True
+            d.metadata = meta
+            docs.append(d)
+        return docs
+
+_retriever: HybridRetriever | None = None
+
+
+def get_hybrid_retriever() -> HybridRetriever:
+    """
+    Initialise and cache a HybridRetriever so retrieval configuration and underlying clients are reused across requests and nodes.
+    Inputs: none ; Outputs: a configured HybridRetriever instance.
+    """
+    global _retriever
+    if _retriever is None:
+        _retriever = HybridRetriever.from_env()
+    return _retriever
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+from src.rag.text_utils import content_tokens, split_sentences
+
+ACRONYM_EXPANSIONS: Dict[str, str] = {
+    "ai": "artificial intelligence",
+    "api": "application programming interface",
+    "arr": "annual recurring revenue",
+    "b2b": "business to business",
+    "capex": "capital expenditure",
+    "ceo": "chief executive officer",
+    "cfo": "chief financial officer",
+    "crm": "customer relationship management",
+    "cto": "chief technology officer",
+    "ebitda": "earnings before interest taxes depreciation and amortization",
+    "eps": "earnings per share",
+    "esg": "environmental social and governance",
+    "fy": "fiscal year",
+    "gdpr": "general data protection regulation",
+    "hr": "human resources",
+    "kpi": "key performance indicator",
+    "llm": "large language model",
+    "ml": "machine learning",
+    "mrr": "monthly recurring revenue",
+    "nlp": "natural language processing",
+    "okr": "objectives and key results",
+    "opex": "operating expenditure",
+    "pto": "paid time off",
+    "q1": "first quarter",
+    "q2": "second quarter",
+    "q3": "third quarter",
+    "q4": "fourth quarter",
+    "r&d": "research and development",
+    "rag": "retrieval augmented generation",
+    "roi": "return on investment",
+    "saas": "software as a service",
+    "sla": "service level agreement",
+    "yoy": "year over year",
+}
+
+_ACRONYM_RE = re.compile(r"\b[a-z][a-z0-9&]{1,7}\b")
+_SUB_QUERY_LINE_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)]|sub-?question\s*\d*\s*:)\s*(.+)$", re.IGNORECASE)
+_MULTI_PART_RE = re.compile(
+    r"\b(compare|comparison|versus|vs\.?|difference between|differences|pros and cons|step by step|and also|as well as)\b"
+)
+
+
+def extract_keywords(question: str, max_keywords: int = 8) -> List[str]:
+    """
+    Extract the distinct content words of a question in order of appearance, used as a cheap local retrieval plan.
+    Inputs: question, max_keywords ; Outputs: list of lowercase keywords.
+    """
+    seen: List[str] = []
+    for t in content_tokens(question):
+        if t not in seen:
+            seen.append(t)
+    return seen[:max_keywords]
+
+
+def expand_acronyms(question: str) -> List[str]:
+    """
+    Look up known acronyms used in the question and return their expansions to add recall for documents that spell them out.
+    Inputs: question ; Outputs: list of expansion strings in order of appearance.
+    """
+    expansions: List[str] = []
+    for token in _ACRONYM_RE.findall((question or "").lower()):
+        expansion = ACRONYM_EXPANSIONS.get(token)
+        if expansion and expansion not in expansions:
+            expansions.append(expansion)
+    return expansions
+
+
+def is_simple_query(question: str, max_content_tokens: int = 12) -> bool:
+    """
+    Decide whether a question is short and single-part enough to skip the LLM planner.
+    Inputs: question, max_content_tokens ; Outputs: True when a rule-based plan is sufficient.
+    """
+    q = (question or "").strip()
+    if not q:
+        return False
+    if len(split_sentences(q)) > 1 or q.count("?") > 1:
+        return False
+    if _MULTI_PART_RE.search(q.lower()):
+        return False
+    return len(content_tokens(q)) <= max_content_tokens
+
+
+def rule_based_plan(question: str) -> str:
+    """
+    Build a short plan without an LLM call: the question's keywords plus expansions of known acronyms.
+    Inputs: question ; Outputs: plan text with one "Keywords:" line and an optional "Expansions:" line.
+    """
+    lines = [f"Keywords: {', '.join(extract_keywords(question))}"]
+    expansions = expand_acronyms(question)
+    if expansions:
+        lines.append(f"Expansions: {'; '.join(expansions)}")
+    return "\n".join(lines)
+
+
+def rule_based_query(question: str) -> str:
+    """
+    Build the retrieval query for a rule-based plan: the raw question plus acronym expansions, so the embedding is not diluted by plan text.
+    Inputs: question ; Outputs: search text.
+    """
+    expansions = expand_acronyms(question)
+    return question if not expansions else f"{question} ({'; '.join(expansions)})"
+
+
+def parse_sub_queries(plan: str, max_queries: int = 4) -> List[str]:
+    """
+    Extract the sub-questions of an LLM plan (bulleted or numbered lines, or lines ending with a question mark) so they can be searched separately.
+    Inputs: plan text, max_queries ; Outputs: list of distinct sub-query strings, at most max_queries long.
+    """
+    queries: List[str] = []
+    for line in (plan or "").splitlines():
+        m = _SUB_QUERY_LINE_RE.match(line)
+        text = m.group(1) if m else (line if line.strip().endswith("?") else "")
+        text = text.strip().strip("*").strip()
+        if len(content_tokens(text)) < 2 or text in queries:
+            continue
+        queries.append(text)
+        if len(queries) >= max_queries:
+            break
+    return queries
+
+
+def local_rewrite(question: str, previous_query: str) -> str | None:
+    """
+    Build a cheap retry query without an LLM call: the question's keywords plus expansions of known acronyms.
+    Inputs: question, previous_query (text already searched) ; Outputs: the rewritten search text, or None when it would not differ from previous_query.
+    """
+    terms = extract_keywords(question) + expand_acronyms(question)
+    rewrite = " ".join(terms).strip()
+    if not rewrite or rewrite.casefold() == (previous_query or "").strip().casefold():
+        return None
+    return rewrite
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 from langchain_core.documents import Document
 
@@ -22,3 +22,25 @@ def simple_rerank(docs: List[Document], query: str, top_k: int = 8) -> List[Docu
 
     ranked = sorted(docs, key=score, reverse=True)
     return ranked[:top_k]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[Document]],
+    key: Callable[[Document], str],
+    k: int = 60,
+    top_k: int = 8,
+) -> List[Tuple[Document, float]]:
+    """
+    Fuse several ranked candidate lists with Reciprocal Rank Fusion (sum of 1 / (k + rank)), deduplicating candidates by key.
+    Inputs: ranked_lists (best first), key function identifying a chunk, k smoothing constant, top_k maximum results; Outputs: (Document, fused score) pairs sorted by score.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked, start=1):
+            doc_key = key(doc)
+            scores[doc_key] = scores.get(doc_key, 0.0) + 1.0 / (k + rank)
+            docs.setdefault(doc_key, doc)
+
+    ordered = sorted(scores, key=lambda doc_key: scores[doc_key], reverse=True)
+    return [(docs[doc_key], scores[doc_key]) for doc_key in ordered[:top_k]]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])|\n{2,}|\n(?=\s*(?:[-*•]|\d+[.)])\s)")
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'-][a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have having
+    he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+    nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+    that the their theirs them themselves then there these they this those through to too under until up very
+    was we were what when where which while who whom why will with would you your yours yourself yourselves
+    """.split()
+)
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Locate sentences (and bullet items) in free text using lightweight punctuation and line break heuristics.
+    Inputs: text ; Outputs: list of (start, end) character offsets of non-empty sentences, whitespace trimmed.
+    """
+    text = text or ""
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    for sep in [*_SENTENCE_SPLIT_RE.finditer(text), None]:
+        end = sep.start() if sep is not None else len(text)
+        chunk = text[start:end]
+        if chunk.strip():
+            lead = len(chunk) - len(chunk.lstrip())
+            trail = len(chunk) - len(chunk.rstrip())
+            spans.append((start + lead, end - trail))
+        if sep is not None:
+            start = sep.end()
+    return spans
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split free text into sentences (and bullet items) using lightweight punctuation and line break heuristics.
+    Inputs: text ; Outputs: list of non-empty stripped sentence strings in original order.
+    """
+    return [text[s:e] for s, e in sentence_spans(text)]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase and split text into alphanumeric word tokens.
+    Inputs: text ; Outputs: list of tokens in original order.
+    """
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def content_tokens(text: str) -> List[str]:
+    """
+    Tokenize text and drop stopwords and single character tokens, keeping the words that carry meaning for matching.
+    Inputs: text ; Outputs: list of content tokens in original order.
+    """
+    return [t for t in tokenize(text) if len(t) > 1 and t not in STOPWORDS]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from qdrant_client import models
+
+from src.app.core.config import settings
+from src.app.core.logging import get_logger
+from src.rag.ingestion.indexing import _doc_id, chunk_point_id
+from src.rag.ingestion.loaders import load_any
+from src.rag.vectorstore.qdrant_client import bump_collection_generation, get_qdrant_client
+
+logger = get_logger("migrations")
+
+
+@dataclass(frozen=True)
+class MigrationResult:
+    scanned: int
+    rewritten: int
+    unchanged: int
+    unresolved: int
+
+
+def _scroll(client, collection_name: str, batch_size: int) -> Iterator[Any]:
+    """
+    Iterate over every point of a collection (payload only), one scroll page of batch_size at a time.
+    Inputs: client, collection_name, batch_size ; Outputs: iterator of points.
+    """
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        yield from points
+        if offset is None:
+            return
+
+
+class _PageTexts:
+    """
+    Page texts of source files, loaded once per source, used to find the offset of chunks stored before 'start_index' was recorded.
+    """
+
+    def __init__(self):
+        self._pages: Dict[str, Optional[Dict[Any, str]]] = {}
+
+    def get(self, source: str, page) -> Optional[str]:
+        if source not in self._pages:
+            try:
+                docs = load_any(source)
+            except Exception as exc:
+                logger.warning("migration_source_unavailable", source=source, error=str(exc))
+                self._pages[source] = None
+            else:
+                self._pages[source] = {d.metadata.get("page", d.metadata.get("section", None)): d.page_content or "" for d in docs}
+        pages = self._pages[source]
+        return None if pages is None else pages.get(page)
+
+
+def _plan(client, collection_name: str, batch_size: int) -> Tuple[int, Dict[str, Tuple[str, int]], int]:
+    """
+    First pass: compute the stable id and offset of every point from its payload. Points without 'start_index' are located in their
+    source page (reloaded from 'source'), in chunk_id order so repeated text resolves to successive occurrences; points whose source or
+    text cannot be found are left as they are.
+    Inputs: client, collection_name, batch_size ; Outputs: (points scanned, {old id: (new id, start_index)} for points to rewrite, unresolved count).
+    """
+    scanned = 0
+    changes: Dict[str, Tuple[str, int]] = {}
+    legacy: Dict[Tuple[str, str, Any], List[Tuple[Any, str, str]]] = {}
+
+    for point in _scroll(client, collection_name, batch_size):
+        scanned += 1
+        payload = point.payload or {}
+        doc_id, page = _doc_id(payload), payload.get("page")
+        start = payload.get("start_index")
+        if start is None:
+            key = (str(payload.get("source", "unknown")), doc_id, page)
+            legacy.setdefault(key, []).append((payload.get("chunk_id"), str(point.id), payload.get("text") or ""))
+            continue
+        new_id = chunk_point_id(doc_id, page, start, payload.get("chunk_id"))
+        if new_id != str(point.id) or payload.get("chunk_uid") != new_id:
+            changes[str(point.id)] = (new_id, int(start))
+
+    unresolved = 0
+    pages = _PageTexts()
+    for (source, doc_id, page), entries in legacy.items():
+        page_text = pages.get(source, page)
+        cursor = 0
+        for _, old_id, text in sorted(entries, key=lambda e: e[0] if isinstance(e[0], int) else float("inf")):
+            start = page_text.find(text, cursor) if page_text is not None and text else -1
+            if start < 0 and page_text is not None and text:
+                start = page_text.find(text)
+            if start < 0:
+                unresolved += 1
+                continue
+            cursor = start + 1
+            changes[old_id] = (chunk_point_id(doc_id, page, start), start)
+
+    return scanned, changes, unresolved
+
+
+def migrate_chunk_ids(collection_name: Optional[str] = None, batch_size: int = 256, dry_run: bool = False) -> MigrationResult:
+    """
+    Rewrite the point ids of a collection to the (document, page, offset) scheme of chunk_point_id, so points stored under older ids are
+    overwritten in place by later re-ingestion instead of duplicated. Vectors are reused, nothing is re-embedded.
+    Second pass works in batches: retrieve the old points with their vectors, upsert them under the new id (with 'chunk_uid' and
+    'start_index' updated), then delete the old ids. Upsert precedes delete, so an interrupted run loses nothing and can simply be rerun;
+    a finished run is a no-op the second time. Old points that map to the same new id collapse into one.
+    Inputs: collection_name (defaults to settings.QDRANT_COLLECTION_NAME), batch_size, dry_run (plan only) ; Outputs: MigrationResult.
+    """
+    client = get_qdrant_client()
+    name = collection_name or settings.QDRANT_COLLECTION_NAME
+    size = max(batch_size, 1)
+
+    scanned, changes, unresolved = _plan(client, name, size)
+    logger.info("chunk_id_migration_planned", collection=name, scanned=scanned, rewrite=len(changes), unresolved=unresolved, dry_run=dry_run)
+
+    if not dry_run and changes:
+        old_ids = list(changes)
+        for i in range(0, len(old_ids), size):
+            batch = old_ids[i : i + size]
+            records = client.retrieve(collection_name=name, ids=batch, with_payload=True, with_vectors=True)
+            points = []
+            for record in records:
+                new_id, start = changes[str(record.id)]
+                payload = {**(record.payload or {}), "chunk_uid": new_id, "start_index": start}
+                points.append(models.PointStruct(id=new_id, vector=record.vector, payload=payload))
+            if points:
+                client.upsert(collection_name=name, points=points, wait=True)
+            stale = [old for old in batch if old != changes[old][0]]
+            if stale:
+                client.delete(collection_name=name, points_selector=models.PointIdsList(points=stale), wait=True)
+        bump_collection_generation(name)
+
+    return MigrationResult(scanned=scanned, rewritten=len(changes), unchanged=scanned - len(changes) - unresolved, unresolved=unresolved)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rewrite Qdrant point ids to stable (document, page, offset) chunk ids")
+    parser.add_argument("--collection", default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    print(migrate_chunk_ids(args.collection, args.batch_size, args.dry_run))
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import threading
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 from qdrant_client import QdrantClient, models
 
 from src.app.core.config import settings
 
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
 
 @lru_cache(maxsize=1)
 def get_qdrant_client() -> QdrantClient:
@@ -45,3 +49,24 @@ def ensure_collection(
             distance=distance,
         ),
     )
+
+
+def collection_generation(collection_name: Optional[str] = None) -> int:
+    """
+    Return the collection's content generation in this process, bumped after every ingestion into it.
+    Inputs: collection_name (defaults to settings.QDRANT_COLLECTION_NAME) ; Outputs: generation counter.
+    """
+    name = collection_name or settings.QDRANT_COLLECTION_NAME
+    with _generations_lock:
+        return _generations.get(name, 0)
+
+
+def bump_collection_generation(collection_name: Optional[str] = None) -> int:
+    """
+    Mark the collection's content as changed, so work keyed on the previous generation (e.g. coalesced questions) is not shared with later requests.
+    Inputs: collection_name ; Outputs: the new generation.
+    """
+    name = collection_name or settings.QDRANT_COLLECTION_NAME
+    with _generations_lock:
+        _generations[name] = _generations.get(name, 0) + 1
+        return _generations[name]
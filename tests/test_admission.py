@@ -0,0 +1,87 @@
+# This test checks that the resource limiter serves interactive callers before batch ones, rejects on a full queue or an exhausted
+# wait budget, and that /chat turns a rejection into 429 with Retry-After
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core import admission
+from src.app.core.admission import Overloaded, ResourceLimiter
+
+
+def _wait_for_queue(limiter, n):
+    deadline = time.time() + 2
+    while limiter.snapshot()["queued"] < n and time.time() < deadline:
+        time.sleep(0.005)
+
+
+def test_interactive_callers_are_served_before_batch():
+    limiter = ResourceLimiter("embedding", capacity=1, max_queue=8)
+    limiter.acquire("interactive", 1.0)
+    order = []
+
+    def worker(priority):
+        limiter.acquire(priority, 2.0)
+        order.append(priority)
+        limiter.release(0.01)
+
+    batch = threading.Thread(target=worker, args=("batch",))
+    batch.start()
+    _wait_for_queue(limiter, 1)
+    interactive = threading.Thread(target=worker, args=("interactive",))
+    interactive.start()
+    _wait_for_queue(limiter, 2)
+
+    limiter.release(0.01)
+    batch.join()
+    interactive.join()
+
+    assert order == ["interactive", "batch"]
+
+
+def test_full_queue_and_wait_budget_are_rejected():
+    limiter = ResourceLimiter("llm", capacity=1, max_queue=1)
+    limiter.acquire("interactive", 1.0)
+
+    with pytest.raises(Overloaded) as budget:
+        limiter.acquire("interactive", 0.05)
+    assert budget.value.status_code == 503
+    assert limiter.snapshot()["queued"] == 0
+
+    errors = []
+
+    def queued_caller():
+        try:
+            limiter.acquire("batch", 0.3)
+        except Overloaded as exc:
+            errors.append(exc.reason)
+
+    waiter = threading.Thread(target=queued_caller)
+    waiter.start()
+    _wait_for_queue(limiter, 1)
+    with pytest.raises(Overloaded) as full:
+        limiter.acquire("interactive", 1.0)
+    waiter.join()
+
+    assert errors == ["wait_budget"]
+    assert full.value.status_code == 429
+    assert full.value.retry_after_s >= 1
+
+
+def test_chat_is_rejected_with_retry_after_when_llm_queue_is_full(monkeypatch):
+    from src.app.api.routers import chat
+    from src.app.main import app
+
+    saturated = ResourceLimiter("llm", capacity=1, max_queue=0)
+    saturated.acquire("interactive", 1.0)
+    monkeypatch.setattr(admission, "_limiters", {"llm": saturated})
+    monkeypatch.setattr(admission.settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(chat, "get_graph_app", lambda: pytest.fail("graph must not run"))
+
+    resp = TestClient(app).post("/chat/", json={"messages": [{"role": "user", "content": "q"}]})
+
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert resp.json()["resource"] == "llm"
@@ -0,0 +1,150 @@
+# This test checks that the asyncio memory store round-trips sessions, bounds slow calls with a timeout, and skips Redis while its circuit is open, and that a cancelled half-open trial does not wedge the circuit
+
+import asyncio
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.rag.memory.async_redis_memory import AsyncRedisMemoryStore
+from src.rag.memory.circuit_breaker import CircuitBreaker
+
+
+class BrokenRedis:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pipelines = 0
+
+    def pipeline(self, transaction=True):
+        self.pipelines += 1
+        outer = self
+
+        class Pipe:
+            def get(self, key):
+                pass
+
+            async def execute(self):
+                if outer.delay:
+                    await asyncio.sleep(outer.delay)
+                raise ConnectionError("redis down")
+
+        return Pipe()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("layout", ["blob", "list"])
+async def test_async_store_round_trip(layout):
+    store = AsyncRedisMemoryStore(fakeredis.FakeAsyncRedis(), layout=layout)
+    messages = [HumanMessage(content="q"), AIMessage(content="a")]
+
+    if layout == "list":
+        await store.append("s1", messages=messages, summary_lines=["- User: q", "- Assistant: a"])
+    else:
+        await store.save("s1", summary="sum", messages=messages)
+
+    bundle = await store.load("s1")
+    assert [m.content for m in bundle.messages] == ["q", "a"]
+    assert store.stats.snapshot()["failures"] == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_redis_is_bounded_by_the_call_timeout():
+    store = AsyncRedisMemoryStore(BrokenRedis(delay=5.0), layout="blob", op_timeout_s=0.05)
+
+    bundle = await asyncio.wait_for(store.load("s1"), timeout=1.0)
+
+    assert bundle.messages == []
+    assert store.stats.snapshot()["timeouts"] == {"load": 1}
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_skips_redis_after_repeated_failures():
+    client = BrokenRedis()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=60)
+    store = AsyncRedisMemoryStore(client, layout="blob", breaker=breaker)
+
+    for _ in range(5):
+        await store.load("s1")
+
+    assert client.pipelines == 2
+    assert breaker.state == "open"
+    assert store.stats.snapshot()["skipped"] == {"load": 3}
+
+
+def test_circuit_half_opens_after_reset_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 11.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+class SlowReadRedis(fakeredis.FakeAsyncRedis):
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        if not transaction:
+            async def slow_execute(*args, **kwargs):
+                await asyncio.sleep(5.0)
+            pipe.execute = slow_execute
+        return pipe
+
+
+@pytest.mark.asyncio
+async def test_timed_out_load_does_not_clobber_stored_memory(monkeypatch):
+    from src.graph.nodes import memory_agent
+
+    client = SlowReadRedis()
+    writer = AsyncRedisMemoryStore(fakeredis.FakeAsyncRedis(server=client.connection_pool.connection_kwargs["server"]), layout="blob")
+    await writer.save("s1", summary="- User: first", messages=[HumanMessage(content="earlier"), AIMessage(content="reply")])
+    before = await client.get("chat:s1:messages")
+
+    store = AsyncRedisMemoryStore(client, layout="blob", op_timeout_s=0.05)
+    monkeypatch.setattr(memory_agent, "get_async_memory_store", lambda: store)
+    state = {"session_id": "s1", "messages": [HumanMessage(content="new question")], "answer": "new answer"}
+    update = await memory_agent.aload_memory_node(state)
+    state.update(update)
+    await memory_agent.asave_memory_node(state)
+
+    assert "memory_messages" not in update
+    assert store.stats.snapshot()["timeouts"] == {"load": 2}
+    assert "save" not in store.stats.snapshot()["calls"]
+    assert await client.get("chat:s1:messages") == before
+
+
+@pytest.mark.asyncio
+async def test_blob_session_migrated_to_list_layout_keeps_summary_lines(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    await AsyncRedisMemoryStore(client, layout="blob").save("s2", summary="", messages=[HumanMessage(content="q0"), AIMessage(content="a0")])
+    store = AsyncRedisMemoryStore(client, layout="list")
+    monkeypatch.setattr("src.rag.memory.async_redis_memory.settings.MEMORY_MAX_MESSAGES", 3)
+
+    await store.load("s2")
+    await store.append("s2", messages=[HumanMessage(content="q1"), AIMessage(content="a1")], summary_lines=["- User: q1", "- Assistant: a1"])
+
+    bundle = await store.load("s2")
+    assert [m.content for m in bundle.messages] == ["a0", "q1", "a1"]
+    assert bundle.summary == "- User: q0"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_does_not_keep_the_circuit_open():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: now[0])
+    store = AsyncRedisMemoryStore(SlowReadRedis(), layout="blob", breaker=breaker, op_timeout_s=30.0)
+    breaker.record_failure()
+    now[0] = 11.0
+
+    trial = asyncio.create_task(store.load("s1"))
+    await asyncio.sleep(0.05)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
@@ -0,0 +1,78 @@
+# This test checks that /chat returns a timing timeline only when the client asks for it and CHAT_PROFILE_ENABLED is set
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api.routers import chat
+from src.app.core.metrics import instrument_node, record_candidates
+from src.graph.trace import trace_event
+
+
+class FakeGraphApp:
+    async def ainvoke(self, state, config=None):
+        def retrieval(s):
+            record_candidates("merged", 7)
+            record_candidates("reranked", 3)
+            return {}
+
+        instrument_node("retrieval", retrieval)(state)
+        instrument_node("reasoning", lambda s: {})(state)
+        return {
+            **state,
+            "answer": "ok",
+            "citations": [],
+            "retry_count": 1,
+            "trace": [trace_event("quality_gate", "Retrieval quality gate: continue.")],
+        }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(chat, "get_graph_app", lambda: FakeGraphApp())
+    app = FastAPI()
+    app.include_router(chat.router)
+    return TestClient(app)
+
+
+def _post(client, profile):
+    return client.post("/chat/", json={"messages": [{"role": "user", "content": "q"}], "profile": profile}).json()
+
+
+def test_profile_timeline_is_returned_when_enabled(client, monkeypatch):
+    monkeypatch.setattr(chat.settings, "CHAT_PROFILE_ENABLED", True)
+
+    profile = _post(client, True)["profile"]
+
+    assert [s["stage"] for s in profile["timeline"]] == ["node.retrieval", "node.reasoning"]
+    assert profile["retries"] == 1
+    assert profile["counters"] == {"candidates_merged": 7, "candidates_reranked": 3}
+    assert profile["trace"][0]["agent"] == "quality_gate"
+
+
+def test_profile_is_omitted_when_disabled_or_not_requested(client, monkeypatch):
+    monkeypatch.setattr(chat.settings, "CHAT_PROFILE_ENABLED", False)
+    assert _post(client, True)["profile"] is None
+
+    monkeypatch.setattr(chat.settings, "CHAT_PROFILE_ENABLED", True)
+    assert _post(client, False)["profile"] is None
+
+
+def test_failed_turn_still_logs_its_timings(monkeypatch):
+    class FailingGraphApp:
+        async def ainvoke(self, state, config=None):
+            instrument_node("retrieval", lambda s: {})(state)
+            raise RuntimeError("qdrant down")
+
+    logged = []
+    monkeypatch.setattr(chat, "get_graph_app", lambda: FailingGraphApp())
+    monkeypatch.setattr(chat.logger, "info", lambda event, **kw: logged.append((event, kw)))
+    app = FastAPI()
+    app.include_router(chat.router)
+
+    resp = TestClient(app).post("/chat/", json={"session_id": "s1", "messages": [{"role": "user", "content": "q"}]})
+
+    assert resp.status_code == 500
+    [(event, fields)] = [e for e in logged if e[0] == "chat_timings"]
+    assert fields["session_id"] == "s1" and fields["outcome"] == "error"
+    assert "node.retrieval" in fields["stages"]
@@ -0,0 +1,96 @@
+# This test checks that chunk ids depend only on document, page and offset, and that the migration rewrites legacy point ids to them
+
+import uuid
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+
+from src.rag.ingestion import chunking, indexing
+from src.rag.vectorstore import migrations
+
+TEXT = " ".join(f"Sentence number {i} describes part {i} of the onboarding process." for i in range(12))
+
+
+class InMemoryQdrant:
+    def __init__(self):
+        self.points = {}
+
+    def upsert(self, collection_name, points, wait=True):
+        for p in points:
+            self.points[str(p.id)] = SimpleNamespace(id=str(p.id), vector=p.vector, payload=dict(p.payload))
+
+    def scroll(self, collection_name, limit, offset=None, with_payload=True, with_vectors=False):
+        ids = sorted(self.points)
+        start = offset or 0
+        page = [self.points[i] for i in ids[start : start + limit]]
+        return page, (start + limit if start + limit < len(ids) else None)
+
+    def retrieve(self, collection_name, ids, with_payload=True, with_vectors=True):
+        return [self.points[i] for i in ids if i in self.points]
+
+    def delete(self, collection_name, points_selector, wait=True):
+        for i in points_selector.points:
+            self.points.pop(str(i), None)
+
+
+class DummyEmbedder:
+    def embed_documents(self, texts):
+        return [[0.0] * 4 for _ in texts]
+
+
+def _small_chunks(monkeypatch):
+    monkeypatch.setattr(chunking.settings, "CHUNKING_STRATEGY", "recursive")
+    monkeypatch.setattr(chunking.settings, "CHUNK_SIZE", 120)
+    monkeypatch.setattr(chunking.settings, "CHUNK_OVERLAP", 20)
+
+
+def test_chunk_ids_do_not_depend_on_batch_composition(monkeypatch):
+    _small_chunks(monkeypatch)
+    page_a = Document(page_content=TEXT, metadata={"source": "a.txt", "page": 1})
+    page_b = Document(page_content=TEXT.upper(), metadata={"source": "b.txt", "page": 2})
+
+    alone = chunking.chunk_documents([Document(page_content=page_b.page_content, metadata=dict(page_b.metadata))])
+    together = [c for c in chunking.chunk_documents([page_a, page_b]) if c.metadata["source"] == "b.txt"]
+
+    key = lambda c: (c.metadata["chunk_id"], c.metadata["start_index"], c.page_content)
+    assert len(alone) > 1
+    assert [key(c) for c in alone] == [key(c) for c in together]
+    assert [c.metadata["chunk_id"] for c in alone] == list(range(len(alone)))
+
+
+def test_migration_rewrites_legacy_ids_to_the_ingest_ids(monkeypatch, tmp_path):
+    _small_chunks(monkeypatch)
+    path = tmp_path / "guide.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    monkeypatch.setattr(indexing.settings, "DEDUP_ENABLED", False)
+    monkeypatch.setattr(indexing.settings, "QDRANT_VECTOR_DIM", 4)
+    monkeypatch.setattr(indexing, "get_embedding_model", lambda: DummyEmbedder())
+    monkeypatch.setattr(indexing, "ensure_collection", lambda: None)
+
+    fresh = InMemoryQdrant()
+    monkeypatch.setattr(indexing, "get_qdrant_client", lambda: fresh)
+    indexing.index_documents([str(path)])
+
+    legacy = InMemoryQdrant()
+    for p in fresh.points.values():
+        payload = {k: v for k, v in p.payload.items() if k != "start_index"}
+        old_id = str(uuid.uuid5(indexing._CHUNK_UID_NAMESPACE, f"{payload['doc_id']}|{payload['page']}|{payload['chunk_id']}|{payload['text'][:120]}"))
+        legacy.points[old_id] = SimpleNamespace(id=old_id, vector=p.vector, payload={**payload, "chunk_uid": old_id})
+    legacy.points["orphan"] = SimpleNamespace(id="orphan", vector=[0.0] * 4, payload={"source": str(tmp_path / "gone.txt"), "page": 1, "text": "x"})
+    monkeypatch.setattr(migrations, "get_qdrant_client", lambda: legacy)
+
+    planned = migrations.migrate_chunk_ids(batch_size=3, dry_run=True)
+    assert planned.rewritten == len(fresh.points) and "orphan" in legacy.points and len(legacy.points) == len(fresh.points) + 1
+
+    result = migrations.migrate_chunk_ids(batch_size=3)
+
+    assert result.scanned == len(fresh.points) + 1
+    assert result.rewritten == len(fresh.points)
+    assert result.unresolved == 1
+    assert set(legacy.points) == set(fresh.points) | {"orphan"}
+    for point_id, p in fresh.points.items():
+        assert legacy.points[point_id].payload["chunk_uid"] == point_id
+        assert legacy.points[point_id].payload["start_index"] == p.payload["start_index"]
+
+    again = migrations.migrate_chunk_ids(batch_size=3)
+    assert again.rewritten == 0 and again.unchanged == len(fresh.points)
@@ -0,0 +1,84 @@
+# This test checks that identical concurrent questions from sessions without history share one workflow run, and that sessions with history or a newer collection generation do not
+
+import asyncio
+
+import fakeredis
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.graph import coalescing, workflow
+from src.rag.memory import redis_memory
+from src.rag.vectorstore import qdrant_client
+
+
+def test_single_flight_shares_until_generation_bump():
+    calls = []
+
+    async def run(tag):
+        calls.append(tag)
+        await asyncio.sleep(0.05)
+        return tag
+
+    async def scenario():
+        key = coalescing.coalesce_key("What is X?", "docs")
+        same = coalescing.coalesce_key("  what is   x ", "docs")
+        first = await asyncio.gather(coalescing.single_flight(key, lambda: run("a")), coalescing.single_flight(same, lambda: run("b")))
+
+        qdrant_client.bump_collection_generation("docs")
+        fresh = coalescing.coalesce_key("What is X?", "docs")
+        second = await coalescing.single_flight(fresh, lambda: run("c"))
+        return first, second, key != fresh
+
+    first, second, key_changed = asyncio.run(scenario())
+
+    assert first == [("a", False), ("a", True)]
+    assert second == ("c", False)
+    assert key_changed
+    assert calls == ["a", "c"]
+    assert coalescing.inflight_count() == 0
+
+
+class CountingAnswerApp:
+    def __init__(self):
+        self.runs = 0
+
+    async def ainvoke(self, state):
+        self.runs += 1
+        await asyncio.sleep(0.05)
+        return {"answer": "X is a thing.", "citations": [{"source": "doc.pdf"}], "documents": [], "trace": []}
+
+
+def _state(session_id, messages):
+    return {"messages": messages, "trace": [], "question": messages[-1].content, "session_id": session_id, "retry_count": 0}
+
+
+def test_graph_coalesces_fresh_sessions_and_saves_memory_per_session(monkeypatch):
+    client = fakeredis.FakeRedis()
+    answer_app = CountingAnswerApp()
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    monkeypatch.setattr(workflow.settings, "SPECULATIVE_RETRIEVAL", False)
+    monkeypatch.setattr(workflow.settings, "MEMORY_BACKEND", "sync")
+    monkeypatch.setattr(workflow, "get_answer_app", lambda: answer_app)
+    app = workflow.build_graph().compile()
+
+    async def scenario():
+        return await asyncio.gather(
+            app.ainvoke(_state("s1", [HumanMessage(content="What is X?")])),
+            app.ainvoke(_state("s2", [HumanMessage(content="what is x")])),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert answer_app.runs == 1
+    assert [r["answer"] for r in results] == ["X is a thing.", "X is a thing."]
+    assert sorted(r["trace"][-1]["shared"] for r in results) == [False, True]
+    for session_id in ("s1", "s2"):
+        bundle = redis_memory.get_memory_store().load(session_id)
+        assert [m.content for m in bundle.messages][-1] == "X is a thing."
+
+
+def test_session_with_history_is_not_coalesced():
+    history = [HumanMessage(content="Hi"), AIMessage(content="Hello."), HumanMessage(content="What is X?")]
+
+    assert coalescing.is_coalescable(_state("s1", [HumanMessage(content="What is X?")]))
+    assert not coalescing.is_coalescable(_state("s1", history))
+    assert not coalescing.is_coalescable({**_state("s1", [HumanMessage(content="What is X?")]), "memory_summary": "user asked about Y"})
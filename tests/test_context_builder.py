@@ -0,0 +1,96 @@
+# This test checks that prompt context is packed into a token budget by priority and that cached payload token counts are reused
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.rag.llm import context_builder
+from src.rag.llm.context_builder import count_tokens, document_token_count, pack_context, truncate_to_tokens
+
+
+def _offline_tokenizer(monkeypatch):
+    monkeypatch.setattr(context_builder, "_get_encoding", lambda: None)
+
+
+def _words(n: int, word: str = "alpha") -> str:
+    return " ".join([word] * n)
+
+
+def test_truncate_to_tokens_respects_budget(monkeypatch):
+    _offline_tokenizer(monkeypatch)
+    text = _words(50)
+
+    assert count_tokens(text) == 100
+    cut = truncate_to_tokens(text, 21)
+    assert count_tokens(cut) <= 21
+    assert text.startswith(cut)
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_pack_context_priorities_and_budget(monkeypatch):
+    _offline_tokenizer(monkeypatch)
+    history = [
+        SystemMessage(content="Conversation summary (for context):\n" + _words(100), id="memory:summary"),
+        HumanMessage(content=_words(10, "old")),
+        AIMessage(content=_words(10, "older")),
+        HumanMessage(content=_words(5, "newest")),
+    ]
+    docs = [Document(page_content=_words(40, f"doc{i}"), metadata={"source": f"s{i}"}) for i in range(5)]
+
+    packed = pack_context(
+        fixed_text=["system prompt", "question"],
+        documents=docs,
+        history=history,
+        max_tokens=300,
+        history_max_tokens=30,
+        summary_max_tokens=40,
+        max_passages=10,
+        min_passage_tokens=16,
+    )
+
+    assert packed.tokens_used <= 300
+    assert count_tokens(packed.summary.content) <= 40
+    assert [m.content for m in packed.history] == [_words(5, "newest")]
+    assert packed.documents == docs[: len(packed.documents)]
+    assert packed.context_block.startswith("[0] source=s0 page=")
+    assert packed.truncated_documents == 1
+    assert packed.dropped_documents == len(docs) - len(packed.documents)
+
+
+def test_document_token_count_uses_cached_payload_count(monkeypatch):
+    _offline_tokenizer(monkeypatch)
+
+    cached = Document(page_content="alpha beta", metadata={"token_count": 999, "token_encoding": "approx"})
+    stale = Document(page_content="alpha beta", metadata={"token_count": 999, "token_encoding": "o200k_base"})
+
+    assert document_token_count(cached) == 999
+    assert document_token_count(stale) == count_tokens("alpha beta")
+
+
+def test_failed_encoding_load_is_not_cached(monkeypatch):
+    import sys
+    import types
+
+    calls = []
+
+    class FakeEncoding:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+    def get_encoding(name):
+        calls.append(name)
+        if len(calls) == 1:
+            raise OSError("offline")
+        return FakeEncoding()
+
+    monkeypatch.setitem(sys.modules, "tiktoken", types.SimpleNamespace(get_encoding=get_encoding))
+    monkeypatch.setattr(context_builder, "_encoding", None)
+    monkeypatch.setattr(context_builder, "_encoding_failed_at", None)
+
+    assert context_builder.tokenizer_name() == "approx"
+    assert count_tokens("alpha beta") == 3
+    assert len(calls) == 1
+
+    monkeypatch.setattr(context_builder, "_ENCODING_RETRY_S", 0.0)
+    assert context_builder.tokenizer_name() == context_builder.settings.TOKENIZER_ENCODING
+    assert count_tokens("alpha beta") == 2
+    assert len(calls) == 2
@@ -0,0 +1,84 @@
+# This test checks that the fused reasoning mode returns answer + citations in one LLM call and that citation_node validates them without another call
+
+from langchain_core.documents import Document
+
+from src.graph.nodes import reasoning_agent
+from src.graph.nodes.citation_agent import citation_node
+
+
+class DummyLLM:
+    def __init__(self, content):
+        self.content = content
+        self.kwargs = []
+
+    def invoke(self, messages, **kwargs):
+        self.kwargs.append(kwargs)
+        return type("Resp", (), {"content": self.content})
+
+
+DOCS = [Document(page_content="evidence", metadata={"source": "a.txt", "page": 1, "doc_id": "d1"})]
+
+
+def test_fused_reasoning_output_is_used_by_citation_node(monkeypatch):
+    llm = DummyLLM('```json\n{"answer_with_citations": "Claim [0].", "citations": [{"index": 0}]}\n```')
+    monkeypatch.setattr(reasoning_agent, "get_reasoning_llm", lambda: llm)
+    monkeypatch.setattr(reasoning_agent.settings, "REASONING_FUSED_CITATIONS", True)
+
+    def fail():
+        raise AssertionError("citation LLM must not be called")
+
+    monkeypatch.setattr("src.graph.nodes.citation_agent.get_citation_llm", fail)
+
+    state = {"question": "q", "documents": DOCS, "messages": []}
+    reasoned = reasoning_agent.reasoning_node(state)
+
+    assert llm.kwargs == [{"json_mode": True}]
+    assert reasoned["answer"] == "Claim."
+
+    out = citation_node({**state, **reasoned})
+    assert out["answer"] == "Claim [0]."
+    assert [c["doc_id"] for c in out["citations"]] == ["d1"]
+
+
+def test_fused_reasoning_falls_back_to_plain_answer_on_invalid_json(monkeypatch):
+    llm = DummyLLM("Plain answer without JSON.")
+    monkeypatch.setattr(reasoning_agent, "get_reasoning_llm", lambda: llm)
+    monkeypatch.setattr(reasoning_agent.settings, "REASONING_FUSED_CITATIONS", True)
+
+    out = reasoning_agent.reasoning_node({"question": "q", "documents": DOCS, "messages": []})
+    assert out["answer"] == "Plain answer without JSON."
+    assert out["fused_citations"] is None
+
+
+class SequenceLLM(DummyLLM):
+    def __init__(self, *contents):
+        super().__init__(None)
+        self.contents = list(contents)
+
+    def invoke(self, messages, **kwargs):
+        self.kwargs.append(kwargs)
+        return type("Resp", (), {"content": self.contents.pop(0)})
+
+
+def test_truncated_fused_json_recovers_the_answer_field(monkeypatch):
+    llm = SequenceLLM('{"answer_with_citations": "Revenue grew [0]. Costs fell [1')
+    monkeypatch.setattr(reasoning_agent, "get_reasoning_llm", lambda: llm)
+    monkeypatch.setattr(reasoning_agent.settings, "REASONING_FUSED_CITATIONS", True)
+
+    out = reasoning_agent.reasoning_node({"question": "q", "documents": DOCS, "messages": []})
+
+    assert out["answer"] == "Revenue grew. Costs fell"
+    assert out["fused_citations"] is None
+    assert llm.kwargs == [{"json_mode": True}]
+
+
+def test_unusable_fused_json_reruns_the_plain_reasoning_prompt(monkeypatch):
+    llm = SequenceLLM('{"citations": [{"index": 0}', "Plain answer.")
+    monkeypatch.setattr(reasoning_agent, "get_reasoning_llm", lambda: llm)
+    monkeypatch.setattr(reasoning_agent.settings, "REASONING_FUSED_CITATIONS", True)
+
+    out = reasoning_agent.reasoning_node({"question": "q", "documents": DOCS, "messages": []})
+
+    assert out["answer"] == "Plain answer."
+    assert out["fused_citations"] is None
+    assert llm.kwargs == [{"json_mode": True}, {}]
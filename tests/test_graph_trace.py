@@ -0,0 +1,72 @@
+# This test checks that internal agent events go to the bounded trace channel and never reach LLM prompts
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.graph import trace
+from src.graph.nodes import reasoning_agent
+from src.graph.nodes.supervisor import supervisor_node
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages, **kwargs):
+        self.calls.append(messages)
+        return type("Resp", (), {"content": "answer"})
+
+
+def test_trace_reducer_keeps_only_the_latest_events(monkeypatch):
+    monkeypatch.setattr(trace.settings, "GRAPH_TRACE_MAX_EVENTS", 3)
+
+    events = []
+    for i in range(5):
+        events = trace.add_trace(events, [trace.trace_event("node", f"e{i}")])
+
+    assert [e["message"] for e in events] == ["e2", "e3", "e4"]
+
+
+def test_nodes_emit_trace_events_instead_of_messages():
+    out = supervisor_node({"question": "What is the refund policy?", "messages": []})
+
+    assert "messages" not in out
+    assert out["trace"] == [
+        {"agent": "supervisor", "message": "Supervisor decision: plan_and_retrieve", "decision": "plan_and_retrieve"}
+    ]
+
+
+def test_reasoning_prompt_uses_only_user_visible_turns(monkeypatch):
+    llm = RecordingLLM()
+    monkeypatch.setattr(reasoning_agent, "get_reasoning_llm", lambda: llm)
+    monkeypatch.setattr(reasoning_agent.settings, "REASONING_FUSED_CITATIONS", False)
+
+    messages = [
+        HumanMessage(content="earlier question"),
+        AIMessage(content="earlier answer"),
+        AIMessage(content="Supervisor decision: plan_and_retrieve", name="supervisor"),
+        AIMessage(content="Retrieved 3 documents for the query.", name="retrieval_agent"),
+        HumanMessage(content="current question"),
+    ]
+    docs = [Document(page_content="evidence", metadata={"source": "a.txt"})]
+
+    out = reasoning_agent.reasoning_node({"question": "current question", "documents": docs, "messages": messages})
+
+    sent = [m.content for m in llm.calls[0][1:-1]]
+    assert sent == ["earlier question", "earlier answer", "current question"]
+    assert "messages" not in out
+    assert out["trace"][0]["agent"] == "reasoning_agent"
+
+
+def test_refused_turn_is_traced_with_its_intent():
+    from src.graph.nodes.refuse import refuse_node
+
+    state = {"question": "Tell me a joke", "messages": []}
+    state.update(supervisor_node(state))
+    out = refuse_node(state)
+
+    assert state["supervisor_decision"] == "refuse"
+    [event] = out["trace"]
+    assert event["agent"] == "refuse"
+    assert event["intent"] == state["intent"]["intent"] == "out_of_scope"
+    assert event["source"] == "pattern"
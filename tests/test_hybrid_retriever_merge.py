@@ -28,3 +28,33 @@ def test_hybrid_retriever_dedup_by_chunk_uid_and_fallback_key(monkeypatch):
     out = r.retrieve("alpha")
     assert len(out) == 3
     assert sum(1 for d in out if (d.metadata or {}).get("chunk_uid") == "u1") == 1
+
+
+def test_retrieve_many_embeds_once_and_fuses_sub_queries_with_rrf(monkeypatch):
+    """
+    Sub-queries are embedded in a single batch, searched separately, and fused with RRF so that chunks found by several sub-queries rank first.
+    """
+    from src.rag.retrieval import hybrid_retriever
+
+    batches = []
+
+    class DummyEmbedder:
+        def embed_documents(self, texts):
+            batches.append(list(texts))
+            return [[float(i)] for i, _ in enumerate(texts)]
+
+    dense_by_vec = {
+        0.0: [Document(page_content="shared", metadata={"chunk_uid": "u1"}), Document(page_content="a", metadata={"chunk_uid": "u2"})],
+        1.0: [Document(page_content="b", metadata={"chunk_uid": "u3"}), Document(page_content="shared", metadata={"chunk_uid": "u1"})],
+    }
+
+    monkeypatch.setattr(hybrid_retriever, "get_embedding_model", lambda: DummyEmbedder())
+    monkeypatch.setattr(HybridRetriever, "_dense_search_by_vector", lambda self, v, f: dense_by_vec[v[0]])
+    monkeypatch.setattr(HybridRetriever, "_lexical_search", lambda self, q, f: [])
+
+    r = HybridRetriever(collection_name="documents", top_k=10)
+    out = r.retrieve_many(["question", "sub question"])
+
+    assert batches == [["question", "sub question"]]
+    assert [d.metadata["chunk_uid"] for d in out] == ["u1", "u3", "u2"]
+    assert out[0].metadata["fused_score"] > out[1].metadata["fused_score"]
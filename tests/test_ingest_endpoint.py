@@ -0,0 +1,35 @@
+# This test checks that /ingest indexes the paths exactly once and off the event loop thread
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api.routers import ingest
+from src.rag.ingestion.indexing import IngestionResult
+
+
+def test_ingest_indexes_once_on_the_threadpool(monkeypatch):
+    calls = []
+
+    def fake_index_documents(paths):
+        calls.append((list(paths), threading.current_thread().name))
+        return IngestionResult(indexed_files=list(paths), documents_loaded=1, chunks_indexed=3, points_upserted=3)
+
+    monkeypatch.setattr(ingest, "index_documents", fake_index_documents)
+    app = FastAPI()
+    app.include_router(ingest.router)
+    loop_thread = {}
+
+    @app.get("/loop-thread")
+    async def _loop_thread():
+        loop_thread["name"] = threading.current_thread().name
+        return {}
+
+    client = TestClient(app)
+    client.get("/loop-thread")
+    body = client.post("/ingest/", json={"paths": ["a.txt"]}).json()
+
+    assert body["chunks_indexed"] == 3
+    assert len(calls) == 1
+    assert calls[0][1] != loop_thread["name"]
@@ -0,0 +1,57 @@
+# This test checks that the supervisor's local intent classifier routes smalltalk, meta, history and out-of-scope questions away from retrieval, and that the embedding fallback reuses the cached query embedding
+
+import numpy as np
+import pytest
+
+from src.graph import intent as intent_module
+from src.graph.nodes.supervisor import decide_next_step
+from src.rag.retrieval import hybrid_retriever
+
+
+@pytest.mark.parametrize(
+    "question, decision",
+    [
+        ("", "clarify"),
+        ("Thanks so much!", "answer_directly"),
+        ("how are you?", "answer_directly"),
+        ("What can you do?", "answer_directly"),
+        ("What did I ask you before?", "answer_directly"),
+        ("Tell me a joke", "refuse"),
+        ("write me a poem about autumn", "refuse"),
+        ("Hi, what was the Q3 revenue growth?", "plan_and_retrieve"),
+        ("What does the report say about code quality?", "plan_and_retrieve"),
+        ("Which incidents involved a password breach?", "plan_and_retrieve"),
+    ],
+)
+def test_pattern_routing(question, decision):
+    assert decide_next_step({"question": question, "messages": []}) == decision
+
+
+class KeywordEmbedder:
+    """Two-dimensional embedding: axis 0 for leisure words (every out-of-scope exemplar has one), axis 1 for everything else."""
+
+    LEISURE = ("joke", "poem", "weather", "football", "recipe", "rain")
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[1.0, 0.1] if any(w in t for w in self.LEISURE) else [0.1, 1.0] for t in texts]
+
+
+def test_embedding_fallback_reuses_query_embedding(monkeypatch):
+    embedder = KeywordEmbedder()
+    monkeypatch.setattr(intent_module, "get_embedding_model", lambda: embedder)
+    monkeypatch.setattr(hybrid_retriever, "get_embedding_model", lambda: embedder)
+    monkeypatch.setattr(intent_module.settings, "INTENT_EMBEDDING_ENABLED", True)
+    monkeypatch.setattr(intent_module.settings, "INTENT_EMBEDDING_MIN_SCORE", 0.9)
+
+    question = "will it rain at the offsite"
+    vector = hybrid_retriever.embed_query(question)
+    result = intent_module.classify_intent(question)
+
+    assert np.allclose(vector, [1.0, 0.1])
+    assert result.intent == "out_of_scope" and result.source == "embedding"
+    assert [call for call in embedder.calls if call == [question]] == [[question]]
+    assert intent_module.classify_intent("list the onboarding steps").intent == "document"
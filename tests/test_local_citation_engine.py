@@ -0,0 +1,59 @@
+# This test checks that the local citation engine attaches markers without an LLM call when the answer is well supported, and defers to the LLM otherwise
+
+from langchain_core.documents import Document
+
+from src.graph.nodes.citation_agent import citation_node
+from src.rag.citation.local_citer import cite_answer_locally
+
+
+DOCS = [
+    Document(
+        page_content="The Transformer relies entirely on attention mechanisms and dispenses with recurrence.",
+        metadata={"source": "paper.pdf", "page": 1, "doc_id": "d1"},
+    ),
+    Document(
+        page_content="Quarterly revenue grew twelve percent driven by cloud subscriptions in Europe.",
+        metadata={"source": "report.txt", "page": 1, "doc_id": "d2"},
+    ),
+]
+
+
+def test_cite_answer_locally_marks_best_supporting_passage():
+    answer = "Revenue grew twelve percent thanks to cloud subscriptions. The Transformer relies entirely on attention."
+    out = cite_answer_locally(answer, DOCS, max_docs=10, min_sentence_score=0.5)
+
+    assert out.answer_with_citations == (
+        "Revenue grew twelve percent thanks to cloud subscriptions [1]. The Transformer relies entirely on attention [0]."
+    )
+    assert out.citations == [{"index": 1}, {"index": 0}]
+    assert out.confidence == 1.0
+
+
+def test_citation_node_skips_llm_when_local_confidence_is_high(monkeypatch):
+    def fail():
+        raise AssertionError("citation LLM must not be called")
+
+    monkeypatch.setattr("src.graph.nodes.citation_agent.get_citation_llm", fail)
+
+    state = {"answer": "The Transformer dispenses with recurrence entirely.", "documents": DOCS}
+    out = citation_node(state)
+
+    assert out["answer"] == "The Transformer dispenses with recurrence entirely [0]."
+    assert [c["doc_id"] for c in out["citations"]] == ["d1"]
+
+
+def test_citation_node_falls_back_to_llm_when_local_confidence_is_low(monkeypatch):
+    calls = []
+
+    class DummyLLM:
+        def invoke(self, messages):
+            calls.append(messages)
+            return type("Resp", (), {"content": '{"answer_with_citations": "Unrelated claim here [1]", "citations": [{"index": 1}]}'})
+
+    monkeypatch.setattr("src.graph.nodes.citation_agent.get_citation_llm", lambda: DummyLLM())
+
+    state = {"answer": "Penguins migrate across Antarctic ice shelves.", "documents": DOCS}
+    out = citation_node(state)
+
+    assert len(calls) == 1
+    assert out["citations"][0]["index"] == 1
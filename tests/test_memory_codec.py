@@ -0,0 +1,55 @@
+# This test checks that the compact memory codec round-trips messages, compresses large sessions, and still reads the legacy JSON formats
+
+import json
+
+import fakeredis
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, messages_to_dict
+
+from src.rag.memory import redis_memory
+from src.rag.memory.codec import FLAG_ZSTD, MAGIC, decode_messages, encode_messages
+
+
+MESSAGES = [
+    SystemMessage(content="Conversation summary"),
+    HumanMessage(content="What was Q2 revenue?"),
+    AIMessage(content="Revenue grew 12% [0].", name="direct_answer"),
+]
+
+
+def test_msgpack_round_trip_is_smaller_than_json():
+    packed = encode_messages(MESSAGES, codec="msgpack", compress_min_bytes=0)
+    legacy = encode_messages(MESSAGES, codec="json")
+
+    assert packed.startswith(MAGIC)
+    assert len(packed) < len(legacy.encode("utf-8")) / 3
+    decoded = decode_messages(packed)
+    assert [(type(m), m.content, m.name) for m in decoded] == [(type(m), m.content, m.name) for m in MESSAGES]
+
+
+def test_large_sessions_are_zstd_compressed():
+    messages = [HumanMessage(content="the same boilerplate disclaimer " * 40) for _ in range(6)]
+    packed = encode_messages(messages, codec="msgpack", compress_min_bytes=512)
+
+    assert packed[len(MAGIC) + 1] & FLAG_ZSTD
+    assert [m.content for m in decode_messages(packed)] == [m.content for m in messages]
+
+
+def test_decoder_reads_legacy_json_values():
+    as_text = json.dumps(messages_to_dict(MESSAGES))
+    assert [m.content for m in decode_messages(as_text)] == [m.content for m in MESSAGES]
+    assert [m.content for m in decode_messages(as_text.encode("utf-8"))] == [m.content for m in MESSAGES]
+
+
+def test_store_reads_legacy_session_after_switching_codec(monkeypatch):
+    client = fakeredis.FakeRedis()
+    client.set("chat:s1:messages", json.dumps(messages_to_dict(MESSAGES[1:])))
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    monkeypatch.setattr(redis_memory.settings, "MEMORY_CODEC", "msgpack")
+
+    _, msgs = redis_memory.load_memory_bundle_from_redis("s1")
+    redis_memory.save_memory_bundle_to_redis("s1", summary="s", messages=msgs + [HumanMessage(content="next")])
+
+    assert client.get("chat:s1:messages").startswith(MAGIC)
+    summary, msgs = redis_memory.load_memory_bundle_from_redis("s1")
+    assert summary == "s"
+    assert [m.content for m in msgs] == ["What was Q2 revenue?", "Revenue grew 12% [0].", "next"]
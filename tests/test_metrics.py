@@ -0,0 +1,44 @@
+# This test checks that instrumented nodes feed the Prometheus histograms and the per-request timing breakdown
+
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from src.app.core import metrics
+
+
+def _node_count(node: str) -> float:
+    return REGISTRY.get_sample_value("rag_node_duration_seconds_count", {"node": node}) or 0.0
+
+
+def test_instrumented_nodes_record_histograms_and_request_breakdown():
+    def sync_node(state):
+        metrics.record_llm_tokens("fake", 12, 3)
+        metrics.record_cache("speculative_retrieval", hit=True)
+        return {"answer": "ok"}
+
+    async def async_node(state):
+        return {"messages": []}
+
+    before = _node_count("test_sync"), _node_count("test_async")
+    timings = metrics.start_request_timings()
+
+    assert metrics.instrument_node("test_sync", sync_node)({}) == {"answer": "ok"}
+    assert asyncio.run(metrics.instrument_node("test_async", async_node)({})) == {"messages": []}
+
+    assert (_node_count("test_sync"), _node_count("test_async")) == (before[0] + 1, before[1] + 1)
+
+    summary = timings.summary()
+    assert set(summary["stages"]) == {"node.test_sync", "node.test_async"}
+    assert summary["counters"] == {
+        "llm_prompt_tokens": 12,
+        "llm_completion_tokens": 3,
+        "cache_speculative_retrieval_hit": 1,
+    }
+
+
+def test_metrics_payload_is_prometheus_text():
+    body, content_type = metrics.metrics_payload()
+
+    assert content_type.startswith("text/plain")
+    assert b"rag_node_duration_seconds" in body
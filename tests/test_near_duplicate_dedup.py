@@ -0,0 +1,131 @@
+# This test checks that near-duplicate chunks are folded into one canonical point at ingest (stored as references) and collapsed in retrieval results
+
+from langchain_core.documents import Document
+
+from src.rag.ingestion import dedup, indexing
+from src.rag.retrieval.hybrid_retriever import HybridRetriever
+
+DISCLAIMER = (
+    "This document contains confidential information intended only for the named recipient. If you are not the intended "
+    "recipient you must not copy, distribute or act on it, and you should notify the sender and delete all copies immediately."
+)
+DISCLAIMER_VARIANT = DISCLAIMER.replace("immediately", "immediately thereafter")
+OTHER = "Quarterly revenue grew by twelve percent, driven by new enterprise customers in the northern region and higher renewals."
+
+
+def test_minhash_estimates_jaccard_deterministically():
+    a, b, c = dedup.minhash(DISCLAIMER), dedup.minhash(DISCLAIMER_VARIANT), dedup.minhash(OTHER)
+
+    assert (dedup.minhash(DISCLAIMER) == a).all()
+    assert dedup.jaccard_estimate(a, b) >= 0.8
+    assert dedup.jaccard_estimate(a, c) < 0.2
+
+
+class DummyQdrantClient:
+    def __init__(self):
+        self.points = []
+
+    def upsert(self, collection_name, points, wait=True):
+        self.points.extend(points)
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [[0.0] * 4 for _ in texts]
+
+
+def test_index_documents_stores_duplicates_as_references(monkeypatch):
+    client, embedder = DummyQdrantClient(), CountingEmbedder()
+
+    def fake_load_any(path):
+        return [Document(page_content=path, metadata={"source": path, "page": 1, "type": "txt"})]
+
+    def fake_chunk_documents(docs):
+        body = OTHER if docs[0].metadata["source"] == "/tmp/a.txt" else OTHER.replace("northern", "southern western")
+        disclaimer = DISCLAIMER if docs[0].metadata["source"] == "/tmp/a.txt" else DISCLAIMER_VARIANT
+        return [
+            Document(page_content=body, metadata={**docs[0].metadata, "chunk_id": 0}),
+            Document(page_content=disclaimer, metadata={**docs[0].metadata, "chunk_id": 1}),
+        ]
+
+    monkeypatch.setattr(indexing, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(indexing, "ensure_collection", lambda: None)
+    monkeypatch.setattr(indexing, "load_any", fake_load_any)
+    monkeypatch.setattr(indexing, "chunk_documents", fake_chunk_documents)
+    monkeypatch.setattr(indexing, "get_embedding_model", lambda: embedder)
+    monkeypatch.setattr(indexing.settings, "QDRANT_VECTOR_DIM", 4)
+    monkeypatch.setattr(dedup.settings, "DEDUP_NEAR_DUPLICATES", True)
+
+    result = indexing.index_documents(["/tmp/a.txt", "/tmp/b.txt"])
+
+    assert result.chunks_indexed == 4
+    assert result.points_upserted == 3
+    assert result.duplicates_folded == 1
+    assert len(embedder.texts) == 3
+    canonical = next(p for p in client.points if p.payload["text"] == DISCLAIMER)
+    assert canonical.payload["duplicates"] == [
+        {"source": "/tmp/b.txt", "source_name": "b.txt", "doc_id": indexing._sha1("/tmp/b.txt"), "page": 1, "chunk_id": 1}
+    ]
+
+
+def test_retrieve_collapses_near_duplicates_and_refills_top_k(monkeypatch):
+    monkeypatch.setattr(dedup.settings, "DEDUP_NEAR_DUPLICATES", True)
+    dense = [
+        Document(page_content=DISCLAIMER, metadata={"chunk_uid": "u1"}),
+        Document(page_content=DISCLAIMER_VARIANT, metadata={"chunk_uid": "u2"}),
+        Document(page_content=OTHER, metadata={"chunk_uid": "u3"}),
+    ]
+    monkeypatch.setattr(HybridRetriever, "_dense_search", lambda self, q, f: dense)
+    monkeypatch.setattr(HybridRetriever, "_lexical_search", lambda self, q, f: [])
+
+    out = HybridRetriever(collection_name="documents", top_k=2).retrieve("confidential recipient revenue")
+
+    uids = [d.metadata["chunk_uid"] for d in out]
+    assert len(uids) == 2 and "u3" in uids and ("u1" in uids) != ("u2" in uids)
+    kept = next(d for d in out if d.metadata["chunk_uid"] != "u3")
+    assert len(kept.metadata["duplicates"]) == 1
+
+
+REPORT = (
+    "In the {period} quarter the northern region reported revenue of {revenue} million euros, up from the previous quarter, "
+    "with operating margin holding steady and headcount unchanged. Renewals remained the main driver of growth, while new "
+    "enterprise customers contributed a smaller share than planned. The board approved the budget for the next quarter."
+)
+
+
+def test_template_chunks_with_different_figures_are_not_folded(monkeypatch):
+    q3 = Document(page_content=REPORT.format(period="third", revenue="41.2"), metadata={"source": "q3.pdf"})
+    q4 = Document(page_content=REPORT.format(period="fourth", revenue="47.9"), metadata={"source": "q4.pdf"})
+    q4_copy = Document(page_content=q4.page_content, metadata={"source": "q4-copy.pdf"})
+
+    assert dedup.jaccard_estimate(dedup.minhash(q3.page_content), dedup.minhash(q4.page_content)) >= 0.5
+
+    default = dedup.dedup_chunks([q3, q4, q4_copy])
+    assert [d.metadata["source"] for d in default.canonical] == ["q3.pdf", "q4.pdf"]
+    assert default.duplicates == {1: [q4_copy]}
+
+    monkeypatch.setattr(dedup.settings, "DEDUP_NEAR_DUPLICATES", True)
+    monkeypatch.setattr(dedup.settings, "DEDUP_MIN_JACCARD", 0.5)
+    near = dedup.dedup_chunks([q3, q4])
+    assert [d.metadata["source"] for d in near.canonical] == ["q3.pdf", "q4.pdf"]
+    assert [d.metadata["source"] for d in dedup.collapse_near_duplicates([q3, q4])] == ["q3.pdf", "q4.pdf"]
+
+
+def test_citations_name_the_folded_copies():
+    from src.graph.nodes.citation_agent import _normalize_and_enrich_citations
+
+    ref = {"source": "/tmp/b.txt", "source_name": "b.txt", "doc_id": "x", "page": 1, "chunk_id": 1}
+    docs = [
+        Document(page_content=OTHER, metadata={"source": "/tmp/a.txt", "page": 1}),
+        Document(page_content=DISCLAIMER, metadata={"source": "/tmp/a.txt", "page": 2, "duplicates": [ref]}),
+    ]
+
+    plain, folded = _normalize_and_enrich_citations([{"index": 0}, {"index": 1}], docs)
+
+    assert "duplicates" not in plain
+    assert folded["source_name"] == "a.txt"
+    assert folded["duplicates"] == [{"source": "/tmp/b.txt", "source_name": "b.txt", "page": 1}]
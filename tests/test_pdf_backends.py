@@ -0,0 +1,70 @@
+# This test checks that every PDF backend extracts docs/document.pdf page by page, that the worker pool yields the same pages in order, and that concurrent jobs share one pool
+
+from pathlib import Path
+
+import pytest
+
+from src.rag.ingestion import loaders
+from src.rag.ingestion.pdf_backends import PDF_BACKENDS, get_pdf_backend, iter_page_texts
+
+SAMPLE_PDF = str(Path(__file__).resolve().parent.parent / "docs" / "document.pdf")
+
+
+@pytest.mark.parametrize("backend", list(PDF_BACKENDS))
+def test_backends_extract_every_page_lazily(monkeypatch, backend):
+    pytest.importorskip(backend)
+    monkeypatch.setattr(loaders.settings, "PDF_BACKEND", backend)
+    monkeypatch.setattr(loaders.settings, "PDF_WORKERS", 0)
+
+    pages = loaders.iter_pdf_pages(SAMPLE_PDF)
+    first = next(pages)
+    rest = list(pages)
+
+    assert first.metadata == {"source": SAMPLE_PDF, "source_name": "document.pdf", "page": 0, "type": "pdf"}
+    assert "Attention Is All You Need" in first.page_content
+    assert [d.metadata["page"] for d in rest] == list(range(1, len(rest) + 1))
+    assert len(rest) + 1 == get_pdf_backend(backend).page_count(SAMPLE_PDF)
+
+
+def test_worker_pool_matches_in_process_extraction():
+    pytest.importorskip("pypdfium2")
+    serial = list(iter_page_texts(SAMPLE_PDF, "pypdfium2"))
+    pooled = list(iter_page_texts(SAMPLE_PDF, "pypdfium2", workers=2, min_parallel_pages=2, pages_per_task=3))
+
+    assert pooled == serial
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_pdf_backend("ocr")
+
+
+def test_concurrent_jobs_share_one_pool(monkeypatch):
+    import threading
+    import time
+
+    from src.rag.ingestion import pdf_backends
+
+    created = []
+
+    class SlowPool:
+        def __init__(self, max_workers, mp_context):
+            time.sleep(0.05)
+            created.append(self)
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(pdf_backends, "ProcessPoolExecutor", SlowPool)
+    monkeypatch.setattr(pdf_backends, "_pool", None)
+    monkeypatch.setattr(pdf_backends, "_pool_workers", 0)
+
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(pdf_backends._get_pool(2))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(p is created[0] for p in pools)
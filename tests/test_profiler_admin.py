@@ -0,0 +1,70 @@
+# This test checks that the admin profiler is token-guarded and captures sampled or cProfile results for armed ingestion/chat runs
+
+import marshal
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api.routers import admin
+from src.app.core import profiling
+
+
+def busy_ingestion_step(seconds=0.2):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", "secret")
+    profiling.stop_session()
+    app = FastAPI()
+    app.include_router(admin.router)
+    yield TestClient(app)
+    profiling.stop_session()
+
+
+def test_admin_endpoints_require_the_token(client, monkeypatch):
+    assert client.get("/admin/profiler/status").status_code == 401
+    assert client.get("/admin/profiler/status", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", None)
+    assert client.get("/admin/profiler/status", headers={"X-Admin-Token": "secret"}).status_code == 403
+
+
+def test_sampling_session_profiles_the_next_ingestion_job(client):
+    headers = {"X-Admin-Token": "secret"}
+    started = client.post("/admin/profiler/start", json={"mode": "sampling", "trigger": "ingest", "interval_ms": 2}, headers=headers)
+    assert started.status_code == 200
+    assert client.post("/admin/profiler/start", json={"trigger": "ingest"}, headers=headers).status_code == 409
+
+    with profiling.profiled("ingest"):
+        busy_ingestion_step()
+
+    status = client.get("/admin/profiler/status", headers=headers).json()
+    assert status["active"] is False
+    assert status["last_result"]["runs"] == 1
+
+    collapsed = client.get("/admin/profiler/result", params={"format": "collapsed"}, headers=headers).text
+    assert "busy_ingestion_step" in collapsed
+
+    speedscope = client.get("/admin/profiler/result", params={"format": "speedscope"}, headers=headers).json()
+    assert speedscope["profiles"][0]["type"] == "sampled"
+
+
+def test_cprofile_session_exports_pstats(client):
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post("/admin/profiler/start", json={"mode": "cprofile", "trigger": "chat"}, headers=headers).status_code == 400
+    client.post("/admin/profiler/start", json={"mode": "cprofile", "trigger": "ingest"}, headers=headers)
+
+    with profiling.profiled("ingest"):
+        busy_ingestion_step(0.01)
+
+    raw = client.get("/admin/profiler/result", params={"format": "pstats"}, headers=headers).content
+    assert any(func == "busy_ingestion_step" for (_, _, func) in marshal.loads(raw))
+    assert client.get("/admin/profiler/result", params={"format": "collapsed"}, headers=headers).status_code == 400
@@ -0,0 +1,66 @@
+# This test checks the query planner strategies: rule-based plans skip the LLM, and concurrent planning fuses the plan's sub-questions with documents prefetched on the raw question
+
+from langchain_core.documents import Document
+
+from src.graph.nodes import query_planner
+from src.graph.nodes.retrieval_agent import retrieval_node
+from src.rag.retrieval.query_planning import is_simple_query, parse_sub_queries, rule_based_query
+
+
+class DummyLLM:
+    def invoke(self, messages):
+        return type("Resp", (), {"content": "- sub question one\n- sub question two"})
+
+
+class DummyRetriever:
+    def __init__(self):
+        self.queries = []
+
+    def retrieve(self, query, filters=None):
+        self.queries.append(query)
+        return [Document(page_content="hit", metadata={"chunk_uid": "u1"})]
+
+    def retrieve_many(self, queries, filters=None, prefetched=None):
+        self.queries.append(tuple(queries))
+        return list(prefetched or []) + [Document(page_content="sub hit", metadata={"chunk_uid": "u2"})]
+
+
+def test_simple_query_detection_and_acronym_expansion():
+    assert is_simple_query("What was the Q2 KPI target?")
+    assert not is_simple_query("Compare the revenue of 2023 versus 2024 and explain the drivers.")
+    assert rule_based_query("What is our KPI?") == "What is our KPI? (key performance indicator)"
+
+
+def test_rule_strategy_does_not_call_llm(monkeypatch):
+    def fail():
+        raise AssertionError("planner LLM must not be called")
+
+    monkeypatch.setattr(query_planner, "get_planner_llm", fail)
+    monkeypatch.setattr(query_planner.settings, "QUERY_PLANNER_STRATEGY", "auto")
+
+    out = query_planner.query_planner_node({"question": "What is the ROI of project X?", "messages": [], "retry_count": 0})
+    assert out["plan"].startswith("Keywords: roi, project")
+    assert out["retrieval_query"] == "What is the ROI of project X? (return on investment)"
+
+
+def test_concurrent_strategy_fuses_plan_sub_queries_with_prefetched_raw_question(monkeypatch):
+    retriever = DummyRetriever()
+    monkeypatch.setattr(query_planner, "get_planner_llm", lambda: DummyLLM())
+    monkeypatch.setattr(query_planner, "get_hybrid_retriever", lambda: retriever)
+    monkeypatch.setattr(query_planner.settings, "QUERY_PLANNER_STRATEGY", "concurrent")
+
+    state = {"question": "raw question", "messages": [], "retry_count": 0}
+    planned = query_planner.query_planner_node(state)
+
+    assert retriever.queries == ["raw question", ("sub question one", "sub question two")]
+    assert planned["plan"].startswith("- sub question one")
+
+    out = retrieval_node({**state, **planned})
+    assert [d.metadata["chunk_uid"] for d in out["documents"]] == ["u1", "u2"]
+    assert out["prefetched_documents"] is None
+    assert len(retriever.queries) == 2
+
+
+def test_parse_sub_queries_from_llm_plan():
+    plan = "Restate: revenue drivers.\n1. What was revenue in 2024?\n- Which regions grew fastest\n* ok"
+    assert parse_sub_queries(plan) == ["What was revenue in 2024?", "Which regions grew fastest"]
@@ -0,0 +1,131 @@
+# This test checks that a chat turn costs one pipelined Redis read and one atomic write, and that injected memory is not persisted twice, and that non-ASCII summaries survive trimming
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.graph.nodes.memory_agent import load_memory_node, save_memory_node
+from src.rag.memory import redis_memory
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pipelines = []
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        self.pipelines.append(transaction)
+        return super().pipeline(transaction=transaction, shard_hint=shard_hint)
+
+
+def test_turn_uses_one_read_and_one_atomic_write(monkeypatch):
+    client = CountingRedis(decode_responses=False)
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+
+    redis_memory.save_memory_bundle_to_redis(
+        "s1", summary="", messages=[HumanMessage(content="earlier"), AIMessage(content="reply")]
+    )
+    client.pipelines.clear()
+
+    state = {"session_id": "s1", "messages": [HumanMessage(content="new question")], "answer": "new answer"}
+    state.update(load_memory_node(state))
+    save_memory_node(state)
+
+    assert client.pipelines == [False, True]
+
+    _, stored = redis_memory.load_memory_bundle_from_redis("s1")
+    assert [m.content for m in stored] == ["earlier", "reply", "new question", "new answer"]
+
+
+def test_list_layout_appends_new_messages_and_trims_overflow_into_summary(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    store = redis_memory.RedisListMemoryStore()
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    monkeypatch.setattr(redis_memory, "get_memory_store", lambda: store)
+    monkeypatch.setattr("src.graph.nodes.memory_agent.get_memory_store", lambda: store)
+    monkeypatch.setattr(redis_memory.settings, "MEMORY_MAX_MESSAGES", 3)
+
+    for i in range(3):
+        state = {"session_id": "s2", "messages": [HumanMessage(content=f"q{i}")], "answer": f"a{i}"}
+        state.update(load_memory_node(state))
+        save_memory_node(state)
+
+    assert client.llen("chat:s2:log") == 3
+    summary, stored = redis_memory.load_memory_bundle_from_redis("s2")
+    assert [m.content for m in stored] == ["a1", "q2", "a2"]
+    assert summary == "- User: q0\n- Assistant: a0\n- User: q1"
+
+
+class ReadFailingRedis(fakeredis.FakeRedis):
+    def pipeline(self, transaction=True, shard_hint=None):
+        if not transaction:
+            raise redis_memory.redis.ConnectionError("read failed")
+        return super().pipeline(transaction=transaction, shard_hint=shard_hint)
+
+
+def test_failed_load_does_not_clobber_stored_memory(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    redis_memory.save_memory_bundle_to_redis(
+        "s3", summary="- User: first", messages=[HumanMessage(content="earlier"), AIMessage(content="reply")]
+    )
+    before = (client.get("chat:s3:summary"), client.get("chat:s3:messages"))
+
+    failing = ReadFailingRedis(server=client.connection_pool.connection_kwargs["server"], decode_responses=False)
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: failing)
+    state = {"session_id": "s3", "messages": [HumanMessage(content="new question")], "answer": "new answer"}
+    update = load_memory_node(state)
+    state.update(update)
+    save_memory_node(state)
+
+    assert "memory_summary" not in update and "memory_messages" not in update
+    assert (client.get("chat:s3:summary"), client.get("chat:s3:messages")) == before
+
+
+def test_blob_session_migrated_to_list_layout_keeps_summary_lines(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    redis_memory.RedisMemoryStore().save("s4", summary="", messages=[HumanMessage(content="q0"), AIMessage(content="a0")])
+
+    store = redis_memory.RedisListMemoryStore()
+    monkeypatch.setattr("src.graph.nodes.memory_agent.get_memory_store", lambda: store)
+    monkeypatch.setattr(redis_memory.settings, "MEMORY_MAX_MESSAGES", 3)
+
+    state = {"session_id": "s4", "messages": [HumanMessage(content="q1")], "answer": "a1"}
+    state.update(load_memory_node(state))
+    save_memory_node(state)
+
+    bundle = store.load("s4")
+    assert [m.content for m in bundle.messages] == ["a0", "q1", "a1"]
+    assert bundle.summary == "- User: q0"
+
+
+@pytest.mark.parametrize("summary_max", [40, 41, 42, 43])
+def test_non_ascii_summary_overflow_is_cut_on_a_character_boundary(monkeypatch, summary_max):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    store = redis_memory.RedisListMemoryStore()
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    monkeypatch.setattr("src.graph.nodes.memory_agent.get_memory_store", lambda: store)
+    monkeypatch.setattr(redis_memory.settings, "MEMORY_MAX_MESSAGES", 2)
+    monkeypatch.setattr(redis_memory.settings, "MEMORY_SUMMARY_MAX_CHARS", summary_max)
+
+    for i in range(3):
+        state = {"session_id": "s5", "messages": [HumanMessage(content=f"{i} " + "é" * 30)], "answer": f"réponse été {i}"}
+        state.update(load_memory_node(state))
+        save_memory_node(state)
+
+    bundle = store.load("s5")
+    assert bundle.loaded
+    assert bundle.summary.startswith("- User: 0 éé") and bundle.summary.endswith("...")
+    assert "�" not in bundle.summary and len(bundle.summary.encode("utf-8")) <= summary_max
+    assert [m.content for m in bundle.messages] == ["2 " + "é" * 30, "réponse été 2"]
+
+
+def test_invalid_utf8_summary_does_not_make_the_session_unloadable(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=False)
+    monkeypatch.setattr(redis_memory, "_get_redis_client", lambda: client)
+    client.set("chat:s6:summary", "- User: été".encode("utf-8")[:-1])
+
+    bundle = redis_memory.RedisListMemoryStore().load("s6")
+
+    assert bundle.loaded and bundle.summary == "- User: ét�"
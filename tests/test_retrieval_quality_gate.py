@@ -0,0 +1,79 @@
+# This test checks that the retrieval quality gate decides on dense scores: continue on strong evidence, answer "not found" without reasoning, and retry once with a local rewrite
+
+import asyncio
+
+from langchain_core.documents import Document
+
+from src.graph import workflow
+from src.graph.nodes import retrieval_agent
+from src.graph.nodes.not_found import NOT_FOUND_ANSWER
+from src.graph.nodes.retrieval_quality_gate import quality_gate_node
+
+
+def _doc(uid, score):
+    return Document(page_content=f"text {uid}", metadata={"chunk_uid": uid, "dense_score": score})
+
+
+def _gate(docs, **state):
+    base = {"question": "What is the ARR growth of the company?", "documents": docs, "retry_count": 0}
+    update = quality_gate_node({**base, **state})
+    return update, workflow.quality_gate_router(update)
+
+
+def test_strong_evidence_continues_and_irrelevant_evidence_is_not_found():
+    update, route = _gate([_doc("u1", 0.82), _doc("u2", 0.31)])
+    assert route == "continue"
+
+    update, route = _gate([_doc(f"u{i}", 0.2) for i in range(8)])
+    assert route == "not_found"
+    assert update["trace"][0]["best_score"] == 0.2
+
+
+def test_weak_evidence_retries_once_with_local_rewrite():
+    update, route = _gate([_doc("u1", 0.5), _doc("u2", 0.45)])
+
+    assert route == "retry"
+    assert update["retry_count"] == 1
+    assert update["retrieval_query"] == "arr growth company annual recurring revenue"
+
+    _, route = _gate([_doc("u1", 0.5)], retry_count=1, retrieval_query=update["retrieval_query"])
+    assert route == "not_found"
+
+
+def test_retry_merges_with_previous_attempt(monkeypatch):
+    class Retriever:
+        def retrieve(self, query, filters=None):
+            return [_doc("u3", 0.4)]
+
+    monkeypatch.setattr(retrieval_agent, "get_hybrid_retriever", lambda: Retriever())
+    state = {"question": "q", "retrieval_query": "rewrite", "gate_decision": "retry", "documents": [_doc("u1", 0.6)]}
+
+    out = retrieval_agent.retrieval_node(state)
+
+    assert [d.metadata["chunk_uid"] for d in out["documents"]] == ["u1", "u3"]
+
+
+def test_not_found_path_skips_reasoning(monkeypatch):
+    class Retriever:
+        def __init__(self):
+            self.queries = []
+
+        def retrieve(self, query, filters=None):
+            self.queries.append(query)
+            return [_doc("u1", 0.2)]
+
+    def fail(state):
+        raise AssertionError("reasoning must not run")
+
+    retriever = Retriever()
+    monkeypatch.setattr(retrieval_agent, "get_hybrid_retriever", lambda: retriever)
+    monkeypatch.setattr(workflow, "supervisor_node", lambda state: {"supervisor_decision": "plan_and_retrieve"})
+    monkeypatch.setattr(workflow, "query_planner_node", lambda state: {"plan": "p", "retrieval_query": state["question"]})
+    monkeypatch.setattr(workflow, "reasoning_node", fail)
+    app = workflow.build_answer_graph().compile()
+
+    result = asyncio.run(app.ainvoke({"question": "Who won the 1998 world cup?", "messages": [], "trace": [], "retry_count": 0}))
+
+    assert result["answer"] == NOT_FOUND_ANSWER
+    assert result["citations"] == []
+    assert retriever.queries == ["Who won the 1998 world cup?"]
@@ -0,0 +1,63 @@
+# This test checks that the sentence and semantic chunkers pack whole sentences into the token budget without overlap, cut at the lowest-similarity boundary, and are deterministic
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.rag.ingestion import chunking
+
+TEXT = (
+    "Revenue grew strongly this quarter. Revenue growth came from new customers. Revenue margins also improved. "
+    "The office cafeteria reopened in May. The cafeteria now serves breakfast. Cafeteria hours are posted online."
+)
+
+
+class TopicEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        return [[1.0, 0.0] if "evenue" in t else [0.0, 1.0] for t in texts]
+
+
+def test_merge_units_cuts_at_lowest_similarity_on_overflow():
+    units = [((i * 10, i * 10 + 9), 10) for i in range(6)]
+    similarities = np.array([0.9, 0.8, 0.1, 0.7, 0.9])
+
+    assert chunking.merge_units(units, max_tokens=50, min_tokens=0) == [(0, 49), (50, 59)]
+    assert chunking.merge_units(units, max_tokens=50, min_tokens=10, similarities=similarities) == [(0, 29), (30, 59)]
+
+
+def test_sentence_strategy_packs_whole_sentences_without_overlap(monkeypatch):
+    monkeypatch.setattr(chunking.settings, "CHUNKING_STRATEGY", "sentence")
+    monkeypatch.setattr(chunking.settings, "CHUNK_MAX_TOKENS", 20)
+    doc = Document(page_content=TEXT, metadata={"source": "a.txt", "page": 1})
+
+    chunks = chunking.chunk_documents([doc])
+
+    assert len(chunks) > 1
+    for c in chunks:
+        start = c.metadata["start_index"]
+        assert TEXT[start : start + len(c.page_content)] == c.page_content
+        assert c.page_content.endswith(".")
+        assert chunking.count_tokens(c.page_content) <= 20
+    assert "".join(c.page_content for c in chunks).replace(" ", "") == TEXT.replace(" ", "")
+    assert [c.metadata["chunk_id"] for c in chunks] == list(range(len(chunks)))
+
+
+def test_semantic_strategy_splits_on_topic_shift_deterministically(monkeypatch):
+    embedder = TopicEmbedder()
+    monkeypatch.setattr(chunking, "get_embedding_model", lambda: embedder)
+    monkeypatch.setattr(chunking.settings, "CHUNKING_STRATEGY", "semantic")
+    monkeypatch.setattr(chunking.settings, "CHUNK_MAX_TOKENS", 40)
+    monkeypatch.setattr(chunking.settings, "CHUNK_MIN_TOKENS", 5)
+    monkeypatch.setattr(chunking.settings, "EMBEDDING_BATCH_SIZE", 4)
+    doc = Document(page_content=TEXT, metadata={"source": "a.txt", "page": 1})
+
+    first = chunking.chunk_documents([doc])
+    second = chunking.chunk_documents([doc])
+
+    assert [c.page_content for c in first] == [c.page_content for c in second]
+    assert first[0].page_content.endswith("Revenue margins also improved.")
+    assert first[1].page_content.startswith("The office cafeteria")
+    assert embedder.batches[:2] == [4, 2]
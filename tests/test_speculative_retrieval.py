@@ -0,0 +1,94 @@
+# This test checks that speculative retrieval on the raw question is reused by the RAG path and cancelled on non-RAG routes
+
+import threading
+
+from langchain_core.documents import Document
+
+from src.graph import speculation, workflow
+from src.graph.nodes import retrieval_agent
+
+
+class DummyRetriever:
+    def __init__(self, gate=None):
+        self.queries = []
+        self.gate = gate
+
+    def retrieve(self, query, filters=None):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.queries.append(query)
+        return [Document(page_content="hit", metadata={"chunk_uid": "u1"})]
+
+
+def test_rag_route_reuses_speculative_result(monkeypatch):
+    retriever = DummyRetriever()
+    monkeypatch.setattr(speculation, "get_hybrid_retriever", lambda: retriever)
+    monkeypatch.setattr(retrieval_agent, "get_hybrid_retriever", lambda: retriever)
+    monkeypatch.setattr(workflow.settings, "SPECULATIVE_RETRIEVAL", True)
+
+    state = {"question": "What is X?", "retry_count": 0}
+    state.update(workflow.speculative_retrieval_node(state))
+    state["supervisor_decision"] = "plan_and_retrieve"
+    assert workflow.supervisor_router(state) == "plan_and_retrieve"
+
+    out = retrieval_agent.retrieval_node({**state, "plan": "Keywords: x", "retrieval_query": "What is X?"})
+
+    assert [d.metadata["chunk_uid"] for d in out["documents"]] == ["u1"]
+    assert out["speculation_id"] is None
+    assert retriever.queries == ["What is X?"]
+
+
+def test_non_rag_route_cancels_speculation(monkeypatch):
+    gate = threading.Event()
+    retriever = DummyRetriever(gate=gate)
+    monkeypatch.setattr(speculation, "get_hybrid_retriever", lambda: retriever)
+
+    token = speculation.start_speculative_retrieval("hello there")
+    decision = workflow.supervisor_router({"supervisor_decision": "answer_directly", "speculation_id": token})
+    gate.set()
+
+    assert decision == "answer_directly"
+    assert token not in speculation._inflight
+    assert speculation.claim_speculative_retrieval(token) is None
+
+
+def test_turn_scope_evicts_speculation_left_by_a_failed_turn(monkeypatch):
+    import asyncio
+
+    import pytest
+    from langgraph.graph import END, START, StateGraph
+
+    from src.graph.state import GraphState
+
+    gate = threading.Event()
+    retriever = DummyRetriever(gate=gate)
+    monkeypatch.setattr(speculation, "get_hybrid_retriever", lambda: retriever)
+    monkeypatch.setattr(workflow.settings, "SPECULATIVE_RETRIEVAL", True)
+    started = []
+
+    def speculate(state):
+        out = workflow.speculative_retrieval_node(state)
+        started.append(out["speculation_id"])
+        return out
+
+    def fail(state):
+        raise RuntimeError("turn failed")
+
+    graph = StateGraph(GraphState)
+    graph.add_node("speculative_retrieval", speculate)
+    graph.add_node("load_memory", fail)
+    graph.add_edge(START, "speculative_retrieval")
+    graph.add_edge("speculative_retrieval", "load_memory")
+    graph.add_edge("load_memory", END)
+    app = graph.compile()
+
+    async def run_turn():
+        with speculation.speculation_scope():
+            await app.ainvoke({"question": "What is X?", "trace": []})
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_turn())
+    gate.set()
+
+    assert started and started[0] not in speculation._inflight
+    assert speculation.claim_speculative_retrieval(started[0]) is None
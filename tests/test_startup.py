@@ -0,0 +1,85 @@
+# This test checks that importing the API loads no heavy ML/SDK modules and does not compile the graph (import time itself is
+# measured by benchmarks/bench_startup.py), and that /ready reports 503 until every required warmup step has succeeded
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.app.core import warmup
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("sentence_transformers", "torch", "transformers", "openai", "langchain_community", "pypdf")
+
+_PROBE = """
+import json, sys
+import src.app.main
+import src.graph.workflow as workflow
+print(json.dumps({"graph_compiled": workflow._graph_app is not None,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def test_app_import_is_lazy():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True, text=True, timeout=120, check=True,
+    )
+    report = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert report["loaded"] == []
+    assert report["graph_compiled"] is False
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(warmup, "_state", warmup.WarmupState())
+    monkeypatch.setattr(warmup.settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(warmup.settings, "WARMUP_RETRY_SECONDS", 0.01)
+
+
+def test_ready_after_required_steps(monkeypatch, fresh_state):
+    calls = []
+
+    async def memory():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(
+        warmup,
+        "_STEPS",
+        [("models", lambda: calls.append("models"), True), ("memory_store", memory, False)],
+    )
+    assert warmup.readiness()[0] is False
+
+    async def run_briefly():
+        task = asyncio.create_task(warmup.run_warmup())
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(run_briefly())
+    ready, body = warmup.readiness()
+
+    assert ready is True
+    assert calls == ["models"]
+    assert body["steps"]["memory_store"]["ok"] is False
+
+
+def test_failed_required_step_is_retried(monkeypatch, fresh_state):
+    attempts = []
+
+    def flaky_qdrant():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("qdrant down")
+
+    monkeypatch.setattr(warmup, "_STEPS", [("qdrant", flaky_qdrant, True)])
+
+    asyncio.run(warmup.run_warmup())
+
+    assert len(attempts) == 2
+    assert warmup.readiness() == (True, {"status": "ready", "steps": warmup._state.steps})